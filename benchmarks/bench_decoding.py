@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Datetime and amount decoding benchmarks on a large generated AirShopping response.
+
+Every timestamp and amount of the response is decoded, with the memo
+caches cleared before each round as they would be cold for a new
+response. Run from the repository root::
+
+    python benchmarks/bench_decoding.py [--offers 500] [--repeat 5]
+"""
+import argparse
+import datetime
+import os
+import sys
+import timeit
+
+here = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(here, os.pardir, "src"))
+
+from bench_parsers import large_air_shopping_response, report  # noqa: E402
+from mixvel._parsers import decode_amount, decode_datetime  # noqa: E402
+from mixvel.xml.backend import get_backend  # noqa: E402
+
+DATETIME_TAGS = ("ScheduledDateTime", "OfferExpirationTimeLimitDateTime")
+AMOUNT_TAGS = ("Amount", "BaseAmount", "EquivAmount", "TaxAmount", "TotalAmount", "TotalTaxAmount")
+MIXED_PRECISION_AMOUNTS = ["1200", "0", "0.5", "6538.5", "12.345", "100.000", "-7.25"]
+
+
+def strptime_datetime(text):
+    """Timestamp decoding the parsers used before `decode_datetime`."""
+    text = text.split(".")[0].rstrip("Z")
+    return datetime.datetime.strptime(text, "%Y-%m-%dT%H:%M:%S")
+
+
+def replace_amount(text):
+    """Amount decoding the parsers used before `decode_amount`."""
+    return int(text.replace(".", ""))
+
+
+def cold(func):
+    def decode_all(texts):
+        func.cache_clear()
+        return [func(text) for text in texts]
+
+    return decode_all
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offers", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    root = get_backend().fromstring(large_air_shopping_response(args.offers))
+    datetimes = [elm.text for elm in root.iter() if elm.tag in DATETIME_TAGS]
+    amounts = [elm.text for elm in root.iter() if elm.tag in AMOUNT_TAGS]
+    # Every fixture amount has two decimals, the equivalence check below
+    # also covers integral, one and three decimal amounts.
+    amounts += MIXED_PRECISION_AMOUNTS
+    print(
+        "{datetimes} timestamps ({distinct_datetimes} distinct), "
+        "{amounts} amounts ({distinct_amounts} distinct), best of {repeat}".format(
+            datetimes=len(datetimes),
+            distinct_datetimes=len(set(datetimes)),
+            amounts=len(amounts),
+            distinct_amounts=len(set(amounts)),
+            repeat=args.repeat,
+        )
+    )
+
+    cases = [
+        ("datetime with strptime", lambda: [strptime_datetime(t) for t in datetimes], datetimes),
+        ("decode_datetime", lambda: cold(decode_datetime)(datetimes), datetimes),
+        ("amount with replace", lambda: [replace_amount(t) for t in amounts], amounts),
+        ("decode_amount", lambda: cold(decode_amount)(amounts), amounts),
+    ]
+    assert cases[0][1]() == cases[1][1]()
+    assert cases[2][1]() == cases[3][1]()
+    for name, func, texts in cases:
+        timings = timeit.repeat(func, number=1, repeat=args.repeat)
+        report(name, timings, len(texts), unit="value")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Parser benchmarks on a large generated AirShopping response.
+
+Run from the repository root::
+
+    python benchmarks/bench_parsers.py [--offers 500] [--repeat 5] [--backend lxml] [--unique-amounts]
+"""
+import argparse
+import itertools
+import os
+import re
+import sys
+import timeit
+
+here = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(here, os.pardir, "src"))
+
+from mixvel._parsers import (  # noqa: E402
+    index_children,
+    parse_air_shopping_response,
+    parse_air_shopping_stream,
+)
+from mixvel.validation import set_strict  # noqa: E402
+from mixvel.xml.backend import set_backend  # noqa: E402
+
+OFFER_FIELDS = ("OfferID", "OwnerCode", "OfferExpirationTimeLimitDateTime", "TotalPrice")
+
+FIXTURE = os.path.join(
+    here, os.pardir, "tests", "responses", "order", "air-shopping__RT-2ADT1CNN.xml"
+)
+
+
+def large_air_shopping_response(offers, unique_amounts=False):
+    """Return the AirShopping fixture with its offer repeated `offers` times.
+
+    With `unique_amounts` every amount of the response differs, so no two
+    prices are identical.
+    """
+
+    with open(FIXTURE, "rb") as f:
+        content = f.read()
+    start = content.index(b"<Offer>")
+    end = content.index(b"</Offer>") + len(b"</Offer>")
+    offer = content[start:end]
+    offer_id = re.search(rb"<OfferID>([^<]*)</OfferID>", offer).group(1)
+    body = b"".join(offer.replace(offer_id, b"offer-%d" % n) for n in range(offers))
+    if unique_amounts:
+        amounts = itertools.count(1)
+        body = re.sub(
+            rb"(Amount[^>]*>)[0-9.]+<",
+            lambda m: m.group(1) + b"%d.00<" % next(amounts),
+            body,
+        )
+    return content[:start] + body + content[end:]
+
+
+def find_fields(offer):
+    return [offer.find("./" + tag) for tag in OFFER_FIELDS]
+
+
+def index_fields(offer):
+    children = index_children(offer)
+    return [children.get(tag) for tag in OFFER_FIELDS]
+
+
+def strictly(func, *args):
+    set_strict(True)
+    try:
+        return func(*args)
+    finally:
+        set_strict(False)
+
+
+def summaries(response):
+    return [
+        (offer.offer_id, offer.owner_code, offer.total_price) for offer in response.offers
+    ]
+
+
+def report(name, timings, count, unit="offer"):
+    best = min(timings)
+    print(
+        "{name:<28} {best:8.2f} ms  {per_item:7.2f} us/{unit}".format(
+            name=name, best=best * 1e3, per_item=best / count * 1e6, unit=unit
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offers", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", choices=["stdlib", "lxml"], default=None)
+    parser.add_argument(
+        "--unique-amounts", action="store_true", help="no two prices alike, the worst case of sharing"
+    )
+    args = parser.parse_args()
+    backend = set_backend(args.backend)
+
+    content = large_air_shopping_response(args.offers, args.unique_amounts)
+    message = backend.find(backend.fromstring(content), "./Body/AppData/*")
+    chunks = [content[i:i + 65536] for i in range(0, len(content), 65536)]
+    print(
+        "{size:.1f} MiB, {offers} offers, {backend} backend, best of {repeat}".format(
+            size=len(content) / 2 ** 20,
+            offers=args.offers,
+            backend=backend.name,
+            repeat=args.repeat,
+        )
+    )
+
+    offers = message.findall("./Response/Offer")
+    cases = [
+        ("offer fields with find", lambda: [find_fields(o) for o in offers]),
+        ("offer fields with index", lambda: [index_fields(o) for o in offers]),
+        ("parse tree", lambda: backend.fromstring(content)),
+        ("parse_air_shopping_response", lambda: parse_air_shopping_response(message)),
+        ("  with strict validation", lambda: strictly(parse_air_shopping_response, message)),
+        ("parse_air_shopping_stream", lambda: parse_air_shopping_stream(chunks)),
+        ("lazy, offer summaries read", lambda: summaries(parse_air_shopping_stream(chunks, lazy=True))),
+    ]
+    for name, func in cases:
+        report(name, timeit.repeat(func, number=1, repeat=args.repeat), args.offers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Request serialization benchmarks, envelope included.
+
+Run from the repository root::
+
+    python benchmarks/bench_requests.py [--passengers 9] [--number 1000]
+"""
+import argparse
+import datetime
+import os
+import sys
+import timeit
+
+here = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(here, os.pardir, "src"))
+
+from bench_parsers import report  # noqa: E402
+from mixvel.client import BaseClient  # noqa: E402
+from mixvel.models import (  # noqa: E402
+    AnonymousPassenger,
+    IdentityDocument,
+    Individual,
+    Leg,
+    Passenger,
+    SelectedOffer,
+    SelectedOfferItem,
+)
+from mixvel.xml.requests import (  # noqa: E402
+    AirShoppingRequest,
+    AuthRequest,
+    OrderCreateRequest,
+)
+
+
+def passenger(index):
+    return Passenger(
+        pax_id="Pax-{index}".format(index=index),
+        ptc="ADT",
+        individual=Individual(
+            given_name="Ivan",
+            surname="Ivanov",
+            gender="M",
+            birthdate=datetime.date(1990, 1, 2),
+        ),
+        doc=IdentityDocument(
+            doc_id="1234 56789{index}".format(index=index),
+            type_code="PS",
+            issuing_country_code="RU",
+            expiry_date=datetime.date(2030, 1, 1),
+        ),
+        email="ivan{index}@example.com".format(index=index),
+        phone="+7999000000{index}".format(index=index),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passengers", type=int, default=9)
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    departure = datetime.date(2025, 6, 13)
+    pax_ids = ["Pax-{index}".format(index=i) for i in range(1, args.passengers + 1)]
+    messages = [
+        ("auth", AuthRequest(login="login", password="password", structure_unit_id="1")),
+        (
+            "air shopping",
+            AirShoppingRequest(
+                itinerary=[Leg("MOW", "AER", departure), Leg("AER", "MOW", departure)],
+                paxes=[AnonymousPassenger(pax_id, "ADT") for pax_id in pax_ids],
+            ),
+        ),
+        (
+            "order create",
+            OrderCreateRequest(
+                selected_offer=SelectedOffer(
+                    offer_ref_id="Offer-1",
+                    selected_offer_items=[
+                        SelectedOfferItem(offer_item_ref_id="Item-1", pax_ref_ids=pax_ids)
+                    ],
+                ),
+                paxes=[passenger(i) for i in range(1, args.passengers + 1)],
+            ),
+        ),
+    ]
+    client = BaseClient("login", "password", "1")
+    print("{passengers} passengers, best of {repeat}".format(
+        passengers=args.passengers, repeat=args.repeat
+    ))
+    for name, message in messages:
+        timings = timeit.repeat(
+            lambda: client._prepare_request(message), number=args.number, repeat=args.repeat
+        )
+        report(name, timings, args.number, unit="request")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,10 +14,13 @@ requires = [
     "httpx>=0.27",
     "pydantic>=2.8",
     "pydantic-xml>=2.7",
+]
 
 
 test_requirements = [
     "pytest>=8.2",
+    # The parsers are tested with both XML backends.
+    "lxml>=4.9",
 ]
 
 about = {}
@@ -57,6 +60,7 @@ setup(
         "Programming Language :: Python :: 3.12",
     ],
     extras_require={
+        "lxml": ["lxml>=4.9"],
         "test": test_requirements,
     },
 )
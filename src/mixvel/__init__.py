@@ -7,8 +7,10 @@ from .__version__ import (
 from . import utils
 from .client import PROD_GATEWAY, TEST_GATEWAY
 from .client import Client
+from .async_client import AsyncClient
+from .auth import TokenManager
 from .exceptions import (
-    NoOrdersToCancel
+    CircuitOpenError, NoOrdersToCancel, RateLimitExceeded
 )
 from .models import (
     Amount, AnonymousPassenger, Booking, BookingEntity,
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import keyword
 from typing import Any, Callable, Dict
 
 try:  # pragma: no cover - prefer the real dependency when available
     from pydantic import BaseModel, ConfigDict, Field  # type: ignore
+
+    PYDANTIC = True
 except ModuleNotFoundError:  # pragma: no cover - lightweight fallback for offline envs
+    PYDANTIC = False
+
     class ConfigDict(dict):
         def __init__(self, **kwargs: Any) -> None:
             super().__init__(**kwargs)
@@ -15,14 +20,84 @@ except ModuleNotFoundError:  # pragma: no cover - lightweight fallback for offli
     _MISSING = _Missing()
 
     class FieldInfo:
-        __slots__ = ("default", "default_factory")
+        __slots__ = ("default", "default_factory", "alias")
 
-        def __init__(self, default: Any = _MISSING, default_factory: Callable[[], Any] | None = None) -> None:
+        def __init__(
+            self,
+            default: Any = _MISSING,
+            default_factory: Callable[[], Any] | None = None,
+            alias: str | None = None,
+        ) -> None:
             self.default = default
             self.default_factory = default_factory
+            self.alias = alias
+
+    def Field(
+        *,
+        default: Any = _MISSING,
+        default_factory: Callable[[], Any] | None = None,
+        alias: str | None = None,
+    ) -> FieldInfo:
+        return FieldInfo(default=default, default_factory=default_factory, alias=alias)
+
+    def _make_init(
+        name: str, field_infos: Dict[str, FieldInfo], frozen: bool = False
+    ) -> Callable[..., None]:
+        """Generates an `__init__` taking the fields positionally or by name or alias."""
+
+        params = ["self"]
+        aliases = []
+        lines = []
+        env: Dict[str, Any] = {"_MISSING": _MISSING, "_set": object.__setattr__}
+        for field_name, info in field_infos.items():
+            params.append(f"{field_name}=_MISSING")
+            if info.alias is not None and info.alias != field_name:
+                lines.append(f"    if {field_name} is _MISSING:")
+                if info.alias.isidentifier() and not keyword.iskeyword(info.alias):
+                    aliases.append(f"{info.alias}=_MISSING")
+                    lines.append(f"        {field_name} = {info.alias}")
+                else:
+                    lines.append(f"        {field_name} = _extra.pop({info.alias!r}, _MISSING)")
+            if info.default_factory is not None:
+                env[f"_factory_{field_name}"] = info.default_factory
+                default = f"_factory_{field_name}()"
+            elif info.default is not _MISSING:
+                env[f"_default_{field_name}"] = info.default
+                default = f"_default_{field_name}"
+            else:
+                default = None
+            lines.append(f"    if {field_name} is _MISSING:")
+            if default is None:
+                lines.append(
+                    f"        raise TypeError(\"Missing field '{field_name}' for {name}\")"
+                )
+            else:
+                lines.append(f"        {field_name} = {default}")
+            if frozen:
+                lines.append(f"    _set(self, {field_name!r}, {field_name})")
+            else:
+                lines.append(f"    self.{field_name} = {field_name}")
+        if aliases:
+            params.append("*")
+            params.extend(aliases)
+        params.append("**_extra")
+        lines.append("    if _extra:")
+        lines.append(
+            f"        raise TypeError(\"Unexpected fields for {name}: \" + \", \".join(sorted(_extra)))"
+        )
+        source = "def __init__({params}):\n{body}\n".format(
+            params=", ".join(params), body="\n".join(lines)
+        )
+        exec(source, env)
+        init = env["__init__"]
+        init.__qualname__ = f"{name}.__init__"
+        return init
+
+    def _frozen_setattr(self: Any, name: str, value: Any) -> None:
+        raise TypeError(f"{type(self).__name__} is frozen, '{name}' cannot be assigned")
 
-    def Field(*, default: Any = _MISSING, default_factory: Callable[[], Any] | None = None) -> FieldInfo:
-        return FieldInfo(default=default, default_factory=default_factory)
+    def _frozen_delattr(self: Any, name: str) -> None:
+        raise TypeError(f"{type(self).__name__} is frozen, '{name}' cannot be deleted")
 
     class BaseModelMeta(type):
         def __new__(mcls, name: str, bases: tuple[type, ...], namespace: Dict[str, Any], **kwargs: Any) -> type:
@@ -32,39 +107,66 @@ except ModuleNotFoundError:  # pragma: no cover - lightweight fallback for offli
                 base_fields = getattr(base, "_field_infos", None)
                 if base_fields:
                     field_infos.update(base_fields)
-            for field_name in annotations:
+            inherited = set(field_infos)
+            for field_name, annotation in annotations.items():
+                if "ClassVar" in str(annotation):
+                    continue
                 value = namespace.get(field_name, _MISSING)
                 if isinstance(value, FieldInfo):
                     field_infos[field_name] = value
                     namespace.pop(field_name)
                 elif value is not _MISSING:
                     field_infos[field_name] = FieldInfo(default=value)
+                    namespace.pop(field_name)
                 elif field_name not in field_infos:
                     field_infos[field_name] = FieldInfo()
             namespace["_field_infos"] = field_infos
+            namespace["model_fields"] = field_infos
+            # Instances keep their fields in slots rather than a `__dict__`.
+            namespace.setdefault(
+                "__slots__", tuple(f for f in field_infos if f not in inherited)
+            )
+            config = namespace.get("model_config")
+            if config is None:
+                config = next(
+                    (base.model_config for base in bases if hasattr(base, "model_config")), {}
+                )
+            # Like `frozen=True` in pydantic, assigning a field raises.
+            frozen = bool(config.get("frozen"))
+            if frozen:
+                namespace.setdefault("__setattr__", _frozen_setattr)
+                namespace.setdefault("__delattr__", _frozen_delattr)
+            if "__init__" not in namespace:
+                namespace["__init__"] = _make_init(name, field_infos, frozen)
             return super().__new__(mcls, name, bases, namespace)
 
     class BaseModel(metaclass=BaseModelMeta):
+        __slots__ = ()
         model_config = ConfigDict()
 
-        def __init__(self, **data: Any) -> None:
-            consumed = set()
-            for field_name, info in self._field_infos.items():  # type: ignore[attr-defined]
-                if field_name in data:
-                    value = data[field_name]
-                    consumed.add(field_name)
+        @classmethod
+        def model_construct(cls, _fields_set: Any = None, **values: Any) -> "BaseModel":
+            model = cls.__new__(cls)
+            for field_name, info in cls._field_infos.items():  # type: ignore[attr-defined]
+                if field_name in values:
+                    value = values[field_name]
+                elif info.alias is not None and info.alias in values:
+                    value = values[info.alias]
+                elif info.default_factory is not None:
+                    value = info.default_factory()
+                elif info.default is not _MISSING:
+                    value = info.default
                 else:
-                    if info.default_factory is not None:
-                        value = info.default_factory()
-                    elif info.default is not _MISSING:
-                        value = info.default
-                    else:
-                        raise TypeError(f"Missing field '{field_name}' for {self.__class__.__name__}")
-                setattr(self, field_name, value)
-            extra = set(data.keys()) - consumed
-            if extra:
-                extras = ", ".join(sorted(extra))
-                raise TypeError(f"Unexpected fields for {self.__class__.__name__}: {extras}")
+                    continue
+                object.__setattr__(model, field_name, value)
+            return model
 
         def model_dump(self) -> Dict[str, Any]:
             return {name: getattr(self, name) for name in self._field_infos.keys()}  # type: ignore[attr-defined]
+
+        def __getstate__(self) -> Dict[str, Any]:
+            return self.model_dump()
+
+        def __setstate__(self, state: Dict[str, Any]) -> None:
+            for name, value in state.items():
+                object.__setattr__(self, name, value)
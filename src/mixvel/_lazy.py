@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel._lazy
+~~~~~~~~~~~~
+Models that parse some of their fields on first access.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, ClassVar, Dict
+
+from ._compat.pydantic import PYDANTIC, BaseModel
+
+_STATE = "_lazy_state"
+
+# Serializes loading, so models shared between threads load each field
+# once. Loaders only run Python code, holding the GIL anyway, and may
+# construct further lazy models.
+_LOCK = threading.RLock()
+
+# Instance attributes are read, set and removed with the `object` methods:
+# they bypass `__getattr__` and the `__dict__` property of lazy models.
+_get = object.__getattribute__
+_set = object.__setattr__
+_delete = object.__delattr__
+
+if PYDANTIC:
+    _instance_dict = BaseModel.__dict__["__dict__"]
+
+
+def _model_class(model):
+    for cls in type(model).__mro__:
+        if not issubclass(cls, LazyModel):
+            return cls
+
+
+def _is_set(model, name):
+    try:
+        _get(model, name)
+    except AttributeError:
+        return False
+    return True
+
+
+class LazyModel:
+    """Mixin for a model subclass whose `LOADERS` fields are loaded on demand.
+
+    A loader is called with the state the model was constructed with, its
+    result is stored as the field value. Comparing, copying and pickling a
+    lazy model, or dumping it with pydantic, loads every remaining field
+    first, so a lazy model behaves as the model it extends.
+    """
+
+    LOADERS: ClassVar[Dict[str, Callable[..., Any]]] = {}
+
+    @classmethod
+    def construct_lazy(cls, state, **values):
+        """Builds the model from `values`, its `LOADERS` fields are loaded from `state` later."""
+
+        model = cls.model_construct(_fields_set=set(cls.model_fields), **values)
+        for name in cls.LOADERS:
+            if _is_set(model, name):
+                _delete(model, name)
+        _set(model, _STATE, state)
+        return model
+
+    def __getattr__(self, name):
+        loader = self.LOADERS.get(name)
+        if loader is not None:
+            with _LOCK:
+                # Another thread may have loaded the field meanwhile.
+                if _is_set(self, name):
+                    return _get(self, name)
+                state = _get(self, _STATE) if _is_set(self, _STATE) else None
+                if state is not None:
+                    value = loader(*state)
+                    _set(self, name, value)
+                    if all(_is_set(self, field) for field in self.LOADERS):
+                        _set(self, _STATE, None)
+                    return value
+        parent = getattr(super(), "__getattr__", None)
+        if parent is None:
+            raise AttributeError(
+                "{cls!r} object has no attribute {name!r}".format(
+                    cls=type(self).__name__, name=name
+                )
+            )
+        return parent(name)
+
+    def _load(self):
+        if not _is_set(self, _STATE) or _get(self, _STATE) is None:
+            return
+        with _LOCK:
+            state = _get(self, _STATE)
+            if state is None:
+                return
+            for name, loader in self.LOADERS.items():
+                if not _is_set(self, name):
+                    _set(self, name, loader(*state))
+            _set(self, _STATE, None)
+
+    def __eq__(self, other):
+        # Equal to the eagerly parsed model with the same fields.
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return _model_class(self) is _model_class(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.model_fields
+        )
+
+    __hash__ = None
+
+    def __getstate__(self):
+        self._load()
+        return super().__getstate__()
+
+    if PYDANTIC:
+        # pydantic dumps, copies and pickles a model through its instance
+        # dict, which has to be complete by then.
+        @property
+        def __dict__(self):
+            self._load()
+            return _instance_dict.__get__(self)
+
+        @__dict__.setter
+        def __dict__(self, value):
+            _instance_dict.__set__(self, value)
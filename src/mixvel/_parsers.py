@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import datetime
-from xml.etree import ElementTree as ET
+import functools
+import sys
+from typing import ClassVar
 
 from .models import (
     Amount,
@@ -36,6 +38,186 @@ from .models import (
     AirShoppingResponse,
     OrderViewResponse,
 )
+from ._lazy import LazyModel
+from .exceptions import NoOrdersToCancel
+from .validation import build
+from .xml.backend import get_backend
+
+# MixVel schemas leave nested elements unqualified: only the envelope and the
+# message root carry a namespace, so plain tag names match everything below.
+
+
+def index_children(elm):
+    """Maps child tags to the children having them, in one pass over `elm`.
+
+    Parsers look fields up in this map rather than calling `find` for each
+    of them, which would scan the children again every time.
+
+    :param elm: parent element
+    :type elm: lxml.etree._Element
+    :rtype: dict[str, list[lxml.etree._Element]]
+    """
+    children = {}
+    for child in elm:
+        children.setdefault(child.tag, []).append(child)
+    return children
+
+
+def _first(children, tag):
+    found = children.get(tag)
+    return found[0] if found else None
+
+
+def _text(children, tag):
+    found = children.get(tag)
+    return found[0].text if found else None
+
+
+def _code(children, tag):
+    """Returns the interned text of the first `tag` child, if any.
+
+    Codes and reference IDs take few distinct values but occur thousands of
+    times in a shopping response, interning makes all of them share one
+    string object.
+    """
+    found = children.get(tag)
+    if not found or found[0].text is None:
+        return None
+    return sys.intern(found[0].text)
+
+
+def _codes(elements):
+    return [sys.intern(elm.text) for elm in elements if elm.text]
+
+
+def _subtree_key(elm):
+    # Leaf texts and attributes of the whole subtree, formatting whitespace
+    # between elements is ignored.
+    return tuple(
+        (node.tag, None if len(node) else node.text, tuple(node.attrib.items()))
+        for node in elm.iter()
+    )
+
+
+class _SharedModels(dict):
+    """Models of the subtrees parsed so far in one response, by subtree.
+
+    Building a key walks the subtree, which costs more than parsing it again
+    when subtrees rarely repeat: once `PROBE` lookups have been made and
+    less than one in `MIN_HIT_RATIO` hit, sharing stops for the rest of the
+    response.
+    """
+
+    PROBE = 256
+    MIN_HIT_RATIO = 4
+
+    __slots__ = ("lookups", "hits", "active")
+
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+        self.hits = 0
+        self.active = True
+
+    def lookup(self, elm, parse):
+        key = _subtree_key(elm)
+        model = self.get(key)
+        self.lookups += 1
+        if model is None:
+            model = self[key] = parse(elm, self)
+        else:
+            self.hits += 1
+        if self.lookups >= self.PROBE and self.hits * self.MIN_HIT_RATIO < self.lookups:
+            self.active = False
+            self.clear()
+        return model
+
+
+def _shared(shared, elm, parse):
+    """Returns `parse(elm, shared)`, reusing the model of an identical subtree.
+
+    `shared` is the `_SharedModels` of the response, None disables sharing.
+    The shared models are frozen.
+    """
+    if shared is None or not shared.active:
+        return parse(elm, shared)
+    return shared.lookup(elm, parse)
+
+
+def _nested(children, tag, child_tag):
+    """Returns the `child_tag` children of every `tag` child, like `findall("tag/child_tag")`."""
+    return [
+        child
+        for parent in children.get(tag, ())
+        for child in parent
+        if child.tag == child_tag
+    ]
+
+
+# Timestamps and prices repeat across the offers and segments of a response,
+# each distinct text is decoded once.
+DECODE_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=DECODE_CACHE_SIZE)
+def decode_datetime(text):
+    """Decodes a MixVel timestamp.
+
+    Fractional seconds and a trailing "Z" are dropped, so UTC timestamps
+    decode to naive datetimes, e.g. "2025-05-30T09:36:40.123Z" is
+    2025-05-30 09:36:40.
+
+    :param text: xs:dateTime value
+    :type text: str
+    :rtype: datetime.datetime
+    """
+    return datetime.datetime.fromisoformat(text.split(".")[0].rstrip("Z"))
+
+
+@functools.lru_cache(maxsize=DECODE_CACHE_SIZE)
+def decode_amount(text):
+    """Decodes an amount by dropping its decimal point, "6538.00" is 653800.
+
+    :param text: AmountType value
+    :type text: str
+    :rtype: int
+    """
+    return int(text.replace(".", ""))
+
+
+def find_error(envelope):
+    """Returns the `Error` element of a response envelope, if any.
+
+    An error is reported either in place of the envelope `AppData` or as the
+    first child of the message.
+
+    :param envelope: Envelope element
+    :type envelope: lxml.etree._Element
+    :rtype: lxml.etree._Element
+    """
+    backend = get_backend()
+    err = backend.find(envelope, "./Body/Error")
+    if err is None:
+        err = backend.find(envelope, "./Body/AppData/*/Error")
+    return err
+
+
+def raise_for_error(err):
+    """Raises the exception described by a MixVel `Error` element.
+
+    :param err: ErrorType element
+    :type err: lxml.etree._Element
+    """
+    children = index_children(err)
+    typ = _first(children, "ErrorType").text
+    code = _text(children, "Code") or ""
+    desc = _text(children, "DescText")
+    desc = desc.encode("utf-8") if desc is not None else ""
+    if code == "MIX-106001":
+        raise NoOrdersToCancel
+    if code == "":
+        code = "UNDEFINED"
+    raise IOError("{code}: {type}: {desc}".format(code=code, type=typ, desc=desc))
 
 
 def is_cancel_success(resp):
@@ -51,38 +233,192 @@ def is_cancel_success(resp):
     )
 
 
-def parse_air_shopping_response(resp):
+def parse_air_shopping_response(resp, offer_filter=None, lazy=False):
     """Parse air shopping response.
 
     :param resp: text of Mixvel_AirShoppingRS
     :type resp: lxml.etree._Element
+    :param offer_filter: (optional) predicate on the raw Offer element, rejected offers are not parsed
+    :type offer_filter: Callable[[lxml.etree._Element], bool]
+    :param lazy: (optional) offers parse their items and prices on first access
+    :type lazy: bool
     :rtype: AirShoppingResponse
     """
-    offer_elements = resp.findall("./Response/Offer")
+    response = _first(index_children(resp), "Response")
+    children = index_children(response) if response is not None else {}
+    offer_elements = children.get("Offer", [])
+    if offer_filter is not None:
+        offer_elements = [elm for elm in offer_elements if offer_filter(elm)]
     if not offer_elements:
-        return AirShoppingResponse(offers=[], data_lists=DataLists())
-    offers = [parse_offer(offer) for offer in offer_elements]
-    data_lists = parse_data_lists(resp.find("./Response/DataLists"))
-    return AirShoppingResponse(offers, data_lists)
+        return build(AirShoppingResponse, offers=[], data_lists=build(DataLists))
+    shared = _SharedModels()
+    offers = [parse_offer(offer, shared, lazy) for offer in offer_elements]
+    data_lists = parse_data_lists(_first(children, "DataLists"))
+    return build(AirShoppingResponse, offers, data_lists)
 
 
-def parse_order_view_response(resp):
+_STREAMED_TAGS = ("Offer", "DataLists", "Error")
+
+
+class AirShoppingParser:
+    """Incremental parser of Mixvel_AirShoppingRS.
+
+    The response body is fed in chunks as it arrives. Every `Offer` is
+    parsed as soon as its element closes and is then dropped from the tree,
+    so memory is bounded by a single offer rather than the whole response.
+    `data_lists` is set once the `DataLists` element has been parsed.
+
+    :param offer_filter: (optional) predicate on the raw Offer element, rejected offers are not parsed
+    :type offer_filter: Callable[[lxml.etree._Element], bool]
+    :param lazy: (optional) offers parse their items and prices on first access
+    :type lazy: bool
+    """
+
+    def __init__(self, offer_filter=None, lazy=False):
+        backend = get_backend()
+        if backend.parent_links:
+            # Only the elements handled here are reported, their position
+            # is checked through their parents.
+            self._parser = backend.pull_parser(("end",), _STREAMED_TAGS)
+            self._read_events = self._read_end_events
+        else:
+            self._parser = backend.pull_parser()
+        self._stack = []
+        self._shared = _SharedModels()
+        self.offer_filter = offer_filter
+        self.lazy = lazy
+        self.data_lists = None
+
+    def feed(self, data):
+        """Feeds a chunk of the response body.
+
+        :param data: next chunk of the response body
+        :type data: bytes
+        :return: offers completed by this chunk
+        :rtype: list[Offer]
+        """
+        self._parser.feed(data)
+        return self._read_events()
+
+    def close(self):
+        """Finishes parsing, raises if the document is incomplete.
+
+        :return: offers completed by the last chunk
+        :rtype: list[Offer]
+        """
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self):
+        offers = []
+        stack = self._stack
+        for event, elm in self._parser.read_events():
+            if event == "start":
+                stack.append(elm)
+                continue
+            stack.pop()
+            if not stack:
+                continue
+            tag = elm.tag
+            parent = stack[-1].tag
+            if tag == "Error" and (
+                parent == "Body" or len(stack) > 1 and stack[-2].tag == "AppData"
+            ):
+                raise_for_error(elm)
+            if parent != "Response":
+                continue
+            if tag == "Offer":
+                if self.offer_filter is None or self.offer_filter(elm):
+                    offers.append(parse_offer(elm, self._shared, self.lazy))
+            elif tag == "DataLists":
+                self.data_lists = parse_data_lists(elm)
+            else:
+                continue
+            stack[-1].remove(elm)
+        return offers
+
+    def _read_end_events(self):
+        offers = []
+        for _, elm in self._parser.read_events():
+            parent = elm.getparent()
+            if parent is None:
+                continue
+            tag = elm.tag
+            if tag == "Error":
+                grandparent = parent.getparent()
+                if parent.tag == "Body" or (
+                    grandparent is not None and grandparent.tag == "AppData"
+                ):
+                    raise_for_error(elm)
+                continue
+            if parent.tag != "Response":
+                continue
+            if tag == "Offer":
+                if self.offer_filter is None or self.offer_filter(elm):
+                    offers.append(parse_offer(elm, self._shared, self.lazy))
+            elif tag == "DataLists":
+                self.data_lists = parse_data_lists(elm)
+            else:
+                continue
+            parent.remove(elm)
+        return offers
+
+
+def parse_air_shopping_stream(chunks, offer_filter=None, lazy=False):
+    """Parse air shopping response while it is being received.
+
+    :param chunks: response body chunks
+    :type chunks: Iterable[bytes]
+    :param offer_filter: (optional) predicate on the raw Offer element, rejected offers are not parsed
+    :type offer_filter: Callable[[lxml.etree._Element], bool]
+    :param lazy: (optional) offers parse their items and prices on first access
+    :type lazy: bool
+    :rtype: AirShoppingResponse
+    """
+    parser = AirShoppingParser(offer_filter, lazy)
+    offers = []
+    for chunk in chunks:
+        offers.extend(parser.feed(chunk))
+    offers.extend(parser.close())
+    return air_shopping_response(offers, parser.data_lists)
+
+
+def air_shopping_response(offers, data_lists):
+    """Builds AirShoppingResponse out of parsed offers and data lists.
+
+    :param offers: parsed offers
+    :type offers: list[Offer]
+    :param data_lists: parsed data lists, if any
+    :type data_lists: DataLists
+    :rtype: AirShoppingResponse
+    """
+    if not offers or data_lists is None:
+        return build(AirShoppingResponse, offers=offers, data_lists=build(DataLists))
+    return build(AirShoppingResponse, offers, data_lists)
+
+
+def parse_order_view_response(resp, lazy=False):
     """Parse order view response.
 
     :param resp: text of Mixvel_OrderCancelRS
     :type resp: lxml.etree._Element
+    :param lazy: (optional) orders parse their items, bookings and prices on first access
+    :type lazy: bool
     :rtype: OrderViewResponse
     """
-    mix_order = parse_mix_order(resp.find("./Response/MixOrder"))
-    data_lists = parse_data_lists(resp.find("./Response/DataLists"))
-    ticket_doc_info_nodes = resp.findall("./Response/TicketDocInfo")
+    response = index_children(_first(index_children(resp), "Response"))
+    mix_order = parse_mix_order(_first(response, "MixOrder"), _SharedModels(), lazy)
+    data_lists = parse_data_lists(_first(response, "DataLists"))
+    ticket_doc_info_nodes = response.get("TicketDocInfo")
     ticket_doc_info = (
         [parse_ticket_doc_info(doc) for doc in ticket_doc_info_nodes]
         if ticket_doc_info_nodes
         else None
     )
 
-    return OrderViewResponse(mix_order, data_lists, ticket_doc_info=ticket_doc_info)
+    return build(
+        OrderViewResponse, mix_order, data_lists, ticket_doc_info=ticket_doc_info
+    )
 
 
 def parse_amount(elm):
@@ -92,7 +428,10 @@ def parse_amount(elm):
     :type elm: lxml.etree._Element
     :rtype: Amount
     """
-    return Amount(int(elm.text.replace(".", "")), elm.get("CurCode"))
+    cur_code = elm.get("CurCode")
+    if cur_code is not None:
+        cur_code = sys.intern(cur_code)
+    return build(Amount, decode_amount(elm.text), cur_code)
 
 
 def parse_booking(elm):
@@ -102,54 +441,42 @@ def parse_booking(elm):
     :type elm: lxml.etree._Element
     :rtype: Booking
     """
-    booking_id = elm.find("./BookingID").text
-    entity = (
-        parse_booking_entity(elm.find("./BookingEntity"))
-        if elm.find("./BookingEntity") is not None
-        else None
-    )
-    type_code = (
-        elm.find("./BookingRefTypeCode").text
-        if elm.find("./BookingRefTypeCode") is not None
-        else None
-    )
-    return Booking(booking_id, entity=entity, type_code=type_code)
+    children = index_children(elm)
+    booking_id = _first(children, "BookingID").text
+    entity = _first(children, "BookingEntity")
+    if entity is not None:
+        entity = parse_booking_entity(entity)
+    type_code = _text(children, "BookingRefTypeCode")
+    return build(Booking, booking_id, entity=entity, type_code=type_code)
 
 
 def parse_booking_entity(elm):
-    carrier = (
-        parse_carrier(elm.find("./Carrier"))
-        if elm.find("./Carrier") is not None
-        else None
-    )
-    return BookingEntity(carrier=carrier)
+    carrier = elm.find("Carrier")
+    if carrier is not None:
+        carrier = parse_carrier(carrier)
+    return build(BookingEntity, carrier=carrier)
 
 
 def parse_carrier(elm):
-    airline_desig_code = (
-        elm.find("./AirlineDesigCode").text
-        if elm.find("./AirlineDesigCode") is not None
-        else None
-    )
+    airline_desig_code = elm.findtext("AirlineDesigCode")
+    if airline_desig_code is not None:
+        airline_desig_code = sys.intern(airline_desig_code)
     mixvel_airline_id = None  # TODO: implement parser
-    return Carrier(
+    return build(
+        Carrier,
         airline_desig_code=airline_desig_code, mixvel_airline_id=mixvel_airline_id
     )
 
 
 def parse_coupon(elm):
-    coupon_number = float(elm.find("./CouponNumber").text)
-    fare_basis_code = (
-        elm.find("./FareBasisCode").text
-        if elm.find("./FareBasisCode") is not None
-        else None
+    children = index_children(elm)
+    coupon_number = float(_first(children, "CouponNumber").text)
+    fare_basis_code = _code(children, "FareBasisCode")
+    pax_segment_ref_ids = _codes(
+        _nested(children, "SoldAirlineInfo", "PaxSegmentRefID")
     )
-    pax_segment_ref_ids = [
-        ref_id.text
-        for ref_id in elm.findall("./SoldAirlineInfo/PaxSegmentRefID")
-        if ref_id.text
-    ]
-    return Coupon(
+    return build(
+        Coupon,
         coupon_number,
         fare_basis_code=fare_basis_code,
         pax_segment_ref_ids=pax_segment_ref_ids,
@@ -163,24 +490,26 @@ def parse_data_lists(elm):
     :type elm: lxml.etree._Element
     :rtype: DataLists
     """
+    children = index_children(elm)
     origin_dest_list = [
         parse_origin_dest(node)
-        for node in elm.findall("./OriginDestList/OriginDest")
+        for node in _nested(children, "OriginDestList", "OriginDest")
     ]
     pax_journey_list = [
         parse_pax_journey(node)
-        for node in elm.findall("./PaxJourneyList/PaxJourney")
+        for node in _nested(children, "PaxJourneyList", "PaxJourney")
     ]
     pax_segment_list = [
         parse_pax_segment(node)
-        for node in elm.findall("./PaxSegmentList/PaxSegment")
+        for node in _nested(children, "PaxSegmentList", "PaxSegment")
     ]
     validating_party_list = [
         parse_validating_party(node)
-        for node in elm.findall("./ValidatingPartyList/ValidatingParty")
+        for node in _nested(children, "ValidatingPartyList", "ValidatingParty")
     ]
 
-    return DataLists(
+    return build(
+        DataLists,
         origin_dest_list=origin_dest_list,
         pax_journey_list=pax_journey_list,
         pax_segment_list=pax_segment_list,
@@ -195,143 +524,217 @@ def parse_dated_marketing_segment(elm):
     :type elm: lxml.etree._Element
     :rtype: DatedMarketingSegment
     """
-    carrier_code = elm.find("./CarrierDesigCode").text
-    flight_number = elm.find("./MarketingCarrierFlightNumberText").text
+    children = index_children(elm)
+    carrier_code = sys.intern(_first(children, "CarrierDesigCode").text)
+    flight_number = sys.intern(_first(children, "MarketingCarrierFlightNumberText").text)
 
-    return DatedMarketingSegment(carrier_code, flight_number)
+    return build(DatedMarketingSegment, carrier_code, flight_number)
 
 
-def parse_fare_component(elm):
+def parse_fare_component(elm, shared=None):
     """Parse FareComponentType.
 
     :param elm: FareComponentType element
     :type elm: lxml.etree._Element
+    :param shared: (optional) models of subtrees parsed earlier in the response, to reuse for identical prices
+    :type shared: dict
     :rtype: FareComponent
     """
-    fare_basis_code = elm.find("./FareBasisCode").text
-    rbd = parse_rbd_avail(elm.find("./RBD"))
-    price = parse_price(elm.find("./Price"))
-    pax_segment_ref_id = elm.find("./PaxSegmentRefID").text
+    children = index_children(elm)
+    fare_basis_code = sys.intern(_first(children, "FareBasisCode").text)
+    rbd = parse_rbd_avail(_first(children, "RBD"))
+    price = parse_price(_first(children, "Price"), shared)
+    pax_segment_ref_id = sys.intern(_first(children, "PaxSegmentRefID").text)
 
-    return FareComponent(fare_basis_code, rbd, price, pax_segment_ref_id)
+    return build(FareComponent, fare_basis_code, rbd, price, pax_segment_ref_id)
 
 
-def parse_fare_detail(elm):
+def parse_fare_detail(elm, shared=None):
     """Parse FareDetailType.
 
     :param elm: FareDetailType element
     :type elm: lxml.etree._Element
+    :param shared: (optional) models of subtrees parsed earlier in the response, to reuse for identical prices
+    :type shared: dict
     :rtype: FareDetail
     """
+    children = index_children(elm)
     fare_components = [
-        parse_fare_component(fc)
-        for fc in elm.findall("./FareComponent")
+        parse_fare_component(fc, shared)
+        for fc in children.get("FareComponent", ())
     ]
-    pax_ref_id = elm.find("./PaxRefID").text
+    pax_ref_id = sys.intern(_first(children, "PaxRefID").text)
 
-    return FareDetail(fare_components, pax_ref_id)
+    return build(FareDetail, fare_components, pax_ref_id)
 
 
-def parse_mix_order(elm):
+def parse_mix_order(elm, shared=None, lazy=False):
     """Parses MixOrderType.
 
     :param elm: MixOrderType element
     :type elm: lxml.etree._Element
+    :param shared: (optional) models of subtrees parsed earlier in the response, to reuse for identical prices
+    :type shared: dict
+    :param lazy: (optional) orders parse their items, bookings and prices on first access
+    :type lazy: bool
     :rtype: MixOrder
     """
-    mix_order_id = elm.find("./MixOrderID").text
-    orders = []
-    for order_node in elm.findall("./Order"):
-        orders.append(parse_order(order_node))
-    total_amount = parse_amount(elm.find("./TotalAmount"))
+    children = index_children(elm)
+    mix_order_id = _first(children, "MixOrderID").text
+    orders = [parse_order(node, shared, lazy) for node in children.get("Order", ())]
+    total_amount = parse_amount(_first(children, "TotalAmount"))
 
-    return MixOrder(mix_order_id, orders, total_amount)
+    return build(MixOrder, mix_order_id, orders, total_amount)
 
 
-def parse_offer(elm):
+def parse_offer(elm, shared=None, lazy=False):
     """Parse OfferType.
 
     :param elm: OfferType element
     :type elm: lxml.etree._Element
-    :rtype: OfferItem
+    :param shared: (optional) models of subtrees parsed earlier in the response, to reuse for identical prices
+    :type shared: dict
+    :param lazy: (optional) return a model that parses its nested fields on first access
+    :type lazy: bool
+    :rtype: Offer
     """
-    offer_id = elm.find("./OfferID").text
-    offer_items = [
-        parse_offer_item(offer_item)
-        for offer_item in elm.findall("./OfferItem")
-    ]
-    owner_code = elm.find("./OwnerCode").text
-    timelimit = elm.find("./OfferExpirationTimeLimitDateTime").text
-    timelimit = timelimit.split(".")[0].rstrip("Z")
-    timelimit = datetime.datetime.strptime(timelimit, "%Y-%m-%dT%H:%M:%S")
-    ticket_docs_count = (
-        int(elm.find("./TicketDocsCount").text)
-        if elm.find("./TicketDocsCount") is not None
-        else None
-    )
-    total_price = (
-        parse_price(elm.find("./TotalPrice"))
-        if elm.find("./TotalPrice") is not None
-        else None
-    )
-
-    return Offer(
+    children = index_children(elm)
+    offer_id = _first(children, "OfferID").text
+    owner_code = sys.intern(_first(children, "OwnerCode").text)
+    timelimit = decode_datetime(_first(children, "OfferExpirationTimeLimitDateTime").text)
+    ticket_docs_count = _text(children, "TicketDocsCount")
+    if ticket_docs_count is not None:
+        ticket_docs_count = int(ticket_docs_count)
+    if lazy:
+        return LazyOffer.construct_lazy(
+            (children, shared, lazy),
+            offer_id=offer_id,
+            owner_code=owner_code,
+            offer_expiration_timelimit_datetime=timelimit,
+            ticket_docs_count=ticket_docs_count,
+        )
+
+    return build(
+        Offer,
         offer_id,
-        offer_items,
+        _offer_items(children, shared, lazy),
         owner_code,
         timelimit,
         ticket_docs_count=ticket_docs_count,
-        total_price=total_price,
+        total_price=_total_price(children, shared, lazy),
     )
 
 
-def parse_offer_item(elm):
+def _offer_items(children, shared, lazy):
+    return [
+        parse_offer_item(offer_item, shared, lazy)
+        for offer_item in children.get("OfferItem", ())
+    ]
+
+
+def _total_price(children, shared, lazy):
+    total_price = _first(children, "TotalPrice")
+    if total_price is not None:
+        total_price = parse_price(total_price, shared)
+    return total_price
+
+
+def parse_offer_item(elm, shared=None, lazy=False):
     """Parse OfferItemType.
 
     :param elm: OfferItemType element
     :type elm: lxml.etree._Element
+    :param shared: (optional) models of subtrees parsed earlier in the response, to reuse for identical prices
+    :type shared: dict
+    :param lazy: (optional) return a model that parses its nested fields on first access
+    :type lazy: bool
     :rtype: OfferItem
     """
-    offer_item_id = elm.find("./OfferItemID").text
-    price = parse_price(elm.find("./Price"))
-    services = [parse_service(service) for service in elm.findall("./Service")]
-    fare_details = [
-        parse_fare_detail(fare_detail)
-        for fare_detail in elm.findall("./FareDetail")
-    ]
+    children = index_children(elm)
+    offer_item_id = _first(children, "OfferItemID").text
+    if lazy:
+        return LazyOfferItem.construct_lazy(
+            (children, shared, lazy), offer_item_id=offer_item_id
+        )
+
+    return build(
+        OfferItem,
+        offer_item_id,
+        _price(children, shared, lazy),
+        _services(children, shared, lazy),
+        fare_details=_fare_details(children, shared, lazy),
+    )
+
+
+def _price(children, shared, lazy):
+    return parse_price(_first(children, "Price"), shared)
+
 
-    return OfferItem(offer_item_id, price, services, fare_details=fare_details)
+def _services(children, shared, lazy):
+    return [parse_service(service) for service in children.get("Service", ())]
 
 
-def parse_order(elm):
+def _fare_details(children, shared, lazy):
+    return [
+        parse_fare_detail(fare_detail, shared)
+        for fare_detail in children.get("FareDetail", ())
+    ]
+
+
+def parse_order(elm, shared=None, lazy=False):
     """Parses OrderType.
 
     :param elm: OrderType element
     :type elm: lxml.etree._Element
+    :param shared: (optional) models of subtrees parsed earlier in the response, to reuse for identical prices
+    :type shared: dict
+    :param lazy: (optional) return a model that parses its nested fields on first access
+    :type lazy: bool
     :rtype: Order
     """
-    order_id = elm.find("./OrderID").text
-    order_items = [parse_order_item(node) for node in elm.findall("./OrderItem")]
-    booking_refs = [parse_booking(node) for node in elm.findall("./BookingRef")]
-    total_price = parse_price(elm.find("./TotalPrice"))
+    children = index_children(elm)
+    order_id = _first(children, "OrderID").text
+    if lazy:
+        return LazyOrder.construct_lazy((children, shared, lazy), order_id=order_id)
+
+    return build(
+        Order,
+        order_id,
+        _booking_refs(children, shared, lazy),
+        _order_items(children, shared, lazy),
+        _order_total_price(children, shared, lazy),
+    )
+
+
+def _booking_refs(children, shared, lazy):
+    return [parse_booking(node) for node in children.get("BookingRef", ())]
+
+
+def _order_items(children, shared, lazy):
+    return [parse_order_item(node, shared) for node in children.get("OrderItem", ())]
 
-    return Order(order_id, booking_refs, order_items, total_price)
 
+def _order_total_price(children, shared, lazy):
+    return parse_price(_first(children, "TotalPrice"), shared)
 
-def parse_order_item(elm):
+
+def parse_order_item(elm, shared=None):
     """Parses OrderItemType.
 
     :param elm: OrderItemType element
     :type elm: lxml.etree._Element
+    :param shared: (optional) models of subtrees parsed earlier in the response, to reuse for identical prices
+    :type shared: dict
     :rtype: OrderItem
     """
-    order_item_id = elm.find("./OrderItemID").text
-    fare_details = []
-    for fare_detail_node in elm.findall("./FareDetail"):
-        fare_details.append(parse_fare_detail(fare_detail_node))
-    price = parse_price(elm.find("./Price"))
+    children = index_children(elm)
+    order_item_id = _first(children, "OrderItemID").text
+    fare_details = [
+        parse_fare_detail(node, shared) for node in children.get("FareDetail", ())
+    ]
+    price = parse_price(_first(children, "Price"), shared)
 
-    return OrderItem(order_item_id, fare_details, price)
+    return build(OrderItem, order_item_id, fare_details, price)
 
 
 def parse_origin_dest(elm):
@@ -341,18 +744,14 @@ def parse_origin_dest(elm):
     :type elm: lxml.etree._Element
     :rtype: OriginDest
     """
-    origin_code = elm.find("./OriginCode").text
-    dest_code = elm.find("./DestCode").text
-    origin_dest_id = (
-        elm.find("./OriginDestID").text
-        if elm.find("./OriginDestID") is not None
-        else None
-    )
-    pax_journey_ref_ids = [
-        ref_id.text for ref_id in elm.findall("./PaxJourneyRefID") if ref_id.text
-    ]
-
-    return OriginDest(
+    children = index_children(elm)
+    origin_code = sys.intern(_first(children, "OriginCode").text)
+    dest_code = sys.intern(_first(children, "DestCode").text)
+    origin_dest_id = _code(children, "OriginDestID")
+    pax_journey_ref_ids = _codes(children.get("PaxJourneyRefID", ()))
+
+    return build(
+        OriginDest,
         origin_code,
         dest_code,
         origin_dest_id=origin_dest_id,
@@ -367,12 +766,11 @@ def parse_pax_journey(elm):
     :type elm: lxml.etree._Element
     :rtype: PaxJourney
     """
-    pax_journey_id = elm.find("./PaxJourneyID").text
-    pax_segment_ref_ids = [
-        ref_id.text for ref_id in elm.findall("./PaxSegmentRefID") if ref_id.text
-    ]
+    children = index_children(elm)
+    pax_journey_id = sys.intern(_first(children, "PaxJourneyID").text)
+    pax_segment_ref_ids = _codes(children.get("PaxSegmentRefID", ()))
 
-    return PaxJourney(pax_journey_id, pax_segment_ref_ids)
+    return build(PaxJourney, pax_journey_id, pax_segment_ref_ids)
 
 
 def parse_pax_segment(elm):
@@ -382,36 +780,43 @@ def parse_pax_segment(elm):
     :type elm: lxml.etree._Element
     :rtype: PaxSegment
     """
-    pax_segment_id = elm.find("./PaxSegmentID").text
-    dep = parse_transport_dep_arrival(elm.find("./Dep"))
-    arrival = parse_transport_dep_arrival(elm.find("./Arrival"))
+    children = index_children(elm)
+    pax_segment_id = sys.intern(_first(children, "PaxSegmentID").text)
+    dep = parse_transport_dep_arrival(_first(children, "Dep"))
+    arrival = parse_transport_dep_arrival(_first(children, "Arrival"))
     marketing_carrier_info = parse_dated_marketing_segment(
-        elm.find("./MarketingCarrierInfo")
-    )
-    duration = (
-        elm.find("./Duration").text if elm.find("./Duration") is not None else None
+        _first(children, "MarketingCarrierInfo")
     )
+    duration = _code(children, "Duration")
 
-    return PaxSegment(
+    return build(
+        PaxSegment,
         pax_segment_id, dep, arrival, marketing_carrier_info, duration=duration
     )
 
 
-def parse_price(elm):
+def parse_price(elm, shared=None):
     """Parse PriceType.
 
     :param elm: PriceType element
     :type elm: lxml.etree._Element
+    :param shared: (optional) models of subtrees parsed earlier in the response, an identical price is reused
+    :type shared: dict
     :rtype: Price
     """
-    tax_summary = (
-        parse_tax_summary(elm.find("./TaxSummary"))
-        if elm.find("./TaxSummary") is not None
-        else TaxSummary([])
-    )
-    total_amount = parse_amount(elm.find("./TotalAmount"))
+    return _shared(shared, elm, _parse_price)
+
 
-    return Price(tax_summary, total_amount)
+def _parse_price(elm, shared):
+    children = index_children(elm)
+    tax_summary = _first(children, "TaxSummary")
+    if tax_summary is not None:
+        tax_summary = parse_tax_summary(tax_summary, shared)
+    else:
+        tax_summary = build(TaxSummary, [])
+    total_amount = parse_amount(_first(children, "TotalAmount"))
+
+    return build(Price, tax_summary, total_amount)
 
 
 def parse_rbd_avail(elm):
@@ -421,14 +826,13 @@ def parse_rbd_avail(elm):
     :type elm: lxml.etree._Element
     :rtype: RbdAvail
     """
-    rbd_code = elm.find("./RBD_Code").text
-    availability = (
-        int(elm.find("Availability").text)
-        if elm.find("Availability") is not None
-        else None
-    )
+    children = index_children(elm)
+    rbd_code = sys.intern(_first(children, "RBD_Code").text)
+    availability = _text(children, "Availability")
+    if availability is not None:
+        availability = int(availability)
 
-    return RbdAvail(rbd_code, availability=availability)
+    return build(RbdAvail, rbd_code, availability=availability)
 
 
 def parse_service(elm):
@@ -438,18 +842,16 @@ def parse_service(elm):
     :type elm: lxml.etree._Element
     :rtype: Service
     """
-    service_id = elm.find("./ServiceID").text
-    pax_ref_ids = [ref_id.text for ref_id in elm.findall("./PaxRefID") if ref_id.text]
+    children = index_children(elm)
+    service_id = sys.intern(_first(children, "ServiceID").text)
+    pax_ref_ids = _codes(children.get("PaxRefID", ()))
     service_associations = parse_service_offer_associations(
-        elm.find("./ServiceAssociations")
-    )
-    validating_party_ref_id = (
-        elm.find("./ValidatingPartyRefID").text
-        if elm.find("./ValidatingPartyRefID") is not None
-        else None
+        _first(children, "ServiceAssociations")
     )
+    validating_party_ref_id = _code(children, "ValidatingPartyRefID")
 
-    return Service(
+    return build(
+        Service,
         service_id,
         pax_ref_ids,
         service_associations,
@@ -466,18 +868,12 @@ def parse_service_offer_associations(elm):
     :type elm: lxml.etree._Element
     :rtype: ServiceOfferAssociations
     """
-    pax_journey_ref_ids = [
-        ref_id.text
-        for ref_id in elm.findall("./PaxJourneyRef/PaxJourneyRefID")
-        if ref_id.text
-    ]
-    pax_segment_ref_ids = [
-        ref_id.text
-        for ref_id in elm.findall("./PaxSegmentRef/PaxSegmentRefID")
-        if ref_id.text
-    ]
+    children = index_children(elm)
+    pax_journey_ref_ids = _codes(_nested(children, "PaxJourneyRef", "PaxJourneyRefID"))
+    pax_segment_ref_ids = _codes(_nested(children, "PaxSegmentRef", "PaxSegmentRefID"))
 
-    return ServiceOfferAssociations(
+    return build(
+        ServiceOfferAssociations,
         pax_journey_ref_ids=pax_journey_ref_ids,
         pax_segment_ref_ids=pax_segment_ref_ids,
     )
@@ -490,36 +886,52 @@ def parse_tax(elm):
     :type elm: lxml.etree._Element
     :rtype: Tax
     """
-    return Tax(parse_amount(elm.find("./Amount")), elm.find("./TaxCode").text)
+    children = index_children(elm)
+    return build(
+        Tax,
+        parse_amount(_first(children, "Amount")),
+        sys.intern(_first(children, "TaxCode").text),
+    )
+
 
+def _parse_tax(elm, shared):
+    return parse_tax(elm)
 
-def parse_tax_summary(elm):
+
+def parse_tax_summary(elm, shared=None):
     """Parse TaxSummaryType.
 
     :param elm: TaxSummaryType element
     :type elm: lxml.etree._Element
+    :param shared: (optional) models of subtrees parsed earlier in the response, identical taxes are reused
+    :type shared: dict
     :rtype: TaxSummary
     """
-    taxes = [parse_tax(tax) for tax in elm.findall("./Tax")]
-    total_tax_amount = (
-        parse_amount(elm.find("./TotalTaxAmount"))
-        if elm.find("./TotalTaxAmount") is not None
-        else None
-    )
+    return _shared(shared, elm, _parse_tax_summary)
+
 
-    return TaxSummary(taxes, total_tax_amount=total_tax_amount)
+def _parse_tax_summary(elm, shared):
+    children = index_children(elm)
+    taxes = [_shared(shared, tax, _parse_tax) for tax in children.get("Tax", ())]
+    total_tax_amount = _first(children, "TotalTaxAmount")
+    if total_tax_amount is not None:
+        total_tax_amount = parse_amount(total_tax_amount)
+
+    return build(TaxSummary, taxes, total_tax_amount=total_tax_amount)
 
 
 def parse_ticket(elm):
-    coupons = [parse_coupon(coupon) for coupon in elm.findall("./Coupon")]
-    ticket_number = elm.find("./TicketNumber").text
-    return Ticket(coupons, ticket_number)
+    children = index_children(elm)
+    coupons = [parse_coupon(coupon) for coupon in children.get("Coupon", ())]
+    ticket_number = _first(children, "TicketNumber").text
+    return build(Ticket, coupons, ticket_number)
 
 
 def parse_ticket_doc_info(elm):
-    pax_ref_id = elm.find("./PaxRefID").text
-    tickets = [parse_ticket(ticket) for ticket in elm.findall("./Ticket")]
-    return TicketDocInfo(pax_ref_id, tickets)
+    children = index_children(elm)
+    pax_ref_id = sys.intern(_first(children, "PaxRefID").text)
+    tickets = [parse_ticket(ticket) for ticket in children.get("Ticket", ())]
+    return build(TicketDocInfo, pax_ref_id, tickets)
 
 
 def parse_transport_dep_arrival(elm):
@@ -529,10 +941,10 @@ def parse_transport_dep_arrival(elm):
     :type elm: lxml.etree._Element
     :rtype: TransportDepArrival
     """
-    iata_location_code = elm.find("./IATA_LocationCode").text
-    scheduled_date_time = elm.find("./ScheduledDateTime").text
-    scheduled_date_time = datetime.datetime.strptime(scheduled_date_time, "%Y-%m-%dT%H:%M:%S")
-    return TransportDepArrival(iata_location_code, scheduled_date_time)
+    children = index_children(elm)
+    iata_location_code = sys.intern(_first(children, "IATA_LocationCode").text)
+    scheduled_date_time = decode_datetime(_first(children, "ScheduledDateTime").text)
+    return build(TransportDepArrival, iata_location_code, scheduled_date_time)
 
 
 def parse_validating_party(elm):
@@ -542,7 +954,34 @@ def parse_validating_party(elm):
     :type elm: lxml.etree._Element
     :rtype: ValidatingParty
     """
-    validating_party_id = elm.find("./ValidatingPartyID").text
-    validating_party_code = elm.find("./ValidatingPartyCode").text
+    children = index_children(elm)
+    validating_party_id = sys.intern(_first(children, "ValidatingPartyID").text)
+    validating_party_code = sys.intern(_first(children, "ValidatingPartyCode").text)
+
+    return build(ValidatingParty, validating_party_id, validating_party_code)
+
+
+class LazyOffer(LazyModel, Offer):
+    """`Offer` parsing its items and total price on first access."""
+
+    LOADERS: ClassVar[dict] = {"offer_items": _offer_items, "total_price": _total_price}
+
+
+class LazyOfferItem(LazyModel, OfferItem):
+    """`OfferItem` parsing its price, services and fare details on first access."""
+
+    LOADERS: ClassVar[dict] = {
+        "price": _price,
+        "services": _services,
+        "fare_details": _fare_details,
+    }
+
+
+class LazyOrder(LazyModel, Order):
+    """`Order` parsing its bookings, items and total price on first access."""
 
-    return ValidatingParty(validating_party_id, validating_party_code)
+    LOADERS: ClassVar[dict] = {
+        "booking_refs": _booking_refs,
+        "order_items": _order_items,
+        "total_price": _order_total_price,
+    }
@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+
+import httpx
+
+from mixvel._parsers import (
+    air_shopping_response,
+    is_cancel_success,
+    parse_order_view_response,
+)
+from mixvel.xml.base import XmlMessage
+from mixvel.xml.requests import (
+    AirShoppingRequest,
+    OrderCancelRequest,
+    OrderChangeRequest,
+    OrderCreateRequest,
+    OrderRetrieveRequest,
+)
+
+from .client import (
+    DEFAULT_MAX_CONCURRENCY,
+    PROD_GATEWAY,
+    BaseClient,
+    _SendTimer,
+    _succeeded,
+)
+from .endpoint import is_login_endpoint
+from .streaming import AsyncOfferIterator
+
+log = logging.getLogger(__name__)
+
+
+class AsyncClient(BaseClient):
+    def __init__(
+        self,
+        login,
+        password,
+        structure_unit_id,
+        gateway=PROD_GATEWAY,
+        verify_ssl=True,
+        transport=None,
+        **kwargs
+    ):
+        """Asynchronous MixVel API Client.
+
+        Mirrors `mixvel.client.Client`, every API method is a coroutine.
+
+        :param gateway: (optional) gateway url, default is `PROD_GATEWAY`
+        :type gateway: str
+        :param verify_ssl: (optional) controls whether we verify the server's SSL certificate, defaults to True
+        :type verify_ssl: bool
+        :param transport: (optional) custom httpx transport, e.g. `httpx.MockTransport` in tests
+        :type transport: httpx.AsyncBaseTransport
+
+        Other keyword arguments configure the request pipeline, see `BaseClient`.
+        """
+        super().__init__(
+            login,
+            password,
+            structure_unit_id,
+            gateway=gateway,
+            verify_ssl=verify_ssl,
+            **kwargs
+        )
+        self._client = httpx.AsyncClient(
+            base_url=gateway, verify=verify_ssl, transport=transport
+        )
+
+    async def __call_cache(self, cache, func, *args):
+        """Calls `func`, in the default executor when `cache` does blocking I/O."""
+        if cache is None or not cache.blocking:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    async def __request(
+        self, endpoint, payload: XmlMessage, hedge=False, stream=False, sized=False
+    ):
+        """Constructs and executes request.
+
+        :param endpoint: method endpoint, e.g. "/api/Accounts/login"
+        :type endpoint: str
+        :param payload: request message
+        :type payload: XmlMessage
+        :param hedge: (optional) race a slow request with a duplicate if `hedging_policy` is set
+        :type hedge: bool
+        :param stream: (optional) return a successful response with its body unread, the caller closes it
+        :type stream: bool
+        :param sized: (optional) also return the length of the response body
+        :type sized: bool
+        :return: content of response `Body` node, or the open response with `stream`.
+        :rtype: lxml.etree._Element | httpx.Response
+        """
+        data = self._prepare_request(payload)
+        log.info("%s%s", self.gateway, endpoint)
+        log.info(data)
+        if hedge and self.hedging_policy is not None:
+            r = await self.__hedged_send(endpoint, payload, data, stream)
+        else:
+            r = await self.__send(endpoint, data, stream)
+        if stream and r.is_success:
+            return r
+        content = await r.aread()
+        log.info(content)
+        r.raise_for_status()
+        if sized:
+            return self._process_response(content), len(content)
+        return self._process_response(content)
+
+    async def __send(self, endpoint, data, stream=False, timer=None):
+        policy = self.retry_policy
+        if policy is None:
+            return await self.__exchange(endpoint, data, stream, timer)
+        policy.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                r = await self.__exchange(endpoint, data, stream, timer)
+            except httpx.TransportError as exc:
+                if not policy.should_retry(endpoint, attempt, exc=exc):
+                    raise
+                log.warning("%s failed: %r", endpoint, exc)
+            else:
+                if not policy.should_retry(endpoint, attempt, response=r):
+                    return r
+                log.warning("%s failed: HTTP %s", endpoint, r.status_code)
+                await r.aclose()
+            await asyncio.sleep(policy.backoff(attempt))
+            attempt += 1
+
+    async def __hedged_send(self, endpoint, payload, data, stream=False):
+        policy = self.hedging_policy
+        sending = asyncio.Event()
+        tasks = [asyncio.ensure_future(self.__timed_send(endpoint, data, stream, sending))]
+        winner = None
+        try:
+            # The hedge delay runs from when the request is actually sent,
+            # not while it waits for a token or a rate limit slot.
+            await sending.wait()
+            delay = policy.delay()
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and policy.acquire():
+                log.info("%s slower than %.3fs, hedging", endpoint, delay)
+                hedge_data = self._prepare_request(payload)
+                tasks.append(
+                    asyncio.ensure_future(self.__timed_send(endpoint, hedge_data, stream))
+                )
+            # A server error only wins if the other request fails as well.
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((task for task in done if _succeeded(task)), None)
+            if winner is None:
+                winner = next((t for t in tasks if t.exception() is None), tasks[-1])
+            return winner.result()
+        finally:
+            for task in tasks:
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
+
+    async def __timed_send(self, endpoint, data, stream=False, sending=None):
+        timer = _SendTimer(sending)
+        try:
+            r = await self.__send(endpoint, data, stream, timer)
+        except asyncio.CancelledError:
+            # The attempt lost to another one and ran at least this long.
+            # Leaving it out would bias the window towards fast requests,
+            # the sync client lets losers finish and records them too.
+            if timer.elapsed:
+                self.hedging_policy.record(timer.elapsed)
+            raise
+        finally:
+            if sending is not None:
+                # Also releases the caller when no request could be sent.
+                sending.set()
+        self.hedging_policy.record(timer.elapsed)
+        return r
+
+    async def __exchange(self, endpoint, data, stream=False, timer=None):
+        breaker = self.circuit_breaker
+        if timer is None:
+            timer = _SendTimer()
+        if breaker is None:
+            return await self.__authorized_post(endpoint, data, stream, timer)
+        breaker.before_call(endpoint)
+        sent_before = timer.elapsed
+        failed = None
+        try:
+            r = await self.__authorized_post(endpoint, data, stream, timer)
+            failed = r.is_server_error
+            return r
+        except httpx.TransportError:
+            failed = True
+            raise
+        finally:
+            breaker.after_call(endpoint, timer.elapsed - sent_before, failed)
+
+    async def __authorized_post(self, endpoint, data, stream, timer):
+        token, r = await self.__post(endpoint, data, stream, timer)
+        if r.status_code == 401 and token is not None:
+            log.info("token rejected, logging in again")
+            await r.aclose()
+            await self._token_manager.ainvalidate(token)
+            token, r = await self.__post(endpoint, data, stream, timer)
+        return r
+
+    async def __post(self, endpoint, data, stream, timer):
+        token = None
+        if not is_login_endpoint(endpoint):
+            token = await self._token_manager.aget_token(self.__login)
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve(self.structure_unit_id, endpoint)
+            await asyncio.sleep(delay)
+        request = self._client.build_request(
+            "POST", endpoint, content=data, headers=self._prepare_headers(token)
+        )
+        return token, await timer.asend(self._client, request, stream)
+
+    async def __login(self):
+        resp = await self.__request("/api/Accounts/login", self._auth_payload())
+        return resp.find("./Token").text
+
+    async def auth(self):
+        """Logins to MixVel API.
+
+        :return: auth token
+        :rtype: str
+        """
+        return await self._token_manager.arefresh(self.__login)
+
+    async def air_shopping(self, itinerary, paxes, offer_filter=None):
+        """Executes air shopping request.
+
+        :param itinerary: itinerary
+        :type itinerary: list[Leg]
+        :param paxes: paxes
+        :type paxes: list[AnonymousPassenger]
+        :param offer_filter: (optional) predicate on the raw Offer element, rejected offers are not parsed, see `mixvel.filters`
+        :type offer_filter: Callable[[xml.etree.ElementTree.Element], bool]
+        :rtype: AirShoppingResponse
+        """
+        payload = AirShoppingRequest(itinerary=itinerary, paxes=paxes)
+        return await self.__air_shopping(payload, offer_filter)
+
+    async def air_shopping_iter(self, itinerary, paxes, offer_filter=None):
+        """Executes air shopping request, offers are parsed as they are consumed.
+
+        The response is neither cached nor shared with concurrent searches.
+        Close the iterator, e.g. with `async with`, when stopping early.
+
+        :param itinerary: itinerary
+        :type itinerary: list[Leg]
+        :param paxes: paxes
+        :type paxes: list[AnonymousPassenger]
+        :param offer_filter: (optional) predicate on the raw Offer element, rejected offers are not parsed, see `mixvel.filters`
+        :type offer_filter: Callable[[xml.etree.ElementTree.Element], bool]
+        :rtype: mixvel.streaming.AsyncOfferIterator
+        """
+        payload = AirShoppingRequest(itinerary=itinerary, paxes=paxes)
+        r = await self.__request(
+            "/api/Order/AirShopping", payload, hedge=True, stream=True
+        )
+        return AsyncOfferIterator(r, offer_filter, self.lazy_models)
+
+    async def air_shopping_many(
+        self, requests, max_concurrency=DEFAULT_MAX_CONCURRENCY, offer_filter=None
+    ):
+        """Executes a batch of air shopping requests concurrently.
+
+        Requests share the underlying connection pool, at most
+        `max_concurrency` of them are in flight at once.
+
+        :param requests: air shopping requests
+        :type requests: list[AirShoppingRequest]
+        :param max_concurrency: (optional) maximum number of requests in flight
+        :type max_concurrency: int
+        :param offer_filter: (optional) predicate on the raw Offer element, applied to every response, see `mixvel.filters`
+        :type offer_filter: Callable[[xml.etree.ElementTree.Element], bool]
+        :return: responses in the order of `requests`, a failed search yields its exception
+        :rtype: list[AirShoppingResponse | Exception]
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        requests = list(requests)
+        if not requests:
+            return []
+        await self._token_manager.aget_token(self.__login)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def search(payload):
+            async with semaphore:
+                return await self.__air_shopping(payload, offer_filter)
+
+        return await asyncio.gather(
+            *(search(payload) for payload in requests), return_exceptions=True
+        )
+
+    async def __air_shopping(self, payload, offer_filter=None):
+        key = None
+        if self.coalescer is not None or self.result_cache is not None:
+            key = self._search_key(payload, offer_filter)
+        if key is None:
+            return await self.__search(payload, offer_filter)
+        if self.result_cache is not None:
+            cached = await self.__call_cache(
+                self.result_cache, self.result_cache.get, key
+            )
+            if cached is not None:
+                return cached
+        if self.coalescer is not None:
+            return await self.coalescer.ado(
+                key, lambda: self.__search(payload, offer_filter, key)
+            )
+        return await self.__search(payload, offer_filter, key)
+
+    async def __search(self, payload, offer_filter=None, key=None):
+        r = await self.__request(
+            "/api/Order/AirShopping", payload, hedge=True, stream=True
+        )
+        async with AsyncOfferIterator(r, offer_filter, self.lazy_models) as offers:
+            result = air_shopping_response(
+                [offer async for offer in offers], offers.data_lists
+            )
+        if key is not None:
+            await self.__call_cache(
+                self.result_cache, self._cache_result, key, result, offers.bytes_read
+            )
+        return result
+
+    async def create_order(self, selected_offer, paxes):
+        """Creates order.
+
+        :param selected_offer: selected offer
+        :type selected_offer: SelectedOffer
+        :param paxes: passengers
+        :type paxes: list[Passenger]
+        :rtype: OrderViewResponse
+        """
+        payload = OrderCreateRequest(selected_offer=selected_offer, paxes=paxes)
+        resp, size = await self.__request("/api/Order/Create", payload, sized=True)
+        view = parse_order_view_response(resp, self.lazy_models)
+        await self.__call_cache(self.order_cache, self._cache_order, view, size)
+        return view
+
+    async def retrieve_order(self, mix_order_id, max_age=None):
+        """Retrieves order.
+
+        :param mix_order_id: aggregated order id
+        :type mix_order_id: str
+        :param max_age: (optional) accept a view from the order cache fetched at most this many seconds ago
+        :type max_age: float
+        :rtype: OrderViewResponse
+        """
+        view = await self.__call_cache(
+            self.order_cache, self._cached_order, mix_order_id, max_age
+        )
+        if view is not None:
+            return view
+        payload = OrderRetrieveRequest(mix_order_id=mix_order_id)
+        resp, size = await self.__request("/api/Order/Retrieve", payload, sized=True)
+
+        view = parse_order_view_response(resp, self.lazy_models)
+        await self.__call_cache(self.order_cache, self._cache_order, view, size)
+        return view
+
+    async def change_order(self, mix_order_id, amount):
+        """Issues tickets.
+
+        :param mix_order_id: aggregated order id
+        :type mix_order_id: str
+        :param amount: amount
+        :type amount: int
+        """
+        await self.__call_cache(self.order_cache, self._evict_order, mix_order_id)
+        payload = OrderChangeRequest(mix_order_id=mix_order_id, amount=amount)
+        resp, size = await self.__request("/api/Order/Change", payload, sized=True)
+
+        view = parse_order_view_response(resp, self.lazy_models)
+        await self.__call_cache(self.order_cache, self._cache_order, view, size)
+        return view
+
+    async def cancel_order(self, mix_order_id):
+        """Cancels order.
+
+        :param mix_order_id: order id
+        :type mix_order_id: str
+        :rtype: bool
+        """
+        payload = OrderCancelRequest(mix_order_id=mix_order_id)
+        try:
+            resp = await self.__request("/api/Order/Cancel", payload)
+        finally:
+            await self.__call_cache(self.order_cache, self._evict_order, mix_order_id)
+        return is_cancel_success(resp)
+
+    async def close(self):
+        """Close the underlying HTTP client session."""
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.auth
+~~~~~~~~~~~
+Bearer token lifecycle shared by `Client` and `AsyncClient`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_TTL = 3600.0
+DEFAULT_REFRESH_AHEAD = 120.0
+
+
+class Token(NamedTuple):
+    value: str
+    expires_at: float
+
+    @classmethod
+    def from_value(cls, value: str, ttl: float = DEFAULT_TOKEN_TTL) -> "Token":
+        return cls(value, token_expiry(value, ttl))
+
+
+def token_expiry(value: str, ttl: float = DEFAULT_TOKEN_TTL) -> float:
+    """Return the expiry of a token as a UNIX timestamp.
+
+    JWT tokens carry their own `exp` claim, any other token is assumed to
+    live for `ttl` seconds from now.
+    """
+
+    try:
+        claims = value.split(".")[1]
+        claims += "=" * (-len(claims) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(claims))["exp"]
+        return float(exp)
+    except (IndexError, KeyError, TypeError, ValueError):
+        return time.time() + ttl
+
+
+def _log_store_failure(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        log.warning("saving the token failed", exc_info=future.exception())
+
+
+class TokenManager:
+    """Keeps a bearer token fresh with at most one login in flight.
+
+    A missing or expired token blocks callers until a single login
+    completes. A token that expires within `refresh_ahead` seconds is still
+    handed out while one background login replaces it, so callers never
+    wait for a refresh.
+
+    With a `store` the token is shared with other managers, typically in
+    other processes: a valid stored token is reused instead of logging in,
+    and logins for the same `key` are serialized through the store lock.
+
+    :param ttl: (optional) lifetime assumed for tokens without an `exp` claim, in seconds
+    :type ttl: float
+    :param refresh_ahead: (optional) how long before expiry the token is refreshed, in seconds
+    :type refresh_ahead: float
+    :param store: (optional) token store shared across processes
+    :type store: mixvel.token_store.TokenStore
+    :param key: (optional) store key, clients fill it from their credentials
+    :type key: str
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TOKEN_TTL,
+        refresh_ahead: float = DEFAULT_REFRESH_AHEAD,
+        store=None,
+        key: Optional[str] = None,
+    ) -> None:
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.store = store
+        self.key = key
+        self._token: Optional[Token] = None
+        self._state_lock = threading.Lock()
+        self._login_lock = threading.Lock()
+        self._refreshing = False
+        self._login_task: Optional[asyncio.Future] = None
+
+    @property
+    def token(self) -> str:
+        """Current token value, empty if there is none."""
+
+        token = self._token
+        return token.value if token is not None else ""
+
+    def set(self, value: str) -> None:
+        """Store a token obtained elsewhere.
+
+        Called from a running event loop, the token store is written in
+        the loop's default executor rather than on the loop.
+        """
+
+        if not value:
+            self._token = None
+            return
+        token = self._token = Token.from_value(value, self.ttl)
+        if self.store is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.store.save(self.key, token)
+            return
+        future = loop.run_in_executor(None, self.store.save, self.key, token)
+        future.add_done_callback(_log_store_failure)
+
+    def invalidate(self, value: str) -> None:
+        """Drop the token if it is still `value`, e.g. after HTTP 401."""
+
+        self._forget(value)
+        if self.store is not None:
+            self.store.delete(self.key, value)
+
+    async def ainvalidate(self, value: str) -> None:
+        """Like `invalidate`, the token store is written in the default executor."""
+
+        self._forget(value)
+        if self.store is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.store.delete, self.key, value)
+
+    def _forget(self, value: str) -> None:
+        with self._state_lock:
+            if self._token is not None and self._token.value == value:
+                self._token = None
+
+    def _usable(self) -> Optional[Token]:
+        token = self._token
+        if token is None or token.expires_at <= time.time():
+            return None
+        return token
+
+    def _needs_refresh(self, token: Token) -> bool:
+        return token.expires_at - self.refresh_ahead <= time.time()
+
+    def _start_refresh(self) -> bool:
+        with self._state_lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            return True
+
+    def _finish_refresh(self) -> None:
+        with self._state_lock:
+            self._refreshing = False
+
+    def _save(self, token: Token) -> Token:
+        self._token = token
+        if self.store is not None:
+            self.store.save(self.key, token)
+        return token
+
+    def _load_fresh(self, stale: Optional[Token]) -> Optional[Token]:
+        """Adopt a stored token that does not need a refresh yet."""
+
+        token = self.store.load(self.key)
+        if token is None or self._needs_refresh(token):
+            return None
+        if stale is not None and token.value == stale.value:
+            return None
+        self._token = token
+        return token
+
+    def get_token(self, login: Callable[[], str]) -> str:
+        """Return a valid token, calling `login` when a new one is needed."""
+
+        token = self._usable()
+        if token is None:
+            with self._login_lock:
+                token = self._usable() or self._renew(login)
+            return token.value
+        if self._needs_refresh(token) and self._start_refresh():
+            threading.Thread(
+                target=self._background_refresh, args=(login, token), daemon=True
+            ).start()
+        return token.value
+
+    def refresh(self, login: Callable[[], str]) -> str:
+        """Log in unconditionally and store the new token."""
+
+        with self._login_lock:
+            return self._renew(login, force=True).value
+
+    def _renew(
+        self, login: Callable[[], str], stale: Optional[Token] = None, force: bool = False
+    ) -> Token:
+        if self.store is None:
+            return self._save(Token.from_value(login(), self.ttl))
+        if not force:
+            token = self._load_fresh(stale)
+            if token is not None:
+                return token
+        with self.store.lock(self.key):
+            if not force:
+                token = self._load_fresh(stale)
+                if token is not None:
+                    return token
+            return self._save(Token.from_value(login(), self.ttl))
+
+    def _background_refresh(self, login: Callable[[], str], stale: Token) -> None:
+        try:
+            with self._login_lock:
+                if self._token == stale:
+                    self._renew(login, stale)
+        except Exception:
+            log.warning("background token refresh failed", exc_info=True)
+        finally:
+            self._finish_refresh()
+
+    async def aget_token(self, login: Callable[[], Awaitable[str]]) -> str:
+        """Return a valid token, awaiting `login` when a new one is needed."""
+
+        token = self._usable()
+        if token is None:
+            token = await self._single_flight(lambda: self._arenew(login))
+            return token.value
+        if self._needs_refresh(token) and self._start_refresh():
+            task = asyncio.ensure_future(
+                self._single_flight(lambda: self._arenew(login, token))
+            )
+            task.add_done_callback(self._background_refresh_done)
+        return token.value
+
+    async def arefresh(self, login: Callable[[], Awaitable[str]]) -> str:
+        """Log in and store the new token, concurrent callers share one login."""
+
+        token = await self._single_flight(lambda: self._arenew(login, force=True))
+        return token.value
+
+    async def _single_flight(self, renew: Callable[[], Awaitable[Token]]) -> Token:
+        task = self._login_task
+        if task is None or task.done():
+            task = asyncio.ensure_future(renew())
+            self._login_task = task
+        return await asyncio.shield(task)
+
+    async def _arenew(
+        self,
+        login: Callable[[], Awaitable[str]],
+        stale: Optional[Token] = None,
+        force: bool = False,
+    ) -> Token:
+        if self.store is None:
+            return self._save(Token.from_value(await login(), self.ttl))
+        loop = asyncio.get_running_loop()
+        if not force:
+            token = await loop.run_in_executor(None, self._load_fresh, stale)
+            if token is not None:
+                return token
+        lock = self.store.lock(self.key)
+        await loop.run_in_executor(None, lock.__enter__)
+        try:
+            if not force:
+                token = await loop.run_in_executor(None, self._load_fresh, stale)
+                if token is not None:
+                    return token
+            token = Token.from_value(await login(), self.ttl)
+            return await loop.run_in_executor(None, self._save, token)
+        finally:
+            await loop.run_in_executor(None, lock.__exit__, None, None, None)
+
+    def _background_refresh_done(self, task: asyncio.Future) -> None:
+        self._finish_refresh()
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("background token refresh failed", exc_info=task.exception())
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.cache
+~~~~~~~~~~~~
+Result caches for parsed API responses.
+"""
+
+from __future__ import annotations
+
+import collections
+import datetime
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Any, Optional, OrderedDict, Tuple
+
+DEFAULT_MAX_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def offers_ttl(response, max_ttl: float) -> float:
+    """Return how long an air shopping response may be served from cache.
+
+    That is until the first of its offers expires, and never longer than
+    `max_ttl` seconds. Offer time limits are naive UTC datetimes. A response
+    without offers is not cached, flights sold out for now may be back on
+    the next search.
+    """
+
+    if not response.offers:
+        return 0.0
+    earliest = min(
+        offer.offer_expiration_timelimit_datetime for offer in response.offers
+    )
+    now = datetime.datetime.utcnow()
+    return min(max_ttl, (earliest - now).total_seconds())
+
+
+def _pickled_size(value: Any) -> int:
+    return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+class ResultCache:
+    """Interface of a result cache.
+
+    :param max_ttl: (optional) upper bound of an entry lifetime, in seconds
+    :type max_ttl: float
+    """
+
+    #: Whether the cache does blocking I/O, `AsyncClient` then calls it
+    #: in the event loop's default executor.
+    blocking = False
+
+    def __init__(self, max_ttl: float = DEFAULT_MAX_TTL) -> None:
+        self.max_ttl = max_ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the live value stored under `key`, if any."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float, size: Optional[int] = None) -> None:
+        """Store `value` under `key` for `ttl` seconds.
+
+        :param size: (optional) approximate memory size of `value` in bytes, e.g. the length of the response body it was parsed from
+        :type size: int
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove the value stored under `key`."""
+        raise NotImplementedError
+
+
+class MemoryCache(ResultCache):
+    """In-process LRU cache bounded by entry count and approximate size.
+
+    Values are shared by reference and must be treated as read-only. An
+    entry counts with the size given to `set`, the client gives the length
+    of the response body, which is close to the memory taken by the parsed
+    models. Values stored without a size are measured as their pickled
+    length, only when `max_bytes` is set.
+
+    :param max_ttl: (optional) upper bound of an entry lifetime, in seconds
+    :type max_ttl: float
+    :param max_entries: (optional) maximum number of entries
+    :type max_entries: int
+    :param max_bytes: (optional) maximum total size of entries, None for no bound
+    :type max_bytes: int
+    """
+
+    def __init__(
+        self,
+        max_ttl: float = DEFAULT_MAX_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    ) -> None:
+        super().__init__(max_ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, Tuple[float, int, Any]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float, size: Optional[int] = None) -> None:
+        if self.max_bytes is None:
+            size = 0
+        elif size is None:
+            size = _pickled_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self.size += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.size > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+
+class DiskCache(ResultCache):
+    """Pickled entries in a directory, least recently used evicted first.
+
+    Entries are unpickled on read, so the directory must only be writable
+    by trusted processes. Several processes may share it. An entry that
+    cannot be unpickled, e.g. written by another version of the package,
+    is deleted and counts as a miss.
+
+    :param directory: cache directory, created if missing
+    :type directory: str
+    :param max_ttl: (optional) upper bound of an entry lifetime, in seconds
+    :type max_ttl: float
+    :param max_bytes: (optional) maximum total size of the entry files
+    :type max_bytes: int
+    """
+
+    SUFFIX = ".pickle"
+    blocking = True
+
+    def __init__(
+        self,
+        directory: str,
+        max_ttl: float = DEFAULT_MAX_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        super().__init__(max_ttl)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return None
+        try:
+            with f:
+                expires_at, value = pickle.load(f)
+        except Exception:
+            self._unlink(path)
+            return None
+        if expires_at <= time.time():
+            self._unlink(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key: str, value: Any, ttl: float, size: Optional[int] = None) -> None:
+        # Entries are bounded by the size of their files.
+        data = pickle.dumps((time.time() + ttl, value), pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._unlink(tmp_path)
+            raise
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        self._unlink(self._path(key))
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(self.SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            self._unlink(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.circuit_breaker
+~~~~~~~~~~~~~~~~~~~~~~
+Per-endpoint circuit breaker that sheds load from a degraded gateway.
+"""
+
+from __future__ import annotations
+
+import collections
+import threading
+import time
+from typing import Deque, Dict, Optional, Tuple
+
+from .exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    __slots__ = ("state", "outcomes", "opened_at", "probes")
+
+    def __init__(self, window: int) -> None:
+        self.state = CLOSED
+        self.outcomes: Deque[Tuple[bool, bool]] = collections.deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probes = 0
+
+
+class CircuitBreaker:
+    """Fails fast on endpoints whose recent calls mostly fail or are slow.
+
+    Each endpoint keeps the outcome of its last `window` calls. Once at
+    least `min_calls` are known and the share of failures reaches
+    `failure_rate`, or the share of calls slower than `slow_call_threshold`
+    reaches `slow_call_rate`, the circuit opens and calls raise
+    `CircuitOpenError` without touching the network. After `reset_timeout`
+    up to `half_open_max_calls` probes are let through: a successful probe
+    closes the circuit, a failed one opens it again.
+
+    Transport errors and HTTP 5xx responses count as failures.
+
+    :param failure_rate: (optional) share of failed calls that opens the circuit
+    :type failure_rate: float
+    :param slow_call_threshold: (optional) latency above which a call is slow, in seconds
+    :type slow_call_threshold: float
+    :param slow_call_rate: (optional) share of slow calls that opens the circuit
+    :type slow_call_rate: float
+    :param window: (optional) number of recent calls considered per endpoint
+    :type window: int
+    :param min_calls: (optional) calls needed before the circuit may open
+    :type min_calls: int
+    :param reset_timeout: (optional) how long the circuit stays open, in seconds
+    :type reset_timeout: float
+    :param half_open_max_calls: (optional) concurrent probes allowed when half-open
+    :type half_open_max_calls: int
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        slow_call_threshold: Optional[float] = None,
+        slow_call_rate: float = 0.8,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        self.failure_rate = failure_rate
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_rate = slow_call_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = _Circuit(self.window)
+        return circuit
+
+    def state(self, endpoint: str) -> str:
+        """Return the state of the endpoint circuit."""
+
+        with self._lock:
+            return self._circuit(endpoint).state
+
+    def before_call(self, endpoint: str) -> None:
+        """Admit a call or raise `CircuitOpenError`."""
+
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == OPEN:
+                retry_after = circuit.opened_at + self.reset_timeout - time.monotonic()
+                if retry_after > 0:
+                    raise CircuitOpenError(endpoint, retry_after)
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+            if circuit.state == HALF_OPEN:
+                if circuit.probes >= self.half_open_max_calls:
+                    raise CircuitOpenError(endpoint, self.reset_timeout)
+                circuit.probes += 1
+
+    def after_call(self, endpoint: str, latency: float, failed: Optional[bool]) -> None:
+        """Record the outcome of an admitted call.
+
+        `failed` is None when the call ended without an outcome worth
+        judging the gateway by, e.g. it was cancelled.
+        """
+
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+                if failed is None:
+                    return
+                slow = self._is_slow(latency)
+                if failed or slow:
+                    self._open(circuit)
+                else:
+                    circuit.state = CLOSED
+                    circuit.outcomes.clear()
+                return
+            if failed is None or circuit.state == OPEN:
+                return
+            circuit.outcomes.append((failed, self._is_slow(latency)))
+            total = len(circuit.outcomes)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for f, _ in circuit.outcomes if f)
+            slow_calls = sum(1 for _, s in circuit.outcomes if s)
+            too_slow = slow_calls > 0 and slow_calls >= self.slow_call_rate * total
+            if failures >= self.failure_rate * total or too_slow:
+                self._open(circuit)
+
+    def _is_slow(self, latency: float) -> bool:
+        return self.slow_call_threshold is not None and latency > self.slow_call_threshold
+
+    def _open(self, circuit: _Circuit) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.outcomes.clear()
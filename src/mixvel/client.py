@@ -1,23 +1,28 @@
 # -*- coding: utf-8 -*-
 import datetime
 import logging
+import threading
+import time
 import uuid
-from xml.etree import ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
 import httpx
 
 from mixvel._parsers import (
+    air_shopping_response,
+    find_error,
     is_cancel_success,
-    parse_air_shopping_response,
     parse_order_view_response,
+    raise_for_error,
 )
 from mixvel.models import (
     Passenger,
     SelectedOffer,
 )
 from mixvel.models import AirShoppingResponse
+from mixvel.xml.backend import get_backend
 from mixvel.xml.base import XmlMessage
-from mixvel.xml.envelope import MessageEnvelope, MessageInfo
+from mixvel.xml.envelope import write_envelope
 from mixvel.xml.requests import (
     AirShoppingRequest,
     AuthRequest,
@@ -26,93 +31,443 @@ from mixvel.xml.requests import (
     OrderCreateRequest,
     OrderRetrieveRequest,
 )
+from mixvel.xml.serializer import XmlWriter
 
+from .auth import TokenManager
+from .cache import offers_ttl
+from .coalescing import request_key
+from .streaming import OfferIterator
+from .token_store import token_key
 from .endpoint import is_login_endpoint
-from .exceptions import NoOrdersToCancel
-from .utils import strip_namespaces
 
 PROD_GATEWAY = "https://api.mixvel.com"
 TEST_GATEWAY = "https://api-test.mixvel.com"
 
+DEFAULT_MAX_CONCURRENCY = 10
+
 log = logging.getLogger(__name__)
-class Client:
+
+
+def _succeeded(future):
+    return future.exception() is None and not future.result().is_server_error
+
+
+class _SendTimer:
+    """Time spent sending the requests of a call.
+
+    Waits for a token or a rate limit slot happen on the client side and
+    are left out, the circuit breaker and the hedging policy only see how
+    long the gateway takes.
+
+    :param sending: (optional) event set when the first request is sent
+    :type sending: threading.Event | asyncio.Event
+    """
+
+    __slots__ = ("elapsed", "sending")
+
+    def __init__(self, sending=None):
+        self.elapsed = 0.0
+        self.sending = sending
+
+    def send(self, client, request, stream=False):
+        if self.sending is not None:
+            self.sending.set()
+        started = time.monotonic()
+        try:
+            return client.send(request, stream=stream)
+        finally:
+            self.elapsed += time.monotonic() - started
+
+    async def asend(self, client, request, stream=False):
+        if self.sending is not None:
+            self.sending.set()
+        started = time.monotonic()
+        try:
+            return await client.send(request, stream=stream)
+        finally:
+            self.elapsed += time.monotonic() - started
+
+
+def _in_thread(func, *args):
+    """Runs `func` in a new daemon thread and returns the future of its result.
+
+    Every attempt of a hedged call gets its own thread, so an attempt never
+    waits in a queue behind other calls.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = func(*args)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name="mixvel-hedge", daemon=True).start()
+    return future
+
+
+def _discard(future):
+    """Closes the response of a hedged request that lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class BaseClient:
     def __init__(
-        self, login, password, structure_unit_id, gateway=PROD_GATEWAY, verify_ssl=True
+        self,
+        login,
+        password,
+        structure_unit_id,
+        gateway=PROD_GATEWAY,
+        verify_ssl=True,
+        token_manager=None,
+        token_store=None,
+        retry_policy=None,
+        hedging_policy=None,
+        circuit_breaker=None,
+        rate_limiter=None,
+        coalescer=None,
+        result_cache=None,
+        order_cache=None,
+        lazy_models=False,
     ):
-        """MixVel API Client.
+        """State and message handling shared by `Client` and `AsyncClient`.
 
         :param gateway: (optional) gateway url, default is `PROD_GATEWAY`
         :type gateway: str
         :param verify_ssl: (optional) controls whether we verify the server's SSL certificate, defaults to True
         :type verify_ssl: bool
+        :param token_manager: (optional) token manager, may be shared by clients with the same credentials
+        :type token_manager: TokenManager
+        :param token_store: (optional) store sharing the token across processes, ignored with `token_manager`
+        :type token_store: mixvel.token_store.TokenStore
+        :param retry_policy: (optional) retries transient failures of idempotent calls, no retries by default
+        :type retry_policy: mixvel.retry.RetryPolicy
+        :param hedging_policy: (optional) races slow air shopping calls with a duplicate request
+        :type hedging_policy: mixvel.hedging.HedgingPolicy
+        :param circuit_breaker: (optional) fails fast on endpoints the gateway keeps failing
+        :type circuit_breaker: mixvel.circuit_breaker.CircuitBreaker
+        :param rate_limiter: (optional) queues requests to stay within gateway quotas
+        :type rate_limiter: mixvel.rate_limit.RateLimiter
+        :param coalescer: (optional) shares one air shopping call among concurrent identical searches
+        :type coalescer: mixvel.coalescing.RequestCoalescer
+        :param result_cache: (optional) serves repeated air shopping searches until their offers expire
+        :type result_cache: mixvel.cache.ResultCache
+        :param order_cache: (optional) keeps order views for `retrieve_order` calls with `max_age`
+        :type order_cache: mixvel.cache.ResultCache
+        :param lazy_models: (optional) offers and orders parse their nested fields on first access
+        :type lazy_models: bool
         """
         self.login = login
         self.password = password
         self.structure_unit_id = structure_unit_id
-        self.token = ""
         self.gateway = gateway
         self.verify_ssl = verify_ssl
-        self._client = httpx.Client(base_url=gateway, verify=verify_ssl)
-
-    def __prepare_request(self, payload: XmlMessage) -> str:
-        """Wrap the request payload in a MixVel envelope."""
-
-        envelope = MessageEnvelope(
-            message_info=MessageInfo(
-                message_id=str(uuid.uuid4()),
-                time_sent=datetime.datetime.utcnow().replace(
-                    tzinfo=datetime.timezone.utc
-                ),
-            ),
-            payload=payload,
+        if token_manager is None:
+            token_manager = TokenManager(store=token_store)
+        if token_manager.key is None:
+            token_manager.key = token_key(login, structure_unit_id, gateway)
+        self._token_manager = token_manager
+        self.retry_policy = retry_policy
+        self.hedging_policy = hedging_policy
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.coalescer = coalescer
+        self.result_cache = result_cache
+        self.order_cache = order_cache
+        self.lazy_models = lazy_models
+
+    @property
+    def token(self):
+        """Current bearer token, empty until the first login."""
+        return self._token_manager.token
+
+    @token.setter
+    def token(self, value):
+        self._token_manager.set(value)
+
+    def _prepare_request(self, payload: XmlMessage) -> bytes:
+        """Serialize the request payload wrapped in a MixVel envelope."""
+
+        writer = XmlWriter()
+        write_envelope(
+            writer,
+            str(uuid.uuid4()),
+            datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc),
+            payload,
         )
-        return envelope.to_xml()
+        return writer.getvalue()
 
-    def __request(self, endpoint, payload: XmlMessage):
-        """Constructs and executes request.
+    def _prepare_headers(self, token=None):
+        """Builds request headers.
 
-        :param endpoint: method endpoint, e.g. "/api/Accounts/login"
-        :type endpoint: str
-        :param context: request variables.
-        :type context: dict
-        :return: content of response `Body` node.
-        :rtype: lxml.etree._Element
+        :param token: (optional) bearer token, omitted for the login endpoint
+        :type token: str
+        :rtype: dict
         """
         headers = {
             "Content-Type": "application/xml",
         }
-        if not is_login_endpoint(endpoint):
-            if not self.token:
-                self.auth()
-            headers["Authorization"] = "Bearer {token}".format(token=self.token)
-        data = self.__prepare_request(payload)
-        self.sent = data
+        if token is not None:
+            headers["Authorization"] = "Bearer {token}".format(token=token)
+        return headers
+
+    def _auth_payload(self):
+        return AuthRequest(
+            login=self.login,
+            password=self.password,
+            structure_unit_id=self.structure_unit_id,
+        )
+
+    def _search_key(self, payload, offer_filter=None):
+        """Returns the coalescing and cache key of a search, None if it cannot have one."""
+        scope = self._token_manager.key
+        if offer_filter is not None:
+            filter_key = getattr(offer_filter, "cache_key", None)
+            if filter_key is None:
+                return None
+            scope = "{scope}|{filter_key}".format(scope=scope, filter_key=filter_key)
+        return request_key(scope, payload)
+
+    def _cache_result(self, key, result, size):
+        """Stores an air shopping result until its first offer expires.
+
+        :param size: length of the response body, stands for the size of the result
+        :type size: int
+        """
+        if self.result_cache is None:
+            return
+        ttl = offers_ttl(result, self.result_cache.max_ttl)
+        if ttl > 0:
+            self.result_cache.set(key, result, ttl, size)
+
+    def _order_key(self, mix_order_id):
+        return "{scope}|order|{mix_order_id}".format(
+            scope=self._token_manager.key, mix_order_id=mix_order_id
+        )
+
+    def _cached_order(self, mix_order_id, max_age):
+        """Returns the cached view of an order fetched at most `max_age` seconds ago."""
+        if self.order_cache is None or max_age is None:
+            return None
+        entry = self.order_cache.get(self._order_key(mix_order_id))
+        if entry is None:
+            return None
+        fetched_at, view = entry
+        if time.time() - fetched_at > max_age:
+            return None
+        return view
+
+    def _cache_order(self, view, size):
+        """Stores an order view returned by the gateway.
+
+        :param size: length of the response body, stands for the size of the view
+        :type size: int
+        """
+        if self.order_cache is None:
+            return
+        self.order_cache.set(
+            self._order_key(view.mix_order.mix_order_id),
+            (time.time(), view),
+            self.order_cache.max_ttl,
+            size,
+        )
+
+    def _evict_order(self, mix_order_id):
+        if self.order_cache is not None:
+            self.order_cache.delete(self._order_key(mix_order_id))
+
+    def _process_response(self, content):
+        """Parses raw response and raises on MixVel errors.
+
+        :param content: raw response body
+        :type content: bytes
+        :return: content of response `Body` node.
+        :rtype: lxml.etree._Element
+        """
+        backend = get_backend()
+        envelope = backend.fromstring(content)
+        err = find_error(envelope)
+        if err is not None:
+            raise_for_error(err)
+        return backend.find(envelope, "./Body/AppData/*")
+
+
+class Client(BaseClient):
+    def __init__(
+        self,
+        login,
+        password,
+        structure_unit_id,
+        gateway=PROD_GATEWAY,
+        verify_ssl=True,
+        transport=None,
+        **kwargs
+    ):
+        """MixVel API Client.
+
+        :param gateway: (optional) gateway url, default is `PROD_GATEWAY`
+        :type gateway: str
+        :param verify_ssl: (optional) controls whether we verify the server's SSL certificate, defaults to True
+        :type verify_ssl: bool
+        :param transport: (optional) custom httpx transport, e.g. `httpx.MockTransport` in tests
+        :type transport: httpx.BaseTransport
+
+        Other keyword arguments configure the request pipeline, see `BaseClient`.
+        """
+        super().__init__(
+            login,
+            password,
+            structure_unit_id,
+            gateway=gateway,
+            verify_ssl=verify_ssl,
+            **kwargs
+        )
+        self._client = httpx.Client(
+            base_url=gateway, verify=verify_ssl, transport=transport
+        )
+
+    def __request(
+        self, endpoint, payload: XmlMessage, hedge=False, stream=False, sized=False
+    ):
+        """Constructs and executes request.
+
+        :param endpoint: method endpoint, e.g. "/api/Accounts/login"
+        :type endpoint: str
+        :param payload: request message
+        :type payload: XmlMessage
+        :param hedge: (optional) race a slow request with a duplicate if `hedging_policy` is set
+        :type hedge: bool
+        :param stream: (optional) return a successful response with its body unread, the caller closes it
+        :type stream: bool
+        :param sized: (optional) also return the length of the response body
+        :type sized: bool
+        :return: content of response `Body` node, or the open response with `stream`.
+        :rtype: lxml.etree._Element | httpx.Response
+        """
+        data = self._prepare_request(payload)
         log.info("%s%s", self.gateway, endpoint)
-        log.info(self.sent)
-        self.recv = None
-        r = self._client.post(endpoint, content=data, headers=headers)
-        self.recv = r.content
-        log.info(self.recv)
+        log.info(data)
+        if hedge and self.hedging_policy is not None:
+            r = self.__hedged_send(endpoint, payload, data, stream)
+        else:
+            r = self.__send(endpoint, data, stream)
+        if stream and r.is_success:
+            return r
+        content = r.read()
+        log.info(content)
         r.raise_for_status()
-        resp = ET.fromstring(self.recv)
-        strip_namespaces(resp)
-        err = resp.find(".//Error")
-        if err is not None:
-            typ = err.find("./ErrorType").text
-            code = err.find("./Code").text if err.find("./Code") is not None else ""
-            desc = (
-                err.find("./DescText").text.encode("utf-8")
-                if err.find("./DescText") is not None
-                else ""
-            )
-            if code == "MIX-106001":
-                raise NoOrdersToCancel
-            if code == "":
-                code = "UNDEFINED"
-            raise IOError(
-                "{code}: {type}: {desc}".format(code=code, type=typ, desc=desc)
-            )
-        return resp.find(".//Body/AppData/")
+        if sized:
+            return self._process_response(content), len(content)
+        return self._process_response(content)
+
+    def __send(self, endpoint, data, stream=False, timer=None):
+        policy = self.retry_policy
+        if policy is None:
+            return self.__exchange(endpoint, data, stream, timer)
+        policy.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                r = self.__exchange(endpoint, data, stream, timer)
+            except httpx.TransportError as exc:
+                if not policy.should_retry(endpoint, attempt, exc=exc):
+                    raise
+                log.warning("%s failed: %r", endpoint, exc)
+            else:
+                if not policy.should_retry(endpoint, attempt, response=r):
+                    return r
+                log.warning("%s failed: HTTP %s", endpoint, r.status_code)
+                r.close()
+            time.sleep(policy.backoff(attempt))
+            attempt += 1
+
+    def __hedged_send(self, endpoint, payload, data, stream=False):
+        policy = self.hedging_policy
+        sending = threading.Event()
+        futures = [_in_thread(self.__timed_send, endpoint, data, stream, sending)]
+        # The hedge delay runs from when the request is actually sent, not
+        # while it waits for a token or a rate limit slot.
+        sending.wait()
+        delay = policy.delay()
+        done, _ = wait(futures, timeout=delay)
+        if not done and policy.acquire():
+            log.info("%s slower than %.3fs, hedging", endpoint, delay)
+            hedge_data = self._prepare_request(payload)
+            futures.append(_in_thread(self.__timed_send, endpoint, hedge_data, stream))
+        # A server error only wins if the other request fails as well.
+        winner = None
+        pending = set(futures)
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if _succeeded(future)), None)
+        if winner is None:
+            winner = next((f for f in futures if f.exception() is None), futures[-1])
+        # A blocking request cannot be interrupted, the loser is left to
+        # finish in the background and its response is discarded.
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(_discard)
+        return winner.result()
+
+    def __timed_send(self, endpoint, data, stream=False, sending=None):
+        timer = _SendTimer(sending)
+        try:
+            r = self.__send(endpoint, data, stream, timer)
+        finally:
+            if sending is not None:
+                # Also releases the caller when no request could be sent.
+                sending.set()
+        self.hedging_policy.record(timer.elapsed)
+        return r
+
+    def __exchange(self, endpoint, data, stream=False, timer=None):
+        breaker = self.circuit_breaker
+        if timer is None:
+            timer = _SendTimer()
+        if breaker is None:
+            return self.__authorized_post(endpoint, data, stream, timer)
+        breaker.before_call(endpoint)
+        sent_before = timer.elapsed
+        failed = None
+        try:
+            r = self.__authorized_post(endpoint, data, stream, timer)
+            failed = r.is_server_error
+            return r
+        except httpx.TransportError:
+            failed = True
+            raise
+        finally:
+            breaker.after_call(endpoint, timer.elapsed - sent_before, failed)
+
+    def __authorized_post(self, endpoint, data, stream, timer):
+        token, r = self.__post(endpoint, data, stream, timer)
+        if r.status_code == 401 and token is not None:
+            log.info("token rejected, logging in again")
+            r.close()
+            self._token_manager.invalidate(token)
+            token, r = self.__post(endpoint, data, stream, timer)
+        return r
+
+    def __post(self, endpoint, data, stream, timer):
+        token = None
+        if not is_login_endpoint(endpoint):
+            token = self._token_manager.get_token(self.__login)
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve(self.structure_unit_id, endpoint)
+            time.sleep(delay)
+        request = self._client.build_request(
+            "POST", endpoint, content=data, headers=self._prepare_headers(token)
+        )
+        return token, timer.send(self._client, request, stream)
+
+    def __login(self):
+        resp = self.__request("/api/Accounts/login", self._auth_payload())
+        return resp.find("./Token").text
 
     def auth(self):
         """Logins to MixVel API.
@@ -120,29 +475,98 @@ class Client:
         :return: auth token
         :rtype: str
         """
-        payload = AuthRequest(
-            login=self.login,
-            password=self.password,
-            structure_unit_id=self.structure_unit_id,
-        )
-        resp = self.__request("/api/Accounts/login", payload)
-        token = resp.find("./Token").text
-        self.token = token
+        return self._token_manager.refresh(self.__login)
 
-        return token
-
-    def air_shopping(self, itinerary, paxes):
+    def air_shopping(self, itinerary, paxes, offer_filter=None):
         """Executes air shopping request.
 
         :param itinerary: itinerary
         :type itinerary: list[Leg]
         :param paxes: paxes
         :type paxes: list[AnonymousPassenger]
+        :param offer_filter: (optional) predicate on the raw Offer element, rejected offers are not parsed, see `mixvel.filters`
+        :type offer_filter: Callable[[xml.etree.ElementTree.Element], bool]
         :rtype: AirShoppingResponse
         """
         payload = AirShoppingRequest(itinerary=itinerary, paxes=paxes)
-        resp = self.__request("/api/Order/AirShopping", payload)
-        return parse_air_shopping_response(resp)
+        return self.__air_shopping(payload, offer_filter)
+
+    def air_shopping_iter(self, itinerary, paxes, offer_filter=None):
+        """Executes air shopping request, offers are parsed as they are consumed.
+
+        The response is neither cached nor shared with concurrent searches.
+        Close the iterator, e.g. with `with`, when stopping early.
+
+        :param itinerary: itinerary
+        :type itinerary: list[Leg]
+        :param paxes: paxes
+        :type paxes: list[AnonymousPassenger]
+        :param offer_filter: (optional) predicate on the raw Offer element, rejected offers are not parsed, see `mixvel.filters`
+        :type offer_filter: Callable[[xml.etree.ElementTree.Element], bool]
+        :rtype: mixvel.streaming.OfferIterator
+        """
+        payload = AirShoppingRequest(itinerary=itinerary, paxes=paxes)
+        r = self.__request("/api/Order/AirShopping", payload, hedge=True, stream=True)
+        return OfferIterator(r, offer_filter, self.lazy_models)
+
+    def air_shopping_many(
+        self, requests, max_concurrency=DEFAULT_MAX_CONCURRENCY, offer_filter=None
+    ):
+        """Executes a batch of air shopping requests concurrently.
+
+        Requests share the underlying connection pool, at most
+        `max_concurrency` of them are in flight at once.
+
+        :param requests: air shopping requests
+        :type requests: list[AirShoppingRequest]
+        :param max_concurrency: (optional) maximum number of requests in flight
+        :type max_concurrency: int
+        :param offer_filter: (optional) predicate on the raw Offer element, applied to every response, see `mixvel.filters`
+        :type offer_filter: Callable[[xml.etree.ElementTree.Element], bool]
+        :return: responses in the order of `requests`, a failed search yields its exception
+        :rtype: list[AirShoppingResponse | Exception]
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        requests = list(requests)
+        if not requests:
+            return []
+        self._token_manager.get_token(self.__login)
+        workers = min(max_concurrency, len(requests))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self.__air_shopping, payload, offer_filter)
+                for payload in requests
+            ]
+        results = []
+        for future in futures:
+            exc = future.exception()
+            results.append(exc if exc is not None else future.result())
+        return results
+
+    def __air_shopping(self, payload, offer_filter=None):
+        key = None
+        if self.coalescer is not None or self.result_cache is not None:
+            key = self._search_key(payload, offer_filter)
+        if key is None:
+            return self.__search(payload, offer_filter)
+        if self.result_cache is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+        if self.coalescer is not None:
+            return self.coalescer.do(
+                key, lambda: self.__search(payload, offer_filter, key)
+            )
+        return self.__search(payload, offer_filter, key)
+
+    def __search(self, payload, offer_filter=None, key=None):
+        r = self.__request("/api/Order/AirShopping", payload, hedge=True, stream=True)
+        with OfferIterator(r, offer_filter, self.lazy_models) as offers:
+            result = air_shopping_response(list(offers), offers.data_lists)
+        if key is not None:
+            self._cache_result(key, result, offers.bytes_read)
+        return result
 
     def create_order(self, selected_offer, paxes):
         """Creates order.
@@ -154,20 +578,29 @@ class Client:
         :rtype: OrderViewResponse
         """
         payload = OrderCreateRequest(selected_offer=selected_offer, paxes=paxes)
-        resp = self.__request("/api/Order/Create", payload)
-        return parse_order_view_response(resp)
+        resp, size = self.__request("/api/Order/Create", payload, sized=True)
+        view = parse_order_view_response(resp, self.lazy_models)
+        self._cache_order(view, size)
+        return view
 
-    def retrieve_order(self, mix_order_id):
+    def retrieve_order(self, mix_order_id, max_age=None):
         """Retrieves order.
 
         :param mix_order_id: aggregated order id
         :type mix_order_id: str
+        :param max_age: (optional) accept a view from the order cache fetched at most this many seconds ago
+        :type max_age: float
         :rtype: OrderViewResponse
         """
+        view = self._cached_order(mix_order_id, max_age)
+        if view is not None:
+            return view
         payload = OrderRetrieveRequest(mix_order_id=mix_order_id)
-        resp = self.__request("/api/Order/Retrieve", payload)
+        resp, size = self.__request("/api/Order/Retrieve", payload, sized=True)
 
-        return parse_order_view_response(resp)
+        view = parse_order_view_response(resp, self.lazy_models)
+        self._cache_order(view, size)
+        return view
 
     def change_order(self, mix_order_id, amount):
         """Issues tickets.
@@ -177,10 +610,13 @@ class Client:
         :param amount: amount
         :type amount: int
         """
+        self._evict_order(mix_order_id)
         payload = OrderChangeRequest(mix_order_id=mix_order_id, amount=amount)
-        resp = self.__request("/api/Order/Change", payload)
+        resp, size = self.__request("/api/Order/Change", payload, sized=True)
 
-        return parse_order_view_response(resp)
+        view = parse_order_view_response(resp, self.lazy_models)
+        self._cache_order(view, size)
+        return view
 
     def cancel_order(self, mix_order_id):
         """Cancels order.
@@ -190,7 +626,10 @@ class Client:
         :rtype: bool
         """
         payload = OrderCancelRequest(mix_order_id=mix_order_id)
-        resp = self.__request("/api/Order/Cancel", payload)
+        try:
+            resp = self.__request("/api/Order/Cancel", payload)
+        finally:
+            self._evict_order(mix_order_id)
         return is_cancel_success(resp)
 
     def close(self):
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.coalescing
+~~~~~~~~~~~~~~~~~
+Sharing one gateway call among concurrent identical requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, TypeVar
+
+from .xml.base import XmlMessage
+
+T = TypeVar("T")
+
+
+def request_key(scope: str, payload: XmlMessage) -> str:
+    """Return a canonical hash of a request message within `scope`.
+
+    The message body carries no per-call data (ids and timestamps live in
+    the envelope), so identical searches serialize to identical bytes.
+    """
+
+    digest = hashlib.sha256(scope.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(payload.to_bytes())
+    return digest.hexdigest()
+
+
+class RequestCoalescer:
+    """Runs a single call per key, concurrent callers share its outcome.
+
+    Only calls that overlap in time are coalesced, nothing is kept once the
+    call completes. Followers receive the very same result object, which
+    must therefore be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, Future] = {}
+        self._tasks: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, call: Callable[[], T]) -> T:
+        """Run `call` unless a call with the same key is in flight."""
+
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            future.set_result(call())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+    async def ado(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Await `call` unless a call with the same key is in flight."""
+
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
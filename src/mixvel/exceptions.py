@@ -1,3 +1,29 @@
 class NoOrdersToCancel(IOError):
     """There are no orders available for cancellation in the Mix Order."""
     pass
+
+
+class CircuitOpenError(IOError):
+    """The circuit breaker of the endpoint is open, the request was not sent."""
+
+    def __init__(self, endpoint, retry_after):
+        super().__init__(
+            "circuit open for {endpoint}, retry in {retry_after:.1f}s".format(
+                endpoint=endpoint, retry_after=retry_after
+            )
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class RateLimitExceeded(IOError):
+    """The request would have queued longer than the rate limiter allows."""
+
+    def __init__(self, endpoint, max_wait):
+        super().__init__(
+            "rate limit for {endpoint} exceeded, queue longer than {max_wait:.1f}s".format(
+                endpoint=endpoint, max_wait=max_wait
+            )
+        )
+        self.endpoint = endpoint
+        self.max_wait = max_wait
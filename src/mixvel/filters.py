@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.filters
+~~~~~~~~~~~~~~
+Offer filters checked against raw `Offer` XML before it is parsed.
+
+Any callable taking the `Offer` element and returning a bool can filter
+offers. Rejected offers never get parsed into models.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from ._parsers import parse_amount
+from .models import Amount
+
+
+class OfferFilter:
+    """Declarative offer filter.
+
+    Unlike an arbitrary callable it has a `cache_key`, so filtered searches
+    can still be cached and coalesced.
+
+    :param owner_codes: (optional) accepted offer owners, e.g. ["SU", "DP"]
+    :type owner_codes: Iterable[str]
+    :param max_total_amount: (optional) highest accepted offer total, offers in another currency are rejected, offers without a total are kept
+    :type max_total_amount: Amount
+    :param max_segments: (optional) highest accepted number of flight segments, all journeys included
+    :type max_segments: int
+    """
+
+    def __init__(
+        self,
+        owner_codes: Optional[Iterable[str]] = None,
+        max_total_amount: Optional[Amount] = None,
+        max_segments: Optional[int] = None,
+    ) -> None:
+        self.owner_codes = frozenset(owner_codes) if owner_codes is not None else None
+        self.max_total_amount = max_total_amount
+        self.max_segments = max_segments
+
+    @property
+    def cache_key(self) -> str:
+        owner_codes = (
+            ",".join(sorted(self.owner_codes)) if self.owner_codes is not None else ""
+        )
+        max_total_amount = (
+            "{amount} {cur_code}".format(
+                amount=self.max_total_amount.amount,
+                cur_code=self.max_total_amount.cur_code,
+            )
+            if self.max_total_amount is not None
+            else ""
+        )
+        return "owner_codes={owner_codes};max_total_amount={amount};max_segments={segments}".format(
+            owner_codes=owner_codes,
+            amount=max_total_amount,
+            segments=self.max_segments if self.max_segments is not None else "",
+        )
+
+    def __call__(self, elm) -> bool:
+        if self.owner_codes is not None:
+            if elm.findtext("OwnerCode") not in self.owner_codes:
+                return False
+        if self.max_total_amount is not None:
+            total = elm.find("./TotalPrice/TotalAmount")
+            if total is not None:
+                amount = parse_amount(total)
+                if amount.cur_code != self.max_total_amount.cur_code:
+                    return False
+                if amount.amount > self.max_total_amount.amount:
+                    return False
+        if self.max_segments is not None:
+            segments = {
+                ref_id.text
+                for ref_id in elm.iterfind(
+                    "./OfferItem/FareDetail/FareComponent/PaxSegmentRefID"
+                )
+            }
+            if len(segments) > self.max_segments:
+                return False
+        return True
+
+    def __repr__(self) -> str:
+        return "OfferFilter({key})".format(key=self.cache_key)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.hedging
+~~~~~~~~~~~~~~
+Hedged requests: a slow AirShopping call gets raced by a duplicate.
+"""
+
+from __future__ import annotations
+
+import collections
+import math
+import threading
+from typing import Deque
+
+from .rate_limit import TokenBucket
+
+
+class HedgingPolicy:
+    """Decides when a duplicate request is sent and how often.
+
+    The hedge delay is the `percentile` of recently observed latencies, so
+    only the slowest calls are duplicated. Until `min_samples` latencies are
+    known `initial_delay` is used. Hedges are capped by a token bucket that
+    refills at `max_hedges_per_second`.
+
+    :param percentile: (optional) latency percentile after which a hedge is sent
+    :type percentile: float
+    :param initial_delay: (optional) hedge delay before enough latencies are known, in seconds
+    :type initial_delay: float
+    :param min_delay: (optional) lower bound of the hedge delay, in seconds
+    :type min_delay: float
+    :param max_hedges_per_second: (optional) sustained rate of hedges
+    :type max_hedges_per_second: float
+    :param window: (optional) number of recent latencies kept
+    :type window: int
+    :param min_samples: (optional) latencies needed before the percentile is used
+    :type min_samples: int
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.05,
+        max_hedges_per_second: float = 1.0,
+        window: int = 200,
+        min_samples: int = 20,
+    ) -> None:
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be in (0, 100]")
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_hedges_per_second = max_hedges_per_second
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = collections.deque(maxlen=window)
+        self._hedges = TokenBucket(max_hedges_per_second)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a completed request, in seconds."""
+
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self) -> float:
+        """Return how long to wait for the original request before hedging."""
+
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < self.min_samples:
+            return max(self.min_delay, self.initial_delay)
+        index = max(0, math.ceil(self.percentile / 100 * len(latencies)) - 1)
+        return max(self.min_delay, latencies[index])
+
+    def acquire(self) -> bool:
+        """Take the right to send one hedge, False when over the rate cap."""
+
+        return self._hedges.try_acquire()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import datetime as _dt
-from mixvel._compat.pydantic import BaseModel, ConfigDict, Field
+from mixvel._compat.pydantic import PYDANTIC, BaseModel, ConfigDict, Field
 
 
 class MixvelModel(BaseModel):
@@ -9,8 +9,39 @@ class MixvelModel(BaseModel):
 
     model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
-
-class Amount(MixvelModel):
+    if PYDANTIC:
+        # The fallback models take positional arguments natively.
+        def __init__(self, *args, **data):
+            # The parsers build models positionally, in field declaration order.
+            if args:
+                names = list(type(self).model_fields)
+                if len(args) > len(names):
+                    raise TypeError(
+                        f"{type(self).__name__} takes at most {len(names)} positional "
+                        f"arguments but {len(args)} were given"
+                    )
+                for name, value in zip(names, args):
+                    if name in data:
+                        raise TypeError(
+                            f"{type(self).__name__} got multiple values for field '{name}'"
+                        )
+                    data[name] = value
+            super().__init__(**data)
+
+
+class FrozenModel(MixvelModel):
+    """Base class for value models a parsed response shares between offers.
+
+    Assigning a field raises, so changing one offer's price cannot change
+    another offer's price.
+    """
+
+    model_config = ConfigDict(
+        populate_by_name=True, arbitrary_types_allowed=True, frozen=True
+    )
+
+
+class Amount(FrozenModel):
     amount: int
     cur_code: str | None = None
 
@@ -31,8 +62,8 @@ class Carrier(MixvelModel):
 
 class Booking(MixvelModel):
     booking_id: str
-    booking_entity: BookingEntity | None = None
-    booking_ref_type_code: str | None = None
+    booking_entity: BookingEntity | None = Field(default=None, alias="entity")
+    booking_ref_type_code: str | None = Field(default=None, alias="type_code")
 
 
 class Coupon(MixvelModel):
@@ -100,17 +131,17 @@ class FareDetail(MixvelModel):
     pax_ref_id: str
 
 
-class Tax(MixvelModel):
+class Tax(FrozenModel):
     amount: Amount
     tax_code: str
 
 
-class TaxSummary(MixvelModel):
+class TaxSummary(FrozenModel):
     taxes: list[Tax] = Field(default_factory=list)
     total_tax_amount: Amount | None = None
 
 
-class Price(MixvelModel):
+class Price(FrozenModel):
     tax_summary: TaxSummary | None = None
     total_amount: Amount
 
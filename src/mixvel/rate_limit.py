@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.rate_limit
+~~~~~~~~~~~~~~~~~
+Client-side token bucket rate limiting.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
+
+from .exceptions import RateLimitExceeded
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second.
+
+    :param rate: tokens added per second
+    :type rate: float
+    :param burst: (optional) bucket capacity, defaults to one second worth of tokens
+    :type burst: float
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now."""
+
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Reserve a token, return how long to wait for it.
+
+        Reservations queue up behind each other. None is returned, and
+        nothing is reserved, when the wait would exceed `max_wait`.
+        """
+
+        with self._lock:
+            self._refill()
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+class RateLimiter:
+    """Per structure unit and endpoint request rate limits.
+
+    Every endpoint of every structure unit gets its own bucket, refilled at
+    the rate from `endpoint_rates` or, failing that, `rate`. Endpoints
+    without a rate are not limited. A request waits for its turn for at
+    most `max_wait` seconds, beyond that `RateLimitExceeded` is raised
+    instead of sending a request the gateway would reject.
+
+    :param rate: (optional) default requests per second for every endpoint
+    :type rate: float
+    :param endpoint_rates: (optional) requests per second by endpoint path
+    :type endpoint_rates: dict[str, float]
+    :param burst: (optional) bucket capacity, defaults to one second worth of requests
+    :type burst: float
+    :param max_wait: (optional) how long a request may queue, in seconds
+    :type max_wait: float
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        endpoint_rates: Optional[Mapping[str, float]] = None,
+        burst: Optional[float] = None,
+        max_wait: float = 5.0,
+    ) -> None:
+        self.rate = rate
+        self.endpoint_rates = dict(endpoint_rates or {})
+        self.burst = burst
+        self.max_wait = max_wait
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, structure_unit_id: str, endpoint: str) -> Optional[TokenBucket]:
+        rate = self.endpoint_rates.get(endpoint, self.rate)
+        if rate is None:
+            return None
+        key = (structure_unit_id, endpoint)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(rate, self.burst)
+            return bucket
+
+    def reserve(self, structure_unit_id: str, endpoint: str) -> float:
+        """Reserve a request slot, return how long to wait before sending."""
+
+        bucket = self._bucket(structure_unit_id, endpoint)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve(self.max_wait)
+        if wait is None:
+            raise RateLimitExceeded(endpoint, self.max_wait)
+        return wait
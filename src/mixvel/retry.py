@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.retry
+~~~~~~~~~~~~
+Retry policy for transient gateway failures.
+"""
+
+from __future__ import annotations
+
+import collections
+import random
+import threading
+import time
+from typing import Deque, FrozenSet, Iterable, Optional
+
+import httpx
+
+IDEMPOTENT_ENDPOINTS = frozenset(
+    {
+        "/api/Accounts/login",
+        "/api/Order/AirShopping",
+        "/api/Order/Retrieve",
+    }
+)
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+# The request never reached the gateway, so it is safe to resend it whatever
+# the endpoint is.
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class RetryBudget:
+    """Caps retries to a share of recent requests.
+
+    Within a sliding `window` the number of retries may not exceed
+    `ratio` times the number of requests plus `min_per_second` retries per
+    second, so a gateway brownout cannot be amplified by retry storms.
+
+    :param ratio: (optional) retries allowed per request
+    :type ratio: float
+    :param min_per_second: (optional) retries always allowed per second
+    :type min_per_second: float
+    :param window: (optional) length of the sliding window, in seconds
+    :type window: float
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, min_per_second: float = 1.0, window: float = 10.0
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        self._requests: Deque[float] = collections.deque()
+        self._retries: Deque[float] = collections.deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        horizon = now - self.window
+        for events in (self._requests, self._retries):
+            while events and events[0] <= horizon:
+                events.popleft()
+
+    def deposit(self) -> None:
+        """Record a new request."""
+
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._requests.append(now)
+
+    def withdraw(self) -> bool:
+        """Record a retry if the budget allows it."""
+
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            allowed = self.min_per_second * self.window + self.ratio * len(self._requests)
+            if len(self._retries) >= allowed:
+                return False
+            self._retries.append(now)
+            return True
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is retried.
+
+    Only idempotent endpoints are retried after a response or a broken
+    connection; a request that provably never left the client is retried
+    for any endpoint. Delays grow exponentially from `backoff_base` up to
+    `backoff_max` with full jitter.
+
+    :param max_attempts: (optional) total attempts including the first one
+    :type max_attempts: int
+    :param backoff_base: (optional) delay before the first retry, in seconds
+    :type backoff_base: float
+    :param backoff_max: (optional) upper bound of a single delay, in seconds
+    :type backoff_max: float
+    :param endpoints: (optional) endpoints safe to retry
+    :type endpoints: Iterable[str]
+    :param status_codes: (optional) HTTP statuses worth retrying
+    :type status_codes: Iterable[int]
+    :param budget: (optional) retry budget shared by all requests of the client
+    :type budget: RetryBudget
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        endpoints: Iterable[str] = IDEMPOTENT_ENDPOINTS,
+        status_codes: Iterable[int] = RETRY_STATUS_CODES,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.endpoints: FrozenSet[str] = frozenset(endpoints)
+        self.status_codes: FrozenSet[int] = frozenset(status_codes)
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def is_retryable(
+        self,
+        endpoint: str,
+        response: Optional[httpx.Response] = None,
+        exc: Optional[Exception] = None,
+    ) -> bool:
+        """Tell whether the outcome of a request is worth retrying."""
+
+        if exc is not None:
+            if isinstance(exc, UNSENT_ERRORS):
+                return True
+            return endpoint in self.endpoints and isinstance(exc, httpx.TransportError)
+        return endpoint in self.endpoints and response.status_code in self.status_codes
+
+    def should_retry(
+        self,
+        endpoint: str,
+        attempt: int,
+        response: Optional[httpx.Response] = None,
+        exc: Optional[Exception] = None,
+    ) -> bool:
+        """Tell whether attempt number `attempt` (from 1) should be followed by another."""
+
+        if attempt >= self.max_attempts:
+            return False
+        if not self.is_retryable(endpoint, response=response, exc=exc):
+            return False
+        return self.budget.withdraw()
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before the retry following attempt number `attempt`."""
+
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
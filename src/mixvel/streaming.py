@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.streaming
+~~~~~~~~~~~~~~~~
+Offers parsed on demand from a streamed air shopping response.
+"""
+
+from __future__ import annotations
+
+import collections
+from typing import Deque, Optional
+
+import httpx
+
+from ._parsers import AirShoppingParser
+from .models import DataLists, Offer
+
+
+class OfferIterator:
+    """Offers of an air shopping response, parsed as they are consumed.
+
+    The response body is only read as far as needed to return the next
+    offer. `data_lists` is None until the `DataLists` element has been
+    received, MixVel sends it ahead of the offers. Close the iterator, or
+    use it in a `with` block, to release the connection when stopping early.
+
+    :param response: successful response opened in streaming mode
+    :type response: httpx.Response
+    :param offer_filter: (optional) predicate on the raw Offer element, see `mixvel.filters`
+    :type offer_filter: Callable[[xml.etree.ElementTree.Element], bool]
+    :param lazy: (optional) offers parse their items and prices on first access
+    :type lazy: bool
+    """
+
+    def __init__(self, response: httpx.Response, offer_filter=None, lazy: bool = False) -> None:
+        self._response = response
+        self._chunks = response.iter_bytes()
+        #: Length of the response body read so far.
+        self.bytes_read = 0
+        self._parser = AirShoppingParser(offer_filter, lazy)
+        self._offers: Deque[Offer] = collections.deque()
+        self._finished = False
+
+    @property
+    def data_lists(self) -> Optional[DataLists]:
+        return self._parser.data_lists
+
+    def __iter__(self) -> "OfferIterator":
+        return self
+
+    def __next__(self) -> Offer:
+        while not self._offers:
+            if self._finished:
+                raise StopIteration
+            try:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    offers = self._parser.close()
+                    self.close()
+                else:
+                    self.bytes_read += len(chunk)
+                    offers = self._parser.feed(chunk)
+            except BaseException:
+                self.close()
+                raise
+            self._offers.extend(offers)
+        return self._offers.popleft()
+
+    def close(self) -> None:
+        """Stop reading the response and release the connection."""
+
+        self._finished = True
+        self._response.close()
+
+    def __enter__(self) -> "OfferIterator":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class AsyncOfferIterator:
+    """Asynchronous counterpart of `OfferIterator`.
+
+    :param response: successful response opened in streaming mode
+    :type response: httpx.Response
+    :param offer_filter: (optional) predicate on the raw Offer element, see `mixvel.filters`
+    :type offer_filter: Callable[[xml.etree.ElementTree.Element], bool]
+    :param lazy: (optional) offers parse their items and prices on first access
+    :type lazy: bool
+    """
+
+    def __init__(self, response: httpx.Response, offer_filter=None, lazy: bool = False) -> None:
+        self._response = response
+        self._chunks = response.aiter_bytes()
+        #: Length of the response body read so far.
+        self.bytes_read = 0
+        self._parser = AirShoppingParser(offer_filter, lazy)
+        self._offers: Deque[Offer] = collections.deque()
+        self._finished = False
+
+    @property
+    def data_lists(self) -> Optional[DataLists]:
+        return self._parser.data_lists
+
+    def __aiter__(self) -> "AsyncOfferIterator":
+        return self
+
+    async def __anext__(self) -> Offer:
+        while not self._offers:
+            if self._finished:
+                raise StopAsyncIteration
+            try:
+                chunk = await self._next_chunk()
+                if chunk is None:
+                    offers = self._parser.close()
+                    await self.aclose()
+                else:
+                    self.bytes_read += len(chunk)
+                    offers = self._parser.feed(chunk)
+            except BaseException:
+                await self.aclose()
+                raise
+            self._offers.extend(offers)
+        return self._offers.popleft()
+
+    async def _next_chunk(self) -> Optional[bytes]:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    async def aclose(self) -> None:
+        """Stop reading the response and release the connection."""
+
+        self._finished = True
+        await self._response.aclose()
+
+    async def __aenter__(self) -> "AsyncOfferIterator":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
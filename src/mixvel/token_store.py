@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.token_store
+~~~~~~~~~~~~~~~~~~
+Token stores that let every process on a node share one bearer token.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from typing import ContextManager, Dict, Iterator, Optional
+
+from .auth import Token
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+def token_key(login: str, structure_unit_id: str, gateway: str) -> str:
+    """Return the store key for a set of credentials."""
+
+    return "{gateway}|{login}|{structure_unit_id}".format(
+        gateway=gateway, login=login, structure_unit_id=structure_unit_id
+    )
+
+
+def key_lock_path(path: str, key: str) -> str:
+    """Return the lock file guarding the logins for `key` next to `path`."""
+
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return "{path}.{digest}.lock".format(path=path, digest=digest)
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on `path` across processes."""
+
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class TokenStore:
+    """Interface of a token store shared by several `TokenManager` instances."""
+
+    def load(self, key: str) -> Optional[Token]:
+        """Return the stored token for `key`, if any."""
+        raise NotImplementedError
+
+    def save(self, key: str, token: Token) -> None:
+        """Store `token` under `key`."""
+        raise NotImplementedError
+
+    def delete(self, key: str, value: str) -> None:
+        """Remove the token stored under `key` if it is still `value`."""
+        raise NotImplementedError
+
+    def lock(self, key: str) -> ContextManager[None]:
+        """Serialize logins for `key` across processes, other keys are not blocked."""
+        return contextlib.nullcontext()
+
+
+class FileTokenStore(TokenStore):
+    """Tokens kept in a JSON file, logins serialized by a lock file per key next to it.
+
+    :param path: path of the JSON file
+    :type path: str
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, tokens: Dict[str, dict]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".mixvel-token-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(tokens, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, key: str) -> Optional[Token]:
+        entry = self._read().get(key)
+        if entry is None:
+            return None
+        return Token(entry["value"], entry["expires_at"])
+
+    def save(self, key: str, token: Token) -> None:
+        with file_lock(self.path + ".write"):
+            tokens = self._read()
+            now = time.time()
+            tokens = {k: v for k, v in tokens.items() if v["expires_at"] > now}
+            tokens[key] = {"value": token.value, "expires_at": token.expires_at}
+            self._write(tokens)
+
+    def delete(self, key: str, value: str) -> None:
+        with file_lock(self.path + ".write"):
+            tokens = self._read()
+            if key in tokens and tokens[key]["value"] == value:
+                del tokens[key]
+                self._write(tokens)
+
+    def lock(self, key: str) -> ContextManager[None]:
+        return file_lock(key_lock_path(self.path, key))
+
+
+class SqliteTokenStore(TokenStore):
+    """Tokens kept in a SQLite database, logins serialized by a lock file per key next to it.
+
+    The database file is created readable by its owner only.
+
+    :param path: path of the database file
+    :type path: str
+    :param timeout: (optional) how long to wait for a locked database, in seconds
+    :type timeout: float
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0) -> None:
+        self.path = path
+        self.timeout = timeout
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS mixvel_tokens ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 would create the file with the umask permissions
+        os.close(os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o600))
+        return sqlite3.connect(self.path, timeout=self.timeout)
+
+    def load(self, key: str) -> Optional[Token]:
+        with contextlib.closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM mixvel_tokens WHERE key = ?", (key,)
+            ).fetchone()
+        return Token(*row) if row is not None else None
+
+    def save(self, key: str, token: Token) -> None:
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO mixvel_tokens (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, token.value, token.expires_at),
+            )
+
+    def delete(self, key: str, value: str) -> None:
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM mixvel_tokens WHERE key = ? AND value = ?", (key, value)
+            )
+
+    def lock(self, key: str) -> ContextManager[None]:
+        return file_lock(key_lock_path(self.path, key))
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""
+mixvel.validation
+~~~~~~~~~~~~~~~~~
+How response parsers build models.
+
+Parsers hand models values they have already decoded and typed, so by
+default models are built without pydantic validation. Strict mode
+validates every parsed model, which helps when debugging a parser or an
+unexpected response. Set the `MIXVEL_STRICT_MODELS` environment variable
+to start in strict mode.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict
+
+from ._compat.pydantic import PYDANTIC
+
+STRICT_ENV = "MIXVEL_STRICT_MODELS"
+
+_strict = os.environ.get(STRICT_ENV, "") not in ("", "0")
+_builders: Dict[type, Callable[..., Any]] = {}
+
+
+def is_strict() -> bool:
+    """Return whether parsed models are validated."""
+
+    return _strict
+
+
+def set_strict(strict: bool = True) -> None:
+    """Validate parsed models, or stop validating them with `strict=False`."""
+
+    global _strict
+    _strict = strict
+
+
+def build(cls, *args, **values):
+    """Build a `cls` model from parsed field values, positional ones in field order.
+
+    Values are trusted unless strict mode is on. Keyword arguments may use
+    field aliases, like the model constructor.
+    """
+
+    if _strict:
+        return cls(*args, **values)
+    builder = _builders.get(cls)
+    if builder is None:
+        builder = _builders[cls] = _trusted_builder(cls)
+    return builder(*args, **values)
+
+
+def _trusted_builder(cls) -> Callable[..., Any]:
+    if not PYDANTIC:
+        # The fallback models never validate.
+        return cls
+
+    names = tuple(cls.model_fields)
+    aliases = {
+        info.alias: name for name, info in cls.model_fields.items() if info.alias
+    }
+    defaults = [
+        (name, info.default_factory or (lambda default=info.default: default))
+        for name, info in cls.model_fields.items()
+        if not info.is_required()
+    ]
+    new = cls.__new__
+    set_attr = object.__setattr__
+
+    def build_trusted(*args, **values):
+        fields = dict(zip(names, args))
+        if values or len(args) < len(names):
+            for key, value in values.items():
+                fields[aliases.get(key, key)] = value
+            fields_set = set(fields)
+            for name, default in defaults:
+                if name not in fields:
+                    fields[name] = default()
+            fields = {name: fields[name] for name in names}
+        else:
+            fields_set = set(names)
+        # What `model_construct` does, minus its per-call field lookups.
+        model = new(cls)
+        set_attr(model, "__dict__", fields)
+        set_attr(model, "__pydantic_fields_set__", fields_set)
+        set_attr(model, "__pydantic_extra__", None)
+        set_attr(model, "__pydantic_private__", None)
+        return model
+
+    return build_trusted
@@ -0,0 +1,129 @@
+"""
+mixvel.xml.backend
+~~~~~~~~~~~~~~~~~~
+XML backend: lxml when it is installed, the standard library otherwise.
+
+Both backends produce elements with the ElementTree API, so parsers work
+with either of them.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Optional
+from xml.etree import ElementTree
+
+try:  # pragma: no cover - optional dependency
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover - optional dependency
+    lxml_etree = None
+
+
+class StdlibBackend:
+    """`xml.etree.ElementTree` backend."""
+
+    name = "stdlib"
+    etree = ElementTree
+    #: Elements link to their parent with `getparent()`.
+    parent_links = False
+
+    def __init__(self) -> None:
+        self._paths: Dict[str, Callable[[Any], Any]] = {}
+
+    def fromstring(self, content: bytes):
+        """Parse a whole document and return its root element."""
+        return self.etree.fromstring(content)
+
+    def pull_parser(self, events=("start", "end"), tags=None):
+        """Return a parser fed by chunks that reports `events`.
+
+        `tags` limits the events to elements with these tags, where the
+        backend supports it. Callers must check tags anyway.
+        """
+        return self.etree.XMLPullParser(events=events)
+
+    def find(self, elm, path: str):
+        """Return the first element matching `path` relative to `elm`, if any."""
+        compiled = self._paths.get(path)
+        if compiled is None:
+            compiled = self._paths[path] = self._compile(path)
+        return compiled(elm)
+
+    def _compile(self, path: str) -> Callable[[Any], Any]:
+        return lambda elm: elm.find(path)
+
+
+class LxmlBackend(StdlibBackend):
+    """`lxml.etree` backend.
+
+    Documents are parsed in C without ignorable whitespace, entities are
+    not resolved, and very large or deep documents are accepted. Paths are
+    compiled once to XPath.
+    """
+
+    name = "lxml"
+    etree = lxml_etree
+    parent_links = True
+
+    PARSER_OPTIONS = dict(
+        remove_blank_text=True,
+        huge_tree=True,
+        resolve_entities=False,
+        no_network=True,
+    )
+
+    def __init__(self) -> None:
+        super().__init__()
+        # lxml parsers must not be shared between threads.
+        self._local = threading.local()
+
+    def fromstring(self, content: bytes):
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = self._local.parser = self.etree.XMLParser(**self.PARSER_OPTIONS)
+        return self.etree.fromstring(content, parser)
+
+    def pull_parser(self, events=("start", "end"), tags=None):
+        return self.etree.XMLPullParser(events=events, tag=tags, **self.PARSER_OPTIONS)
+
+    def _compile(self, path: str) -> Callable[[Any], Any]:
+        xpath = self.etree.XPath(path)
+
+        def find(elm):
+            found = xpath(elm)
+            return found[0] if found else None
+
+        return find
+
+
+_backend: Optional[StdlibBackend] = None
+
+
+def get_backend() -> StdlibBackend:
+    """Return the active backend, lxml if it is installed."""
+
+    backend = _backend
+    if backend is None:
+        backend = set_backend()
+    return backend
+
+
+def set_backend(name: Optional[str] = None) -> StdlibBackend:
+    """Select the backend by name, "lxml" or "stdlib", or the best available one.
+
+    :raises ImportError: lxml was requested but is not installed
+    """
+
+    global _backend
+    if name is None:
+        name = "lxml" if lxml_etree is not None else "stdlib"
+    if name == "lxml":
+        if lxml_etree is None:
+            raise ImportError("lxml is not installed")
+        backend: StdlibBackend = LxmlBackend()
+    elif name == "stdlib":
+        backend = StdlibBackend()
+    else:
+        raise ValueError("unknown XML backend: {name!r}".format(name=name))
+    _backend = backend
+    return backend
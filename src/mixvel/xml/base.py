@@ -1,29 +1,53 @@
 from __future__ import annotations
 
-from typing import ClassVar
+from typing import ClassVar, Dict, Tuple
 from xml.etree import ElementTree as ET
 
 from mixvel._compat.pydantic import BaseModel, ConfigDict
 
+from .backend import get_backend
+from .serializer import XmlWriter, root_fragments
+
+_ROOTS: Dict[type, Tuple[bytes, bytes]] = {}
+
 
 class XmlMessage(BaseModel):
-    """Base class for serializable MixVel XML messages."""
+    """Base class for serializable MixVel XML messages.
+
+    A message writes its body with an `XmlWriter`, the start and end tags
+    of its root are encoded once per message class.
+    """
 
     model_config = ConfigDict(arbitrary_types_allowed=True, populate_by_name=True)
 
     XML_TAG: ClassVar[str]
     XML_NS_MAP: ClassVar[dict[str, str]] = {}
 
-    def to_xml_element(self) -> ET.Element:
-        element = ET.Element(self.XML_TAG)
-        for prefix, uri in self.XML_NS_MAP.items():
-            attr_name = f"xmlns:{prefix}" if prefix else "xmlns"
-            element.set(attr_name, uri)
-        self._build_body(element)
-        return element
+    @classmethod
+    def _root_fragments(cls) -> Tuple[bytes, bytes]:
+        fragments = _ROOTS.get(cls)
+        if fragments is None:
+            fragments = _ROOTS[cls] = root_fragments(cls.XML_TAG, cls.XML_NS_MAP)
+        return fragments
+
+    def write_xml(self, writer: XmlWriter) -> None:
+        start, end = self._root_fragments()
+        writer.raw(start)
+        self._write_body(writer)
+        writer.raw(end)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the message to UTF-8."""
+        writer = XmlWriter()
+        self.write_xml(writer)
+        return writer.getvalue()
 
     def to_xml(self) -> str:
-        return ET.tostring(self.to_xml_element(), encoding="unicode")
+        """Return the message as text, e.g. for logs, requests are sent as `to_bytes`."""
+        return self.to_bytes().decode("utf-8")
+
+    def to_xml_element(self) -> ET.Element:
+        return get_backend().fromstring(self.to_bytes())
 
-    def _build_body(self, element: ET.Element) -> None:  # pragma: no cover - abstract
+    def _write_body(self, writer: XmlWriter) -> None:  # pragma: no cover - abstract
         raise NotImplementedError
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import datetime as _dt
-from xml.etree import ElementTree as ET
 
 from .base import XmlMessage
 from .helpers import format_text
+from .serializer import XmlWriter, escape_attribute
 
 
 class MessageInfo(XmlMessage):
@@ -13,9 +13,10 @@ class MessageInfo(XmlMessage):
     message_id: str
     time_sent: _dt.datetime
 
-    def _build_body(self, element: ET.Element) -> None:
-        element.set("MessageId", self.message_id)
-        element.set("TimeSent", format_text(self.time_sent))
+    def write_xml(self, writer: XmlWriter) -> None:
+        writer.empty(
+            self.XML_TAG, {"MessageId": self.message_id, "TimeSent": self.time_sent}
+        )
 
 
 class MessageEnvelope(XmlMessage):
@@ -25,9 +26,32 @@ class MessageEnvelope(XmlMessage):
     message_info: MessageInfo
     payload: XmlMessage
 
-    def _build_body(self, element: ET.Element) -> None:
-        ET.SubElement(element, "Header")
-        body = ET.SubElement(element, "Body")
-        body.append(self.message_info.to_xml_element())
-        app_data = ET.SubElement(body, "AppData")
-        app_data.append(self.payload.to_xml_element())
+    def write_xml(self, writer: XmlWriter) -> None:
+        write_envelope(
+            writer, self.message_info.message_id, self.message_info.time_sent, self.payload
+        )
+
+
+_ENVELOPE_START, _ENVELOPE_END = MessageEnvelope._root_fragments()
+_HEAD = _ENVELOPE_START + b'<Header/><Body><MessageInfo MessageId="'
+_TIME_SENT = b'" TimeSent="'
+_APP_DATA = b'"/><AppData>'
+_TAIL = b"</AppData></Body>" + _ENVELOPE_END
+
+
+def write_envelope(
+    writer: XmlWriter, message_id: str, time_sent: _dt.datetime, payload: XmlMessage
+) -> None:
+    """Write `payload` wrapped in an envelope, without building the envelope models.
+
+    Everything but the message id, the timestamp and the payload is
+    written from precompiled fragments.
+    """
+
+    writer.raw(_HEAD)
+    writer.raw(escape_attribute(message_id).encode("utf-8"))
+    writer.raw(_TIME_SENT)
+    writer.raw(format_text(time_sent).encode("utf-8"))
+    writer.raw(_APP_DATA)
+    payload.write_xml(writer)
+    writer.raw(_TAIL)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import datetime as _dt
-from xml.etree import ElementTree as ET
 
 
 def format_text(value: object) -> str:
+    if isinstance(value, str):
+        return value
     if isinstance(value, _dt.datetime):
         if value.tzinfo is None:
             value = value.replace(tzinfo=_dt.timezone.utc)
@@ -14,9 +15,3 @@ def format_text(value: object) -> str:
     if isinstance(value, bool):
         return "true" if value else "false"
     return str(value)
-
-
-def append_text_element(parent: ET.Element, tag: str, value: object) -> ET.Element:
-    child = ET.SubElement(parent, tag)
-    child.text = format_text(value)
-    return child
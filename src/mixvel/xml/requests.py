@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from typing import List
-from xml.etree import ElementTree as ET
 
 from mixvel.models import (
     AnonymousPassenger,
@@ -11,7 +10,7 @@ from mixvel.models import (
 )
 
 from .base import XmlMessage
-from .helpers import append_text_element
+from .serializer import XmlWriter
 
 
 class AuthRequest(XmlMessage):
@@ -22,10 +21,10 @@ class AuthRequest(XmlMessage):
     password: str
     structure_unit_id: str
 
-    def _build_body(self, element: ET.Element) -> None:
-        append_text_element(element, "Login", self.login)
-        append_text_element(element, "Password", self.password)
-        append_text_element(element, "StructureUnitID", self.structure_unit_id)
+    def _write_body(self, writer: XmlWriter) -> None:
+        writer.element("Login", self.login)
+        writer.element("Password", self.password)
+        writer.element("StructureUnitID", self.structure_unit_id)
 
 
 class AirShoppingRequest(XmlMessage):
@@ -37,30 +36,32 @@ class AirShoppingRequest(XmlMessage):
     itinerary: List[Leg]
     paxes: List[AnonymousPassenger]
 
-    def _build_body(self, element: ET.Element) -> None:
-        request = ET.SubElement(element, "Request")
-        flight_request = ET.SubElement(request, "FlightRequest")
-        od_container = ET.SubElement(flight_request, "FlightRequestOriginDestinationsCriteria")
+    def _write_body(self, writer: XmlWriter) -> None:
+        writer.raw(b"<Request><FlightRequest><FlightRequestOriginDestinationsCriteria>")
         for leg in self.itinerary:
-            od = ET.SubElement(od_container, "OriginDestCriteria")
-            cabin = ET.SubElement(od, "CabinType")
-            append_text_element(cabin, "CabinTypeCode", leg.cabin)
-            pref = ET.SubElement(cabin, "PrefLevel")
-            append_text_element(pref, "PrefLevelCode", "Required")
-            dest = ET.SubElement(od, "DestArrivalCriteria")
-            append_text_element(dest, "IATA_LocationCode", leg.destination)
-            origin_dep = ET.SubElement(od, "OriginDepCriteria")
-            append_text_element(origin_dep, "Date", leg.departure)
-            append_text_element(origin_dep, "IATA_LocationCode", leg.origin)
-        paxs_container = ET.SubElement(request, "Paxs")
+            writer.raw(b"<OriginDestCriteria><CabinType>")
+            writer.element("CabinTypeCode", leg.cabin)
+            writer.raw(
+                b"<PrefLevel><PrefLevelCode>Required</PrefLevelCode></PrefLevel>"
+                b"</CabinType><DestArrivalCriteria>"
+            )
+            writer.element("IATA_LocationCode", leg.destination)
+            writer.raw(b"</DestArrivalCriteria><OriginDepCriteria>")
+            writer.element("Date", leg.departure)
+            writer.element("IATA_LocationCode", leg.origin)
+            writer.raw(b"</OriginDepCriteria></OriginDestCriteria>")
+        writer.raw(b"</FlightRequestOriginDestinationsCriteria></FlightRequest><Paxs>")
         for pax in self.paxes:
-            pax_node = ET.SubElement(paxs_container, "Pax")
-            append_text_element(pax_node, "PaxID", pax.pax_id)
-            append_text_element(pax_node, "PTC", pax.ptc)
-        shopping = ET.SubElement(request, "ShoppingCriteria")
-        pricing = ET.SubElement(shopping, "PricingMethodCriteria")
-        append_text_element(pricing, "BestPricingOptionText", "Extended")
-        append_text_element(pricing, "CarrierMixInd", True)
+            writer.start("Pax")
+            writer.element("PaxID", pax.pax_id)
+            writer.element("PTC", pax.ptc)
+            writer.end("Pax")
+        writer.raw(
+            b"</Paxs><ShoppingCriteria><PricingMethodCriteria>"
+            b"<BestPricingOptionText>Extended</BestPricingOptionText>"
+            b"<CarrierMixInd>true</CarrierMixInd>"
+            b"</PricingMethodCriteria></ShoppingCriteria></Request>"
+        )
 
 
 class OrderCreateRequest(XmlMessage):
@@ -70,51 +71,57 @@ class OrderCreateRequest(XmlMessage):
     selected_offer: SelectedOffer
     paxes: List[Passenger]
 
-    def _build_body(self, element: ET.Element) -> None:
-        request = ET.SubElement(element, "Request")
-        create_order = ET.SubElement(request, "CreateOrder")
-        offer_node = ET.SubElement(create_order, "SelectedOffer")
-        append_text_element(offer_node, "OfferRefID", self.selected_offer.offer_ref_id)
+    def _write_body(self, writer: XmlWriter) -> None:
+        writer.raw(b"<Request><CreateOrder><SelectedOffer>")
+        writer.element("OfferRefID", self.selected_offer.offer_ref_id)
         for item in self.selected_offer.selected_offer_items:
-            sel_item = ET.SubElement(offer_node, "SelectedOfferItem")
-            append_text_element(sel_item, "OfferItemRefID", item.offer_item_ref_id)
+            writer.start("SelectedOfferItem")
+            writer.element("OfferItemRefID", item.offer_item_ref_id)
             for pax_ref in item.pax_ref_ids:
-                append_text_element(sel_item, "PaxRefID", pax_ref)
-        data_lists = ET.SubElement(request, "DataLists")
-        contact_list = ET.SubElement(data_lists, "ContactInfoList")
-        pax_list = ET.SubElement(data_lists, "PaxList")
+                writer.element("PaxRefID", pax_ref)
+            writer.end("SelectedOfferItem")
+        writer.raw(b"</SelectedOffer></CreateOrder><DataLists><ContactInfoList>")
+        contact_ids = []
         for index, pax in enumerate(self.paxes, start=1):
             contact_id = None
             if pax.email or pax.phone:
-                contact = ET.SubElement(contact_list, "ContactInfo")
                 contact_id = f"Contact-{index}"
-                append_text_element(contact, "ContactInfoID", contact_id)
+                writer.start("ContactInfo")
+                writer.element("ContactInfoID", contact_id)
                 if pax.email:
-                    email = ET.SubElement(contact, "EmailAddress")
-                    append_text_element(email, "ContactTypeText", "personal")
-                    append_text_element(email, "EmailAddressText", pax.email)
+                    writer.raw(b"<EmailAddress><ContactTypeText>personal</ContactTypeText>")
+                    writer.element("EmailAddressText", pax.email)
+                    writer.end("EmailAddress")
                 if pax.phone:
-                    phone = ET.SubElement(contact, "Phone")
-                    append_text_element(phone, "ContactTypeText", "personal")
-                    append_text_element(phone, "PhoneNumber", pax.phone)
-            pax_node = ET.SubElement(pax_list, "Pax")
+                    writer.raw(b"<Phone><ContactTypeText>personal</ContactTypeText>")
+                    writer.element("PhoneNumber", pax.phone)
+                    writer.end("Phone")
+                writer.end("ContactInfo")
+            contact_ids.append(contact_id)
+        writer.raw(b"</ContactInfoList><PaxList>")
+        for pax, contact_id in zip(self.paxes, contact_ids):
+            writer.start("Pax")
             if contact_id:
-                append_text_element(pax_node, "ContactInfoRefID", contact_id)
-            doc = ET.SubElement(pax_node, "IdentityDoc")
-            append_text_element(doc, "ExpiryDate", pax.doc.expiry_date)
-            append_text_element(doc, "IdentityDocID", pax.doc.doc_id)
-            append_text_element(doc, "IdentityDocTypeCode", pax.doc.type_code)
-            append_text_element(doc, "IssuingCountryCode", pax.doc.issuing_country_code)
-            append_text_element(doc, "Surname", pax.individual.surname)
-            individual = ET.SubElement(pax_node, "Individual")
-            append_text_element(individual, "Birthdate", pax.individual.birthdate)
-            append_text_element(individual, "GenderCode", pax.individual.gender)
-            append_text_element(individual, "GivenName", pax.individual.given_name)
+                writer.element("ContactInfoRefID", contact_id)
+            writer.start("IdentityDoc")
+            writer.element("ExpiryDate", pax.doc.expiry_date)
+            writer.element("IdentityDocID", pax.doc.doc_id)
+            writer.element("IdentityDocTypeCode", pax.doc.type_code)
+            writer.element("IssuingCountryCode", pax.doc.issuing_country_code)
+            writer.element("Surname", pax.individual.surname)
+            writer.end("IdentityDoc")
+            writer.start("Individual")
+            writer.element("Birthdate", pax.individual.birthdate)
+            writer.element("GenderCode", pax.individual.gender)
+            writer.element("GivenName", pax.individual.given_name)
             if pax.individual.middle_name:
-                append_text_element(individual, "MiddleName", pax.individual.middle_name)
-            append_text_element(individual, "Surname", pax.individual.surname)
-            append_text_element(pax_node, "PaxID", pax.pax_id)
-            append_text_element(pax_node, "PTC", pax.ptc)
+                writer.element("MiddleName", pax.individual.middle_name)
+            writer.element("Surname", pax.individual.surname)
+            writer.end("Individual")
+            writer.element("PaxID", pax.pax_id)
+            writer.element("PTC", pax.ptc)
+            writer.end("Pax")
+        writer.raw(b"</PaxList></DataLists></Request>")
 
 
 class OrderRetrieveRequest(XmlMessage):
@@ -123,11 +130,10 @@ class OrderRetrieveRequest(XmlMessage):
 
     mix_order_id: str
 
-    def _build_body(self, element: ET.Element) -> None:
-        request = ET.SubElement(element, "Request")
-        filter_criteria = ET.SubElement(request, "OrderFilterCriteria")
-        mix_order = ET.SubElement(filter_criteria, "MixOrder")
-        append_text_element(mix_order, "MixOrderID", self.mix_order_id)
+    def _write_body(self, writer: XmlWriter) -> None:
+        writer.raw(b"<Request><OrderFilterCriteria><MixOrder>")
+        writer.element("MixOrderID", self.mix_order_id)
+        writer.raw(b"</MixOrder></OrderFilterCriteria></Request>")
 
 
 class OrderChangeRequest(XmlMessage):
@@ -138,17 +144,18 @@ class OrderChangeRequest(XmlMessage):
     amount: int
     currency: str = "RUB"
 
-    def _build_body(self, element: ET.Element) -> None:
-        request = ET.SubElement(element, "Request")
-        mix_order = ET.SubElement(request, "MixOrder")
-        append_text_element(mix_order, "MixOrderID", self.mix_order_id)
-        payment_functions = ET.SubElement(request, "PaymentFunctions")
-        processing = ET.SubElement(payment_functions, "PaymentProcessingDetails")
-        amount = ET.SubElement(processing, "Amount")
-        amount.set("CurCode", self.currency)
-        amount.text = str(self.amount)
-        method = ET.SubElement(processing, "PaymentProcessingDetailsPaymentMethod")
-        ET.SubElement(method, "OtherPaymentMethod")
+    def _write_body(self, writer: XmlWriter) -> None:
+        writer.raw(b"<Request><MixOrder>")
+        writer.element("MixOrderID", self.mix_order_id)
+        writer.raw(b"</MixOrder><PaymentFunctions><PaymentProcessingDetails>")
+        writer.start("Amount", {"CurCode": self.currency})
+        writer.text(self.amount)
+        writer.end("Amount")
+        writer.raw(
+            b"<PaymentProcessingDetailsPaymentMethod><OtherPaymentMethod/>"
+            b"</PaymentProcessingDetailsPaymentMethod>"
+            b"</PaymentProcessingDetails></PaymentFunctions></Request>"
+        )
 
 
 class OrderCancelRequest(XmlMessage):
@@ -157,7 +164,7 @@ class OrderCancelRequest(XmlMessage):
 
     mix_order_id: str
 
-    def _build_body(self, element: ET.Element) -> None:
-        request = ET.SubElement(element, "Request")
-        mix_order = ET.SubElement(request, "MixOrder")
-        append_text_element(mix_order, "MixOrderID", self.mix_order_id)
+    def _write_body(self, writer: XmlWriter) -> None:
+        writer.raw(b"<Request><MixOrder>")
+        writer.element("MixOrderID", self.mix_order_id)
+        writer.raw(b"</MixOrder></Request>")
@@ -0,0 +1,120 @@
+"""
+mixvel.xml.serializer
+~~~~~~~~~~~~~~~~~~~~~
+Streaming writer serializing messages straight to UTF-8 bytes.
+
+Markup is encoded once per tag and cached, only the text of a message is
+escaped and encoded on every call.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from .helpers import format_text
+
+
+def escape_text(text: str) -> str:
+    """Escape `text` for an element body."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(text: str) -> str:
+    """Escape `text` for a double-quoted attribute value."""
+    text = escape_text(text)
+    if '"' in text:
+        text = text.replace('"', "&quot;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
+
+
+class _Fragments(dict):
+    """Encoded markup by tag, computed on first use."""
+
+    def __init__(self, template: str) -> None:
+        super().__init__()
+        self.template = template
+
+    def __missing__(self, tag: str) -> bytes:
+        fragment = self[tag] = self.template.format(tag=tag).encode("utf-8")
+        return fragment
+
+
+_START = _Fragments("<{tag}>")
+_END = _Fragments("</{tag}>")
+_EMPTY = _Fragments("<{tag}/>")
+
+
+def _attributes(attrib: Dict[str, object]) -> str:
+    return "".join(
+        ' {name}="{value}"'.format(name=name, value=escape_attribute(format_text(value)))
+        for name, value in attrib.items()
+    )
+
+
+def root_fragments(tag: str, nsmap: Dict[str, str]) -> Tuple[bytes, bytes]:
+    """Return the start and end tags of a message root declaring `nsmap`."""
+    declarations = {
+        "xmlns:{prefix}".format(prefix=prefix) if prefix else "xmlns": uri
+        for prefix, uri in nsmap.items()
+    }
+    start = "<{tag}{attrib}>".format(tag=tag, attrib=_attributes(declarations))
+    return start.encode("utf-8"), _END[tag]
+
+
+class XmlWriter:
+    """Collects the encoded fragments of a message, in document order.
+
+    Cached markup is referenced rather than copied, the fragments are
+    joined into the message bytes once by `getvalue`.
+    """
+
+    __slots__ = ("parts", "raw")
+
+    def __init__(self) -> None:
+        self.parts: List[bytes] = []
+        #: Append encoded markup as is.
+        self.raw = self.parts.append
+
+    def start(self, tag: str, attrib: Optional[Dict[str, object]] = None) -> None:
+        if attrib:
+            self.raw(
+                "<{tag}{attrib}>".format(tag=tag, attrib=_attributes(attrib)).encode("utf-8")
+            )
+        else:
+            self.raw(_START[tag])
+
+    def end(self, tag: str) -> None:
+        self.raw(_END[tag])
+
+    def empty(self, tag: str, attrib: Optional[Dict[str, object]] = None) -> None:
+        if attrib:
+            self.raw(
+                "<{tag}{attrib}/>".format(tag=tag, attrib=_attributes(attrib)).encode("utf-8")
+            )
+        else:
+            self.raw(_EMPTY[tag])
+
+    def text(self, value: object) -> None:
+        self.raw(escape_text(format_text(value)).encode("utf-8"))
+
+    def element(self, tag: str, value: object) -> None:
+        """Append an element whose only content is the text of `value`."""
+        raw = self.raw
+        raw(_START[tag])
+        raw(escape_text(format_text(value)).encode("utf-8"))
+        raw(_END[tag])
+
+    def getvalue(self) -> bytes:
+        return b"".join(self.parts)
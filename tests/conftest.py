@@ -1,7 +1,24 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if SRC.exists():
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture(params=["stdlib", "lxml"])
+def xml_backend(request):
+    """Run the test with each installed XML backend."""
+
+    from mixvel.xml import backend
+
+    previous = backend.get_backend()
+    try:
+        selected = backend.set_backend(request.param)
+    except ImportError:
+        pytest.skip("lxml is not installed")
+    yield selected
+    backend.set_backend(previous.name)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import datetime
+
+import httpx
+import pytest
+
+from .utils import mock_handler, read_response
+from mixvel import (
+    AirShoppingResponse,
+    AnonymousPassenger,
+    AsyncClient,
+    Leg,
+    NoOrdersToCancel,
+    Offer,
+    OrderViewResponse,
+)
+from mixvel.xml import AirShoppingRequest
+
+
+def make_client(responses=None, calls=None):
+    transport = httpx.MockTransport(mock_handler(responses, calls))
+    return AsyncClient("login", "password", "structure", transport=transport)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAsyncClient:
+    def test_auth(self):
+        async def scenario():
+            async with make_client() as client:
+                return client, await client.auth()
+
+        client, token = run(scenario())
+        assert token == "eyJhbGciOiJIUzI1NiJ9.test-token"
+        assert client.token == token
+
+    def test_air_shopping_logins_once(self):
+        calls = []
+
+        async def scenario():
+            async with make_client(calls=calls) as client:
+                itinerary = [Leg("MOW", "AER", datetime.date(2025, 6, 13))]
+                paxes = [AnonymousPassenger("Pax-1", "ADT")]
+                first = await client.air_shopping(itinerary, paxes)
+                second = await client.air_shopping(itinerary, paxes)
+                return first, second
+
+        first, second = run(scenario())
+        assert isinstance(first, AirShoppingResponse)
+        assert isinstance(first.offers[0], Offer)
+        assert len(first.offers) == len(second.offers)
+        assert [r.url.path for r in calls] == [
+            "/api/Accounts/login",
+            "/api/Order/AirShopping",
+            "/api/Order/AirShopping",
+        ]
+        assert calls[1].headers["Authorization"] == (
+            "Bearer eyJhbGciOiJIUzI1NiJ9.test-token"
+        )
+        assert b"Mixvel_AirShoppingRQ" in calls[1].content
+
+    def test_air_shopping_many(self):
+        in_flight = []
+        peak = []
+        handler = mock_handler()
+
+        async def bounded_handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            if b"XXX" in request.content:
+                return httpx.Response(503)
+            return handler(request)
+
+        requests = [
+            AirShoppingRequest(
+                itinerary=[Leg(origin, "AER", datetime.date(2025, 6, 13))],
+                paxes=[AnonymousPassenger("Pax-1", "ADT")],
+            )
+            for origin in ["MOW", "XXX", "LED", "KZN", "OVB"]
+        ]
+
+        async def scenario():
+            transport = httpx.MockTransport(bounded_handler)
+            async with AsyncClient(
+                "login", "password", "structure", transport=transport
+            ) as client:
+                return await client.air_shopping_many(requests, max_concurrency=2)
+
+        got = run(scenario())
+        assert len(got) == len(requests)
+        assert isinstance(got[0], AirShoppingResponse)
+        assert isinstance(got[1], httpx.HTTPStatusError)
+        assert all(isinstance(r, AirShoppingResponse) for r in got[2:])
+        assert max(peak) == 2
+
+    def test_replays_once_on_unauthorized(self):
+        calls = []
+        handler = mock_handler(calls=calls)
+
+        def expiring_handler(request):
+            if request.url.path == "/api/Order/Cancel" and len(calls) == 0:
+                calls.append(request)
+                return httpx.Response(401)
+            return handler(request)
+
+        async def scenario():
+            transport = httpx.MockTransport(expiring_handler)
+            async with AsyncClient(
+                "login", "password", "structure", transport=transport
+            ) as client:
+                client.token = "revoked"
+                return await client.cancel_order("01138-250530-MHY6279")
+
+        assert run(scenario())
+        assert [r.url.path for r in calls] == [
+            "/api/Order/Cancel",
+            "/api/Accounts/login",
+            "/api/Order/Cancel",
+        ]
+
+    def test_retrieve_and_cancel_order(self):
+        async def scenario():
+            async with make_client() as client:
+                view = await client.retrieve_order("01138-250530-MHY6279")
+                cancelled = await client.cancel_order("01138-250530-MHY6279")
+                return view, cancelled
+
+        view, cancelled = run(scenario())
+        assert isinstance(view, OrderViewResponse)
+        assert cancelled
+
+    def test_api_error(self):
+        client = make_client({"/api/Accounts/login": "responses/accounts/login_error.xml"})
+        with pytest.raises(IOError, match="MIX-101002"):
+            run(client.auth())
+
+    def test_no_orders_to_cancel(self):
+        def handler(request):
+            if request.url.path == "/api/Accounts/login":
+                content = read_response("responses/accounts/login.xml")
+            else:
+                content = read_response("responses/accounts/login_error.xml").replace(
+                    b"MIX-101002", b"MIX-106001"
+                )
+            return httpx.Response(200, content=content)
+
+        client = AsyncClient(
+            "login", "password", "structure", transport=httpx.MockTransport(handler)
+        )
+        with pytest.raises(NoOrdersToCancel):
+            run(client.cancel_order("01138-250530-MHY6279"))
+
+    def test_http_error(self):
+        client = AsyncClient(
+            "login",
+            "password",
+            "structure",
+            transport=httpx.MockTransport(lambda request: httpx.Response(503)),
+        )
+        with pytest.raises(httpx.HTTPStatusError):
+            run(client.auth())
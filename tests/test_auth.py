@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import base64
+import json
+import threading
+import time
+
+from mixvel.auth import TokenManager, token_expiry
+
+
+def make_jwt(exp):
+    claims = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=")
+    return "eyJhbGciOiJIUzI1NiJ9.{claims}.signature".format(claims=claims.decode())
+
+
+class TestTokenExpiry:
+    def test_jwt_exp_claim(self):
+        assert token_expiry(make_jwt(1700000000)) == 1700000000
+
+    def test_opaque_token_uses_ttl(self):
+        before = time.time()
+        got = token_expiry("opaque-token", ttl=60)
+        assert before + 60 <= got <= time.time() + 60
+
+
+class TestTokenManager:
+    def test_concurrent_logins_are_deduplicated(self):
+        manager = TokenManager()
+        calls = []
+
+        def login():
+            calls.append(1)
+            time.sleep(0.05)
+            return "token-{n}".format(n=len(calls))
+
+        got = []
+        threads = [
+            threading.Thread(target=lambda: got.append(manager.get_token(login)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert got == ["token-1"] * 8
+
+    def test_expired_token_is_replaced(self):
+        manager = TokenManager()
+        manager.set(make_jwt(time.time() - 1))
+        assert manager.get_token(lambda: "fresh") == "fresh"
+
+    def test_refresh_ahead_keeps_serving_current_token(self):
+        manager = TokenManager(refresh_ahead=60)
+        current = make_jwt(time.time() + 30)
+        manager.set(current)
+        refreshed = threading.Event()
+
+        def login():
+            refreshed.set()
+            return "fresh"
+
+        assert manager.get_token(login) == current
+        assert refreshed.wait(1)
+        for _ in range(100):
+            if manager.token == "fresh":
+                break
+            time.sleep(0.01)
+        assert manager.token == "fresh"
+
+    def test_invalidate_only_drops_matching_token(self):
+        manager = TokenManager()
+        manager.set("current")
+        manager.invalidate("stale")
+        assert manager.token == "current"
+        manager.invalidate("current")
+        assert manager.token == ""
+
+    def test_async_logins_are_deduplicated(self):
+        manager = TokenManager()
+        calls = []
+
+        async def login():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "token"
+
+        async def scenario():
+            return await asyncio.gather(*(manager.aget_token(login) for _ in range(8)))
+
+        assert asyncio.run(scenario()) == ["token"] * 8
+        assert len(calls) == 1
+
+    def test_async_store_io_runs_off_the_loop(self):
+        threads = []
+
+        class RecordingStore:
+            def load(self, key):
+                return None
+
+            def save(self, key, token):
+                threads.append(threading.current_thread())
+
+            def delete(self, key, value):
+                threads.append(threading.current_thread())
+
+        manager = TokenManager(store=RecordingStore())
+
+        async def scenario():
+            manager.set("current")
+            await manager.ainvalidate("current")
+            await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+        assert manager.token == ""
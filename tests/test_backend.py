@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import datetime
+import pytest
+
+from mixvel.xml import backend
+from mixvel.xml.envelope import MessageEnvelope, MessageInfo
+from mixvel.xml.requests import AuthRequest
+
+
+def envelope():
+    return MessageEnvelope(
+        message_info=MessageInfo(
+            message_id="1",
+            time_sent=datetime.datetime(2025, 5, 30, tzinfo=datetime.timezone.utc),
+        ),
+        payload=AuthRequest(login="login", password="password", structure_unit_id="1"),
+    )
+
+
+class TestBackend:
+    def test_find(self, xml_backend):
+        root = xml_backend.fromstring(envelope().to_xml().encode())
+        assert xml_backend.find(root, "./Body/AppData/*/Login").text == "login"
+        assert xml_backend.find(root, "./Body/Error") is None
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            backend.set_backend("libxml")
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import datetime
+import os
+import threading
+import time
+
+import httpx
+import pytest
+
+from .utils import mock_handler, read_response, shopping_handler
+from mixvel import (
+    AirShoppingResponse,
+    AnonymousPassenger,
+    AsyncClient,
+    Client,
+    Leg,
+    Offer,
+)
+from mixvel.cache import DiskCache, MemoryCache, offers_ttl
+
+ITINERARY = [Leg("MOW", "AER", datetime.date(2025, 6, 13))]
+PAXES = [AnonymousPassenger("Pax-1", "ADT")]
+
+
+def make_response(*expirations):
+    return AirShoppingResponse(
+        offers=[
+            Offer(
+                offer_id="offer-{n}".format(n=n),
+                offer_items=[],
+                owner_code="DP",
+                offer_expiration_timelimit_datetime=expiration,
+            )
+            for n, expiration in enumerate(expirations)
+        ]
+    )
+
+
+class TestOffersTtl:
+    def test_earliest_offer_expiration(self):
+        now = datetime.datetime.utcnow()
+        response = make_response(
+            now + datetime.timedelta(seconds=120), now + datetime.timedelta(seconds=60)
+        )
+        assert offers_ttl(response, 300) == pytest.approx(60, abs=1)
+
+    def test_capped_by_max_ttl(self):
+        response = make_response(datetime.datetime.utcnow() + datetime.timedelta(days=1))
+        assert offers_ttl(response, 300) == 300
+
+    def test_expired_offers(self):
+        response = make_response(datetime.datetime.utcnow() - datetime.timedelta(seconds=1))
+        assert offers_ttl(response, 300) <= 0
+
+    def test_empty_response(self):
+        assert offers_ttl(make_response(), 300) == 0
+
+
+class TestMemoryCache:
+    def test_expiry(self):
+        cache = MemoryCache()
+        cache.set("key", "value", ttl=0.01)
+        assert cache.get("key") == "value"
+        time.sleep(0.02)
+        assert cache.get("key") is None
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(max_entries=2, max_bytes=None)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_memory_bound(self):
+        cache = MemoryCache(max_bytes=2500)
+        cache.set("a", "x" * 1000, ttl=60)
+        cache.set("b", "x" * 1000, ttl=60)
+        cache.set("c", "x" * 1000, ttl=60)
+        assert cache.get("a") is None
+        assert len(cache) == 2
+        assert cache.size <= 2500
+        cache.set("d", "x" * 5000, ttl=60)
+        assert cache.get("d") is None
+
+    def test_given_size_is_not_measured(self):
+        cache = MemoryCache(max_bytes=2500)
+        # Unpicklable, so it cannot have been measured.
+        cache.set("a", lambda: None, ttl=60, size=2000)
+        assert cache.size == 2000
+        cache.set("b", lambda: None, ttl=60, size=2000)
+        assert cache.get("a") is None
+        assert cache.size == 2000
+
+
+class TestDiskCache:
+    def test_roundtrip_and_expiry(self, tmp_path):
+        cache = DiskCache(str(tmp_path))
+        response = make_response(datetime.datetime(2030, 1, 1))
+        cache.set("key", response, ttl=60)
+        got = cache.get("key")
+        assert got.offers[0].offer_id == "offer-0"
+        cache.set("key", response, ttl=-1)
+        assert cache.get("key") is None
+
+    def test_size_bound(self, tmp_path):
+        cache = DiskCache(str(tmp_path), max_bytes=2500)
+        for key in "abc":
+            cache.set(key, "x" * 1000, ttl=60)
+            time.sleep(0.01)
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+    def test_delete(self, tmp_path):
+        cache = DiskCache(str(tmp_path))
+        cache.set("key", 1, ttl=60)
+        cache.delete("key")
+        assert cache.get("key") is None
+
+    def test_stale_entry_is_dropped(self, tmp_path):
+        cache = DiskCache(str(tmp_path))
+        path = cache._path("key")
+        with open(path, "wb") as f:
+            f.write(b"cmixvel.cache\nRemovedModel\n.")
+        assert cache.get("key") is None
+        assert not os.path.exists(path)
+
+
+class TestClientResultCache:
+    def test_repeated_search_is_served_from_cache(self):
+        calls = []
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(shopping_handler(calls, expires_in=600)),
+            result_cache=MemoryCache(),
+        ) as client:
+            first = client.air_shopping(ITINERARY, PAXES)
+            second = client.air_shopping(ITINERARY, PAXES)
+            client.air_shopping([Leg("LED", "AER", datetime.date(2025, 6, 13))], PAXES)
+        assert second is first
+        assert len(calls) == 2
+
+    def test_sized_by_response_body(self):
+        calls = []
+        serve = shopping_handler(calls, expires_in=600)
+        sizes = []
+
+        def handler(request):
+            response = serve(request)
+            if request.url.path == "/api/Order/AirShopping":
+                sizes.append(len(response.content))
+            return response
+
+        cache = MemoryCache()
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(handler),
+            result_cache=cache,
+            lazy_models=True,
+        ) as client:
+            got = client.air_shopping(ITINERARY, PAXES)
+        assert cache.size == sizes[0]
+        # Caching did not pickle, so did not load, the lazy offers.
+        assert object.__getattribute__(got.offers[0], "_lazy_state") is not None
+
+    def test_expired_offers_are_not_cached(self):
+        calls = []
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(shopping_handler(calls, expires_in=-60)),
+            result_cache=MemoryCache(),
+        ) as client:
+            client.air_shopping(ITINERARY, PAXES)
+            client.air_shopping(ITINERARY, PAXES)
+        assert len(calls) == 2
+
+    def test_async_disk_cache(self, tmp_path):
+        calls = []
+
+        async def scenario():
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=httpx.MockTransport(shopping_handler(calls, expires_in=600)),
+                result_cache=DiskCache(str(tmp_path)),
+            ) as client:
+                first = await client.air_shopping(ITINERARY, PAXES)
+                second = await client.air_shopping(ITINERARY, PAXES)
+                return first, second
+
+        first, second = asyncio.run(scenario())
+        assert len(calls) == 1
+        assert [o.offer_id for o in second.offers] == [o.offer_id for o in first.offers]
+
+    def test_async_disk_io_runs_off_the_loop(self, tmp_path):
+        threads = []
+
+        class RecordingCache(DiskCache):
+            def get(self, key):
+                threads.append(threading.current_thread())
+                return super().get(key)
+
+            def set(self, key, value, ttl, size=None):
+                threads.append(threading.current_thread())
+                super().set(key, value, ttl, size)
+
+        async def scenario():
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=httpx.MockTransport(shopping_handler([], expires_in=600)),
+                result_cache=RecordingCache(str(tmp_path)),
+            ) as client:
+                await client.air_shopping(ITINERARY, PAXES)
+
+        asyncio.run(scenario())
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+
+
+ORDER_ID = "01138-250530-MHY6279"
+
+
+def order_calls(calls, path):
+    return [request for request in calls if request.url.path == path]
+
+
+class TestClientOrderCache:
+    def make_client(self, calls):
+        handler = mock_handler(
+            {"/api/Order/Change": "responses/order/view.xml"}, calls=calls
+        )
+        return Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(handler),
+            order_cache=MemoryCache(),
+        )
+
+    def test_max_age(self):
+        calls = []
+        with self.make_client(calls) as client:
+            first = client.retrieve_order(ORDER_ID)
+            assert client.retrieve_order(ORDER_ID, max_age=60) is first
+            assert client.retrieve_order(ORDER_ID) is not first
+            time.sleep(0.02)
+            client.retrieve_order(ORDER_ID, max_age=0.01)
+        assert len(order_calls(calls, "/api/Order/Retrieve")) == 3
+
+    def test_change_writes_through(self):
+        calls = []
+        with self.make_client(calls) as client:
+            client.retrieve_order(ORDER_ID)
+            changed = client.change_order(ORDER_ID, 100)
+            assert client.retrieve_order(ORDER_ID, max_age=60) is changed
+        assert len(order_calls(calls, "/api/Order/Retrieve")) == 1
+
+    def test_failed_change_evicts(self):
+        calls = []
+        handler = mock_handler(calls=calls)
+
+        def serve(request):
+            if request.url.path == "/api/Order/Change":
+                return httpx.Response(500)
+            return handler(request)
+
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(serve),
+            order_cache=MemoryCache(),
+        ) as client:
+            client.retrieve_order(ORDER_ID)
+            with pytest.raises(Exception):
+                client.change_order(ORDER_ID, 100)
+            client.retrieve_order(ORDER_ID, max_age=60)
+        assert len(order_calls(calls, "/api/Order/Retrieve")) == 2
+
+    def test_cancel_evicts(self):
+        calls = []
+
+        async def scenario():
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=httpx.MockTransport(mock_handler(calls=calls)),
+                order_cache=MemoryCache(),
+            ) as client:
+                await client.retrieve_order(ORDER_ID)
+                await client.retrieve_order(ORDER_ID, max_age=60)
+                assert await client.cancel_order(ORDER_ID)
+                await client.retrieve_order(ORDER_ID, max_age=60)
+
+        asyncio.run(scenario())
+        assert len(order_calls(calls, "/api/Order/Retrieve")) == 2
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from .utils import mock_handler
+from mixvel import AsyncClient, CircuitOpenError, Client
+from mixvel.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from mixvel.rate_limit import RateLimiter
+
+ENDPOINT = "/api/Order/AirShopping"
+
+
+def trip(breaker, endpoint=ENDPOINT, failed=True, latency=0.01):
+    for _ in range(breaker.min_calls):
+        breaker.before_call(endpoint)
+        breaker.after_call(endpoint, latency, failed)
+
+
+class TestCircuitBreaker:
+    def test_opens_on_failure_rate(self):
+        breaker = CircuitBreaker(min_calls=4)
+        trip(breaker)
+        assert breaker.state(ENDPOINT) == OPEN
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_call(ENDPOINT)
+        assert exc_info.value.endpoint == ENDPOINT
+
+    def test_endpoints_are_independent(self):
+        breaker = CircuitBreaker(min_calls=4)
+        trip(breaker)
+        breaker.before_call("/api/Order/Retrieve")
+        assert breaker.state("/api/Order/Retrieve") == CLOSED
+
+    def test_stays_closed_below_min_calls(self):
+        breaker = CircuitBreaker(min_calls=4)
+        for _ in range(3):
+            breaker.before_call(ENDPOINT)
+            breaker.after_call(ENDPOINT, 0.01, True)
+        assert breaker.state(ENDPOINT) == CLOSED
+
+    def test_opens_on_slow_calls(self):
+        breaker = CircuitBreaker(min_calls=4, slow_call_threshold=1.0)
+        trip(breaker, failed=False, latency=2.0)
+        assert breaker.state(ENDPOINT) == OPEN
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker(min_calls=4, reset_timeout=0.01)
+        trip(breaker)
+        time.sleep(0.02)
+        breaker.before_call(ENDPOINT)
+        assert breaker.state(ENDPOINT) == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call(ENDPOINT)
+        breaker.after_call(ENDPOINT, 0.01, False)
+        assert breaker.state(ENDPOINT) == CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(min_calls=4, reset_timeout=0.01)
+        trip(breaker)
+        time.sleep(0.02)
+        breaker.before_call(ENDPOINT)
+        breaker.after_call(ENDPOINT, 0.01, True)
+        assert breaker.state(ENDPOINT) == OPEN
+
+    def test_cancelled_probe_frees_its_slot(self):
+        breaker = CircuitBreaker(min_calls=4, reset_timeout=0.01)
+        trip(breaker)
+        time.sleep(0.02)
+        breaker.before_call(ENDPOINT)
+        breaker.after_call(ENDPOINT, 0.01, None)
+        breaker.before_call(ENDPOINT)
+        assert breaker.state(ENDPOINT) == HALF_OPEN
+
+
+def failing_handler(calls):
+    handler = mock_handler(calls=calls)
+
+    def failing(request):
+        if request.url.path == "/api/Order/Retrieve":
+            calls.append(request)
+            return httpx.Response(503)
+        return handler(request)
+
+    return failing
+
+
+class TestClientCircuitBreaker:
+    def test_fails_fast_once_open(self):
+        calls = []
+        breaker = CircuitBreaker(min_calls=2)
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(failing_handler(calls)),
+            circuit_breaker=breaker,
+        ) as client:
+            for _ in range(2):
+                with pytest.raises(httpx.HTTPStatusError):
+                    client.retrieve_order("01138-250530-MHY6279")
+            with pytest.raises(CircuitOpenError):
+                client.retrieve_order("01138-250530-MHY6279")
+            assert client.cancel_order("01138-250530-MHY6279")
+        assert [r.url.path for r in calls].count("/api/Order/Retrieve") == 2
+
+    def test_async_fails_fast_once_open(self):
+        calls = []
+        breaker = CircuitBreaker(min_calls=2)
+
+        async def scenario():
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=httpx.MockTransport(failing_handler(calls)),
+                circuit_breaker=breaker,
+            ) as client:
+                for _ in range(2):
+                    with pytest.raises(httpx.HTTPStatusError):
+                        await client.retrieve_order("01138-250530-MHY6279")
+                with pytest.raises(CircuitOpenError):
+                    await client.retrieve_order("01138-250530-MHY6279")
+
+        asyncio.run(scenario())
+        assert [r.url.path for r in calls].count("/api/Order/Retrieve") == 2
+
+    def test_client_side_waits_are_not_timed(self):
+        # Every call queues 0.1s for the rate limiter, the gateway is instant.
+        breaker = CircuitBreaker(slow_call_threshold=0.05, slow_call_rate=0.5, min_calls=2)
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(mock_handler()),
+            circuit_breaker=breaker,
+            rate_limiter=RateLimiter(rate=10, burst=1),
+        ) as client:
+            for _ in range(4):
+                client.retrieve_order("01138-250530-MHY6279")
+        assert breaker.state("/api/Order/Retrieve") == CLOSED
+
+    def test_async_client_side_waits_are_not_timed(self):
+        breaker = CircuitBreaker(slow_call_threshold=0.05, slow_call_rate=0.5, min_calls=2)
+
+        async def scenario():
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=httpx.MockTransport(mock_handler()),
+                circuit_breaker=breaker,
+                rate_limiter=RateLimiter(rate=10, burst=1),
+            ) as client:
+                for _ in range(4):
+                    await client.retrieve_order("01138-250530-MHY6279")
+
+        asyncio.run(scenario())
+        assert breaker.state("/api/Order/Retrieve") == CLOSED
@@ -2,11 +2,16 @@
 import datetime
 import os
 import logging
+import threading
+import time
 
+import httpx
 import pytest
 
+from .utils import ChunkedStream, mock_handler, read_response
 from mixvel import (
     TEST_GATEWAY,
+    AirShoppingResponse,
     Client,
     Leg,
     AnonymousPassenger,
@@ -16,6 +21,7 @@ from mixvel import (
     Individual,
     IdentityDocument,
 )
+from mixvel.xml import AirShoppingRequest
 
 # configure logging to output to console during tests
 logging.basicConfig(
@@ -89,3 +95,142 @@ def test_e2e_full_flow():
 
     cancel = client.cancel_order(mix_order_id)
     assert cancel
+
+
+def make_client(handler):
+    return Client(
+        "login", "password", "structure", transport=httpx.MockTransport(handler)
+    )
+
+
+class TestClient:
+    def test_air_shopping_many(self):
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+        calls = []
+        handler = mock_handler(calls=calls)
+
+        def bounded_handler(request):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            if b"XXX" in request.content:
+                return httpx.Response(503)
+            return handler(request)
+
+        requests = [
+            AirShoppingRequest(
+                itinerary=[Leg(origin, "AER", datetime.date(2025, 6, 13))],
+                paxes=[AnonymousPassenger("Pax-1", "ADT")],
+            )
+            for origin in ["MOW", "XXX", "LED", "KZN", "OVB"]
+        ]
+        with make_client(bounded_handler) as client:
+            got = client.air_shopping_many(requests, max_concurrency=2)
+
+        assert len(got) == len(requests)
+        assert isinstance(got[0], AirShoppingResponse)
+        assert isinstance(got[1], httpx.HTTPStatusError)
+        assert all(isinstance(r, AirShoppingResponse) for r in got[2:])
+        assert peak[0] <= 2
+        assert [r.url.path for r in calls].count("/api/Accounts/login") == 1
+
+    def test_air_shopping_many_empty(self):
+        with make_client(mock_handler()) as client:
+            assert client.air_shopping_many([]) == []
+            with pytest.raises(ValueError):
+                client.air_shopping_many([], max_concurrency=0)
+
+    def test_replays_once_on_unauthorized(self):
+        calls = []
+        handler = mock_handler(calls=calls)
+        rejected = []
+
+        def expiring_handler(request):
+            if request.url.path == "/api/Order/Cancel" and not rejected:
+                rejected.append(request)
+                calls.append(request)
+                return httpx.Response(401)
+            return handler(request)
+
+        with make_client(expiring_handler) as client:
+            client.token = "revoked"
+            assert client.cancel_order("01138-250530-MHY6279")
+
+        assert [r.url.path for r in calls] == [
+            "/api/Order/Cancel",
+            "/api/Accounts/login",
+            "/api/Order/Cancel",
+        ]
+        assert calls[0].headers["Authorization"] == "Bearer revoked"
+        assert calls[2].headers["Authorization"] != "Bearer revoked"
+
+    def test_unauthorized_twice_raises(self):
+        def handler(request):
+            if request.url.path == "/api/Accounts/login":
+                return mock_handler()(request)
+            return httpx.Response(401)
+
+        with make_client(handler) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                client.cancel_order("01138-250530-MHY6279")
+
+    def test_sends_utf8_body(self):
+        calls = []
+        with Client(
+            "логин",
+            "password",
+            "structure",
+            transport=httpx.MockTransport(mock_handler(calls=calls)),
+        ) as client:
+            client.auth()
+
+        content = calls[0].content
+        assert "<Login>логин</Login>".encode("utf-8") in content
+        assert calls[0].headers["Content-Length"] == str(len(content))
+
+    def test_lazy_models(self):
+        with Client(
+            "login",
+            "password",
+            "structure",
+            transport=httpx.MockTransport(mock_handler()),
+            lazy_models=True,
+        ) as client:
+            got = client.air_shopping(
+                [Leg("MOW", "AER", datetime.date(2025, 6, 13))],
+                [AnonymousPassenger("Pax-1", "ADT")],
+            )
+            view = client.retrieve_order("01138-250530-MHY6279")
+
+        assert type(got.offers[0]).__name__ == "LazyOffer"
+        assert got.offers[0].offer_items[0].price.total_amount.amount > 0
+        assert type(view.mix_order.orders[0]).__name__ == "LazyOrder"
+
+    def test_air_shopping_streams_response(self):
+        streams = []
+        handler = mock_handler()
+
+        def streaming_handler(request):
+            if request.url.path != "/api/Order/AirShopping":
+                return handler(request)
+            stream = ChunkedStream(
+                read_response("responses/order/air-shopping__RT-2ADT1CNN.xml")
+            )
+            streams.append(stream)
+            return httpx.Response(401 if len(streams) == 1 else 200, stream=stream)
+
+        with make_client(streaming_handler) as client:
+            client.token = "revoked"
+            got = client.air_shopping(
+                [Leg("MOW", "AER", datetime.date(2025, 6, 13))],
+                [AnonymousPassenger("Pax-1", "ADT")],
+            )
+
+        assert len(got.offers) > 0
+        assert len(streams) == 2
+        assert all(stream.closed for stream in streams)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import datetime
+import threading
+import time
+
+import httpx
+
+from .utils import mock_handler
+from mixvel import AnonymousPassenger, AsyncClient, Client, Leg
+from mixvel.coalescing import RequestCoalescer, request_key
+from mixvel.xml import AirShoppingRequest
+
+PAXES = [AnonymousPassenger("Pax-1", "ADT")]
+
+
+def search(origin="MOW"):
+    return AirShoppingRequest(
+        itinerary=[Leg(origin, "AER", datetime.date(2025, 6, 13))], paxes=PAXES
+    )
+
+
+class TestRequestKey:
+    def test_identical_requests_share_a_key(self):
+        assert request_key("scope", search()) == request_key("scope", search())
+
+    def test_key_depends_on_request_and_scope(self):
+        assert request_key("scope", search("MOW")) != request_key("scope", search("LED"))
+        assert request_key("scope", search()) != request_key("other", search())
+
+
+class TestRequestCoalescer:
+    def test_concurrent_calls_share_outcome(self):
+        coalescer = RequestCoalescer()
+        calls = []
+        barrier = threading.Barrier(4)
+
+        def call():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        got = []
+
+        def worker():
+            barrier.wait()
+            got.append(coalescer.do("key", call))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert all(result is got[0] for result in got)
+
+    def test_sequential_calls_are_not_shared(self):
+        coalescer = RequestCoalescer()
+        assert coalescer.do("key", lambda: 1) == 1
+        assert coalescer.do("key", lambda: 2) == 2
+
+    def test_exceptions_are_shared(self):
+        coalescer = RequestCoalescer()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise IOError("boom")
+
+        async def scenario():
+            return await asyncio.gather(
+                *(coalescer.ado("key", fail) for _ in range(3)), return_exceptions=True
+            )
+
+        got = asyncio.run(scenario())
+        assert all(isinstance(result, IOError) for result in got)
+
+
+class TestClientCoalescing:
+    def test_identical_searches_share_one_call(self):
+        calls = []
+        handler = mock_handler(calls=calls)
+
+        def slow(request):
+            if request.url.path == "/api/Order/AirShopping":
+                time.sleep(0.05)
+            return handler(request)
+
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(slow), coalescer=RequestCoalescer(),
+        ) as client:
+            client.auth()
+            got = client.air_shopping_many([search()] * 4 + [search("LED")])
+
+        assert [r.url.path for r in calls].count("/api/Order/AirShopping") == 2
+        assert all(result is got[0] for result in got[:4])
+        assert got[4] is not got[0]
+
+    def test_async_identical_searches_share_one_call(self):
+        calls = []
+
+        async def scenario():
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=httpx.MockTransport(mock_handler(calls=calls)),
+                coalescer=RequestCoalescer(),
+            ) as client:
+                return await client.air_shopping_many([search()] * 4)
+
+        got = asyncio.run(scenario())
+        assert [r.url.path for r in calls].count("/api/Order/AirShopping") == 1
+        assert all(result is got[0] for result in got)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import pickle
+
+import pytest
+
+from mixvel._compat.pydantic import PYDANTIC, Field
+from mixvel.models import Amount, Booking, DataLists, MixvelModel
+
+pytestmark = pytest.mark.skipif(PYDANTIC, reason="fallback models only")
+
+
+class Aliased(MixvelModel):
+    value: int | None = Field(default=None, alias="from")
+
+
+class TestFallbackModels:
+    def test_slots(self):
+        booking = Booking(booking_id="ABC123")
+        assert not hasattr(booking, "__dict__")
+        with pytest.raises(AttributeError):
+            booking.unknown = 1
+
+    def test_frozen(self):
+        amount = Amount(100, "RUB")
+        assert not hasattr(amount, "__dict__")
+        with pytest.raises(TypeError):
+            amount.amount = 200
+        with pytest.raises(TypeError):
+            del amount.cur_code
+        assert Amount.model_construct(amount=100).amount == 100
+
+    def test_positional_and_keyword(self):
+        assert Amount(100, "RUB").model_dump() == Amount(amount=100, cur_code="RUB").model_dump()
+        assert Amount(100).cur_code is None
+        assert Amount(100, cur_code="RUB").cur_code == "RUB"
+
+    def test_alias(self):
+        booking = Booking(booking_id="ABC123", type_code="14")
+        assert booking.booking_ref_type_code == "14"
+        assert (
+            Booking(booking_id="ABC123", booking_ref_type_code="14").model_dump()
+            == booking.model_dump()
+        )
+
+    def test_non_identifier_alias(self):
+        assert Aliased(**{"from": 1}).value == 1
+        assert Aliased(value=2).value == 2
+
+    def test_missing_field(self):
+        with pytest.raises(TypeError, match="Missing field 'amount' for Amount"):
+            Amount(cur_code="RUB")
+
+    def test_unexpected_field(self):
+        with pytest.raises(TypeError, match="Unexpected fields for Amount: currency"):
+            Amount(100, currency="RUB")
+
+    def test_too_many_positional(self):
+        with pytest.raises(TypeError):
+            Amount(100, "RUB", "extra")
+
+    def test_default_factory_not_shared(self):
+        first, second = DataLists(), DataLists()
+        first.pax_segment_list.append(object())
+        assert second.pax_segment_list == []
+
+    def test_pickle(self):
+        amount = Amount(100, "RUB")
+        assert pickle.loads(pickle.dumps(amount)).model_dump() == amount.model_dump()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import httpx
+import pytest
+
+from .utils import parse_xml_response, shopping_handler
+from mixvel import Amount, AnonymousPassenger, Client, Leg
+from mixvel._parsers import parse_air_shopping_response
+from mixvel.cache import MemoryCache
+from mixvel.filters import OfferFilter
+
+ITINERARY = [Leg("MOW", "AER", datetime.date(2025, 6, 13))]
+PAXES = [AnonymousPassenger("Pax-1", "ADT")]
+
+
+@pytest.fixture
+def offer():
+    resp = parse_xml_response("responses/order/air-shopping__RT-2ADT1CNN.xml")
+    return resp.find("./Response/Offer")
+
+
+class TestOfferFilter:
+    def test_empty_filter_accepts(self, offer):
+        assert OfferFilter()(offer)
+
+    def test_owner_codes(self, offer):
+        assert OfferFilter(owner_codes=["SU", "TCH"])(offer)
+        assert not OfferFilter(owner_codes=["SU"])(offer)
+
+    def test_max_total_amount(self, offer):
+        assert OfferFilter(max_total_amount=Amount(486300, "RUB"))(offer)
+        assert not OfferFilter(max_total_amount=Amount(486299, "RUB"))(offer)
+        assert not OfferFilter(max_total_amount=Amount(10 ** 9, "USD"))(offer)
+
+    def test_max_segments(self, offer):
+        assert OfferFilter(max_segments=2)(offer)
+        assert not OfferFilter(max_segments=1)(offer)
+
+    def test_cache_key(self):
+        assert OfferFilter(owner_codes=["SU", "TCH"]).cache_key == OfferFilter(
+            owner_codes=["TCH", "SU"]
+        ).cache_key
+        assert OfferFilter(max_segments=1).cache_key != OfferFilter().cache_key
+
+    def test_rejected_offers_are_not_parsed(self, monkeypatch):
+        import mixvel._parsers
+
+        def fail(elm):
+            raise AssertionError("parsed a rejected offer")
+
+        monkeypatch.setattr(mixvel._parsers, "parse_offer", fail)
+        resp = parse_xml_response("responses/order/air-shopping__RT-2ADT1CNN.xml")
+        got = parse_air_shopping_response(resp, OfferFilter(owner_codes=["SU"]))
+        assert got.offers == []
+
+
+class TestClientOfferFilter:
+    def test_filtered_searches_are_cached_apart(self):
+        calls = []
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(shopping_handler(calls, expires_in=600)),
+            result_cache=MemoryCache(max_ttl=60),
+        ) as client:
+            client.air_shopping(ITINERARY, PAXES)
+            got = client.air_shopping(
+                ITINERARY, PAXES, offer_filter=OfferFilter(owner_codes=["TCH"])
+            )
+            client.air_shopping(
+                ITINERARY, PAXES, offer_filter=OfferFilter(owner_codes=["TCH"])
+            )
+            # Neither an uncacheable filter nor an empty result is cached.
+            client.air_shopping(ITINERARY, PAXES, offer_filter=lambda elm: False)
+            client.air_shopping(ITINERARY, PAXES, offer_filter=OfferFilter(owner_codes=["SU"]))
+            client.air_shopping(ITINERARY, PAXES, offer_filter=OfferFilter(owner_codes=["SU"]))
+
+        assert len(got.offers) == 1
+        assert len(calls) == 5
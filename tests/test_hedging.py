@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import datetime
+import threading
+import time
+
+import httpx
+import pytest
+
+from .utils import mock_handler
+from mixvel import AirShoppingResponse, AnonymousPassenger, AsyncClient, Client, Leg
+from mixvel.hedging import HedgingPolicy
+from mixvel.xml import AirShoppingRequest
+
+ITINERARY = [Leg("MOW", "AER", datetime.date(2025, 6, 13))]
+PAXES = [AnonymousPassenger("Pax-1", "ADT")]
+
+
+class TestHedgingPolicy:
+    def test_initial_delay(self):
+        policy = HedgingPolicy(initial_delay=1.5, min_samples=3)
+        policy.record(0.1)
+        assert policy.delay() == 1.5
+
+    def test_percentile_delay(self):
+        policy = HedgingPolicy(percentile=90, min_delay=0, min_samples=1)
+        for latency in range(1, 11):
+            policy.record(latency / 10)
+        assert policy.delay() == pytest.approx(0.9)
+
+    def test_hedges_are_rate_limited(self):
+        policy = HedgingPolicy(max_hedges_per_second=0.001)
+        assert policy.acquire()
+        assert not policy.acquire()
+
+    def test_invalid_percentile(self):
+        with pytest.raises(ValueError):
+            HedgingPolicy(percentile=0)
+
+
+class TestClientHedging:
+    def test_slow_request_is_hedged(self):
+        calls = []
+        handler = mock_handler(calls=calls)
+        lock = threading.Lock()
+        shopping_calls = []
+
+        def slow_first(request):
+            if request.url.path == "/api/Order/AirShopping":
+                with lock:
+                    shopping_calls.append(request)
+                    first = len(shopping_calls) == 1
+                if first:
+                    time.sleep(0.5)
+            return handler(request)
+
+        policy = HedgingPolicy(initial_delay=0.05)
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(slow_first), hedging_policy=policy,
+        ) as client:
+            started = time.monotonic()
+            got = client.air_shopping(ITINERARY, PAXES)
+            elapsed = time.monotonic() - started
+
+        assert isinstance(got, AirShoppingResponse)
+        assert len(shopping_calls) == 2
+        assert elapsed < 0.5
+        first_id = shopping_calls[0].content.split(b'MessageId="')[1][:36]
+        second_id = shopping_calls[1].content.split(b'MessageId="')[1][:36]
+        assert first_id != second_id
+
+    def test_fast_request_is_not_hedged(self):
+        calls = []
+        policy = HedgingPolicy(initial_delay=1)
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(mock_handler(calls=calls)),
+            hedging_policy=policy,
+        ) as client:
+            client.air_shopping(ITINERARY, PAXES)
+        assert [r.url.path for r in calls].count("/api/Order/AirShopping") == 1
+
+    def test_concurrent_calls_are_not_queued(self):
+        calls = []
+        handler = mock_handler(calls=calls)
+
+        def slow(request):
+            if request.url.path == "/api/Order/AirShopping":
+                time.sleep(0.2)
+            return handler(request)
+
+        requests = [AirShoppingRequest(itinerary=ITINERARY, paxes=PAXES) for _ in range(16)]
+        policy = HedgingPolicy(initial_delay=1.0)
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(slow), hedging_policy=policy,
+        ) as client:
+            started = time.monotonic()
+            got = client.air_shopping_many(requests, max_concurrency=16)
+            elapsed = time.monotonic() - started
+
+        assert all(isinstance(r, AirShoppingResponse) for r in got)
+        assert [r.url.path for r in calls].count("/api/Order/AirShopping") == 16
+        assert elapsed < 0.8
+
+    def test_async_loser_is_cancelled(self):
+        handler = mock_handler()
+        shopping_calls = []
+        cancelled = []
+
+        async def slow_first(request):
+            if request.url.path == "/api/Order/AirShopping":
+                shopping_calls.append(request)
+                if len(shopping_calls) == 1:
+                    try:
+                        await asyncio.sleep(1)
+                    except asyncio.CancelledError:
+                        cancelled.append(request)
+                        raise
+            return handler(request)
+
+        async def scenario():
+            policy = HedgingPolicy(initial_delay=0.05, max_hedges_per_second=0.001)
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=httpx.MockTransport(slow_first), hedging_policy=policy,
+            ) as client:
+                got = await client.air_shopping(ITINERARY, PAXES)
+                await asyncio.sleep(0)
+                return got
+
+        assert isinstance(asyncio.run(scenario()), AirShoppingResponse)
+        assert len(shopping_calls) == 2
+        assert cancelled == shopping_calls[:1]
+
+    def test_async_loser_is_recorded(self):
+        handler = mock_handler()
+        shopping_calls = []
+        recorded = []
+
+        class RecordingPolicy(HedgingPolicy):
+            def record(self, latency):
+                recorded.append(latency)
+                super().record(latency)
+
+        async def slow_first(request):
+            if request.url.path == "/api/Order/AirShopping":
+                shopping_calls.append(request)
+                if len(shopping_calls) == 1:
+                    await asyncio.sleep(1)
+            return handler(request)
+
+        async def scenario():
+            policy = RecordingPolicy(initial_delay=0.05, max_hedges_per_second=0.001)
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=httpx.MockTransport(slow_first), hedging_policy=policy,
+            ) as client:
+                got = await client.air_shopping(ITINERARY, PAXES)
+                await asyncio.sleep(0.01)
+                return got
+
+        assert isinstance(asyncio.run(scenario()), AirShoppingResponse)
+        assert len(recorded) == 2
+        assert max(recorded) >= 0.05
@@ -1,12 +1,28 @@
 # -*- coding: utf-8 -*-
 import datetime
+import pickle
+import sys
+import threading
 
-from .utils import parse_xml, parse_xml_response
+from .utils import (
+    many_offers_response,
+    model_data,
+    parse_xml,
+    parse_xml_response,
+    read_response,
+)
+from mixvel import _parsers
 from mixvel._parsers import (
+    AirShoppingParser,
+    decode_amount,
+    decode_datetime,
+    find_error,
     is_cancel_success,
     parse_air_shopping_response,
+    parse_air_shopping_stream,
     parse_order_view_response,
 )
+from mixvel.xml.backend import get_backend
 from mixvel._parsers import (
     parse_amount,
     parse_booking,
@@ -67,6 +83,8 @@ from mixvel.models import (
 
 import pytest
 
+pytestmark = pytest.mark.usefixtures("xml_backend")
+
 
 class TestParsers:
     @pytest.mark.parametrize(
@@ -114,6 +132,262 @@ class TestParsers:
         assert isinstance(got.data_lists, DataLists)
 
 
+def chunked(content, size):
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+ENVELOPE_ERROR = b"""<MixEnv:Envelope xmlns:MixEnv="https://www.mixvel.com/API/XSD/mixvel_envelope/1_06">
+  <Body>
+    <MessageInfo MessageId="1" TimeSent="2025-05-30T09:36:40Z" />
+    <Error>
+      <ErrorType>InternalServerError</ErrorType>
+      <CanRetry>true</CanRetry>
+      <Code>MIX-000001</Code>
+    </Error>
+  </Body>
+</MixEnv:Envelope>"""
+
+
+class TestDecoding:
+    @pytest.mark.parametrize(
+        "text,want",
+        [
+            ("2025-06-10T10:15:00", datetime.datetime(2025, 6, 10, 10, 15)),
+            ("2025-05-30T09:36:40.123Z", datetime.datetime(2025, 5, 30, 9, 36, 40)),
+            ("2025-05-30T09:36:40Z", datetime.datetime(2025, 5, 30, 9, 36, 40)),
+        ],
+    )
+    def test_datetime(self, text, want):
+        assert decode_datetime(text) == want
+
+    def test_invalid_datetime(self):
+        with pytest.raises(ValueError):
+            decode_datetime("30.05.2025 09:36")
+
+    @pytest.mark.parametrize(
+        "text,want",
+        [
+            ("6538.00", 653800),
+            ("0.50", 50),
+            ("1200", 1200),
+            ("0.5", 5),
+            ("12.345", 12345),
+            ("100.000", 100000),
+        ],
+    )
+    def test_amount(self, text, want):
+        assert decode_amount(text) == want
+        assert decode_amount(text) == int(text.replace(".", ""))
+
+
+class TestFindError:
+    def test_envelope_error(self):
+        err = find_error(get_backend().fromstring(ENVELOPE_ERROR))
+        assert err.find("./Code").text == "MIX-000001"
+
+    def test_message_error(self):
+        err = find_error(parse_xml("responses/accounts/login_error.xml"))
+        assert err.find("./Code").text == "MIX-101002"
+
+    def test_nested_elements_are_not_errors(self):
+        content = read_response("responses/order/air-shopping__RT-2ADT1CNN.xml")
+        content = content.replace(
+            b"<Response>", b"<Response><Remark><Error>Not an error</Error></Remark>", 1
+        )
+        assert find_error(get_backend().fromstring(content)) is None
+        assert len(parse_air_shopping_stream(chunked(content, 64)).offers) == 1
+
+    def test_no_error(self):
+        assert find_error(parse_xml("responses/order/view.xml")) is None
+
+
+class TestInterning:
+    def test_codes_shared_across_offers(self):
+        resp = parse_air_shopping_stream([many_offers_response(2)])
+        first, second = resp.offers
+        assert first.offer_id != second.offer_id
+        assert first.owner_code is second.owner_code
+        first_fc = first.offer_items[0].fare_details[0].fare_components[0]
+        second_fc = second.offer_items[0].fare_details[0].fare_components[0]
+        assert first_fc.fare_basis_code is second_fc.fare_basis_code
+        assert first_fc.pax_segment_ref_id is second_fc.pax_segment_ref_id
+        assert first_fc.price.total_amount.cur_code is second_fc.price.total_amount.cur_code
+        assert any(
+            segment.pax_segment_id is first_fc.pax_segment_ref_id
+            for segment in resp.data_lists.pax_segment_list
+        )
+
+
+class TestSharedModels:
+    def test_identical_prices_shared_across_offers(self):
+        for resp in (
+            parse_air_shopping_stream([many_offers_response(2)]),
+            parse_air_shopping_response(
+                get_backend().fromstring(many_offers_response(2)).find("./Body/AppData/*")
+            ),
+        ):
+            first, second = resp.offers
+            assert first.total_price is second.total_price
+            assert first.offer_items[0].price is second.offer_items[0].price
+
+    def test_shared_models_are_frozen(self):
+        first, second = parse_air_shopping_stream([many_offers_response(2)]).offers
+        amount = first.total_price.total_amount
+        with pytest.raises((TypeError, ValueError)):
+            amount.amount += 100
+        with pytest.raises((TypeError, ValueError)):
+            first.total_price.tax_summary = None
+        assert second.total_price.total_amount.amount == amount.amount
+
+    def test_sharing_stops_without_hits(self):
+        price = parse_xml("models/price.xml")
+        amounts = [elm for elm in price.iter() if elm.tag.endswith("Amount")]
+        shared = _parsers._SharedModels()
+        for n in range(shared.PROBE):
+            for i, amount in enumerate(amounts):
+                amount.text = "{n}{i}.00".format(n=n, i=i)
+            parse_price(price, shared)
+        assert not shared.active
+        assert not shared
+        assert parse_price(price, shared) is not parse_price(price, shared)
+
+    def test_different_prices_not_shared(self):
+        price = parse_xml("models/price.xml")
+        other = parse_xml("models/price.xml")
+        other.find("./TotalAmount").text = "1.00"
+        shared = _parsers._SharedModels()
+        assert parse_price(price, shared) is parse_price(price, shared)
+        assert parse_price(other, shared) is not parse_price(price, shared)
+        assert parse_price(other, shared).tax_summary is parse_price(price, shared).tax_summary
+        assert parse_price(price) is not parse_price(price)
+
+
+class TestLazyModels:
+    def test_same_as_eager_models(self):
+        content = many_offers_response(3)
+        want = parse_air_shopping_stream([content])
+        got = parse_air_shopping_stream([content], lazy=True)
+        assert all(isinstance(offer, Offer) for offer in got.offers)
+        assert model_data(got) == model_data(want)
+
+    def test_fields_parsed_on_first_access(self, monkeypatch):
+        calls = []
+        parse_price = _parsers.parse_price
+
+        def counting_parse_price(*args):
+            calls.append(args)
+            return parse_price(*args)
+
+        monkeypatch.setattr(_parsers, "parse_price", counting_parse_price)
+        resp = parse_air_shopping_stream([many_offers_response(3)], lazy=True)
+        offer = resp.offers[0]
+        assert offer.offer_id == "offer-0"
+        assert calls == []
+        assert offer.total_price.total_amount.cur_code == "RUB"
+        assert len(calls) == 1
+        assert offer.total_price is offer.total_price
+        assert len(calls) == 1
+        assert offer.offer_items[0].price is not None
+        assert len(calls) == 2
+
+    def test_pickled_fully_loaded(self):
+        content = many_offers_response(2)
+        got = pickle.loads(pickle.dumps(parse_air_shopping_stream([content], lazy=True)))
+        assert model_data(got) == model_data(parse_air_shopping_stream([content]))
+
+    def test_order_view(self):
+        resp = parse_xml_response("responses/order/view.xml")
+        got = parse_order_view_response(resp, lazy=True)
+        assert isinstance(got.mix_order.orders[0], Order)
+        assert model_data(got) == model_data(parse_order_view_response(resp))
+
+    def test_unknown_attribute(self):
+        offer = parse_air_shopping_stream([many_offers_response(1)], lazy=True).offers[0]
+        with pytest.raises(AttributeError):
+            offer.no_such_field
+
+    def test_concurrent_first_access(self):
+        content = many_offers_response(20)
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            self._read_concurrently(content)
+        finally:
+            sys.setswitchinterval(interval)
+
+    def _read_concurrently(self, content):
+        for _ in range(30):
+            offers = parse_air_shopping_stream([content], lazy=True).offers
+            barrier = threading.Barrier(8)
+            errors = []
+            seen = []
+
+            def read():
+                barrier.wait()
+                for offer in offers:
+                    try:
+                        seen.append((offer, offer.offer_items, offer.total_price))
+                    except AttributeError as exc:
+                        errors.append(exc)
+
+            threads = [threading.Thread(target=read) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert errors == []
+            # Every field was loaded once, all threads got the same value.
+            assert all(
+                items is offer.offer_items and price is offer.total_price
+                for offer, items, price in seen
+            )
+
+
+class TestAirShoppingParser:
+    @pytest.mark.parametrize(
+        "resp_path",
+        [
+            "responses/order/air-shopping__RT-2ADT1CNN.xml",
+            "responses/order/air-shopping__with-stop.xml",
+            "responses/order/air-shopping__no-offers.xml",
+        ],
+    )
+    def test_same_as_tree_parser(self, resp_path):
+        want = parse_air_shopping_response(parse_xml_response(resp_path))
+        got = parse_air_shopping_stream(chunked(read_response(resp_path), 64))
+        assert model_data(got) == model_data(want)
+
+    def test_offer_parsed_when_its_element_closes(self):
+        content = read_response("responses/order/air-shopping__RT-2ADT1CNN.xml")
+        end = content.index(b"</Offer>") + len(b"</Offer>")
+        parser = AirShoppingParser()
+        offers = parser.feed(content[:end])
+        assert len(offers) == 1
+        assert parser.data_lists is not None
+        assert parser.feed(content[end:]) == []
+        assert parser.close() == []
+
+    @pytest.mark.parametrize(
+        "content,code",
+        [
+            (read_response("responses/accounts/login_error.xml"), "MIX-101002"),
+            (ENVELOPE_ERROR, "MIX-000001"),
+        ],
+    )
+    def test_error(self, content, code):
+        with pytest.raises(IOError, match=code):
+            parse_air_shopping_stream(chunked(content, 64))
+
+    def test_nested_elements_are_not_errors(self):
+        resp_path = "responses/order/air-shopping__RT-2ADT1CNN.xml"
+        content = read_response(resp_path).replace(
+            b"<Offer>", b"<Offer><Remark><Error>Not an error</Error></Remark>", 1
+        )
+        got = parse_air_shopping_stream(chunked(content, 64))
+        want = parse_air_shopping_response(parse_xml_response(resp_path))
+        assert len(got.offers) == len(want.offers)
+
+
 class TestTypeParsers:
     @pytest.mark.parametrize(
         "model_path,want",
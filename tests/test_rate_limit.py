@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from .utils import mock_handler
+from mixvel import AsyncClient, Client, RateLimitExceeded
+from mixvel.rate_limit import RateLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    def test_burst_then_queue(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve(1) == pytest.approx(0.2, abs=0.01)
+
+    def test_reservation_beyond_max_wait_is_not_taken(self):
+        bucket = TokenBucket(rate=1, burst=1)
+        assert bucket.reserve(0) == 0
+        assert bucket.reserve(0.5) is None
+        assert bucket.reserve(2) == pytest.approx(1, abs=0.01)
+
+    def test_try_acquire(self):
+        bucket = TokenBucket(rate=0.001)
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimiter:
+    def test_buckets_per_structure_unit_and_endpoint(self):
+        limiter = RateLimiter(rate=1, max_wait=0)
+        assert limiter.reserve("unit-1", "/api/Order/AirShopping") == 0
+        assert limiter.reserve("unit-2", "/api/Order/AirShopping") == 0
+        assert limiter.reserve("unit-1", "/api/Order/Retrieve") == 0
+        with pytest.raises(RateLimitExceeded):
+            limiter.reserve("unit-1", "/api/Order/AirShopping")
+
+    def test_endpoint_rates(self):
+        limiter = RateLimiter(endpoint_rates={"/api/Order/AirShopping": 1}, max_wait=0)
+        limiter.reserve("unit", "/api/Order/AirShopping")
+        with pytest.raises(RateLimitExceeded):
+            limiter.reserve("unit", "/api/Order/AirShopping")
+        for _ in range(10):
+            assert limiter.reserve("unit", "/api/Order/Retrieve") == 0
+
+
+class TestClientRateLimit:
+    def test_requests_are_spaced(self):
+        calls = []
+        limiter = RateLimiter(endpoint_rates={"/api/Order/Cancel": 20}, burst=1)
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(mock_handler(calls=calls)),
+            rate_limiter=limiter,
+        ) as client:
+            started = time.monotonic()
+            for _ in range(3):
+                client.cancel_order("01138-250530-MHY6279")
+            elapsed = time.monotonic() - started
+        assert elapsed >= 0.09
+
+    def test_async_rejects_beyond_deadline(self):
+        limiter = RateLimiter(endpoint_rates={"/api/Order/Cancel": 1}, max_wait=0.1)
+
+        async def scenario():
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=httpx.MockTransport(mock_handler()),
+                rate_limiter=limiter,
+            ) as client:
+                assert await client.cancel_order("01138-250530-MHY6279")
+                with pytest.raises(RateLimitExceeded):
+                    await client.cancel_order("01138-250530-MHY6279")
+
+        asyncio.run(scenario())
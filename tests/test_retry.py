@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import datetime
+
+import httpx
+import pytest
+
+from .utils import mock_handler
+from mixvel import AnonymousPassenger, AsyncClient, Client, Leg
+from mixvel.retry import RetryBudget, RetryPolicy
+
+ITINERARY = [Leg("MOW", "AER", datetime.date(2025, 6, 13))]
+PAXES = [AnonymousPassenger("Pax-1", "ADT")]
+
+
+def flaky_handler(failures, calls, fail_with=None):
+    handler = mock_handler(calls=calls)
+    remaining = dict(failures)
+
+    def flaky(request):
+        path = request.url.path
+        if remaining.get(path):
+            remaining[path] -= 1
+            calls.append(request)
+            if fail_with is not None:
+                raise fail_with("boom", request=request)
+            return httpx.Response(503)
+        return handler(request)
+
+    return flaky
+
+
+def no_delay_policy(**kwargs):
+    return RetryPolicy(backoff_base=0, **kwargs)
+
+
+class TestRetryPolicy:
+    def test_backoff_is_capped(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=3)
+        for attempt in range(1, 10):
+            assert 0 <= policy.backoff(attempt) <= min(3, 2 ** (attempt - 1))
+
+    @pytest.mark.parametrize(
+        "endpoint,want",
+        [
+            ("/api/Order/AirShopping", True),
+            ("/api/Order/Retrieve", True),
+            ("/api/Order/Create", False),
+            ("/api/Order/Change", False),
+        ],
+    )
+    def test_only_idempotent_endpoints_retry_responses(self, endpoint, want):
+        policy = RetryPolicy()
+        assert policy.should_retry(endpoint, 1, response=httpx.Response(503)) is want
+        assert not policy.should_retry(endpoint, 1, response=httpx.Response(500))
+
+    def test_unsent_requests_retry_everywhere(self):
+        policy = RetryPolicy()
+        assert policy.should_retry("/api/Order/Create", 1, exc=httpx.ConnectError("boom"))
+        assert not policy.should_retry("/api/Order/Create", 1, exc=httpx.ReadTimeout("boom"))
+        assert policy.should_retry("/api/Order/Retrieve", 1, exc=httpx.ReadTimeout("boom"))
+
+    def test_max_attempts(self):
+        policy = RetryPolicy(max_attempts=2)
+        assert policy.should_retry("/api/Order/AirShopping", 1, response=httpx.Response(503))
+        assert not policy.should_retry("/api/Order/AirShopping", 2, response=httpx.Response(503))
+
+    def test_budget(self):
+        budget = RetryBudget(ratio=0.5, min_per_second=0, window=60)
+        for _ in range(4):
+            budget.deposit()
+        assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+
+
+class TestClientRetries:
+    def test_air_shopping_is_retried(self):
+        calls = []
+        transport = httpx.MockTransport(
+            flaky_handler({"/api/Order/AirShopping": 2}, calls)
+        )
+        with Client(
+            "login", "password", "structure",
+            transport=transport, retry_policy=no_delay_policy(),
+        ) as client:
+            client.air_shopping(ITINERARY, PAXES)
+        assert [r.url.path for r in calls].count("/api/Order/AirShopping") == 3
+
+    def test_gives_up_after_max_attempts(self):
+        calls = []
+        transport = httpx.MockTransport(
+            flaky_handler({"/api/Order/AirShopping": 5}, calls)
+        )
+        with Client(
+            "login", "password", "structure",
+            transport=transport, retry_policy=no_delay_policy(max_attempts=2),
+        ) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                client.air_shopping(ITINERARY, PAXES)
+        assert [r.url.path for r in calls].count("/api/Order/AirShopping") == 2
+
+    def test_cancel_is_not_retried(self):
+        calls = []
+        transport = httpx.MockTransport(flaky_handler({"/api/Order/Cancel": 1}, calls))
+        with Client(
+            "login", "password", "structure",
+            transport=transport, retry_policy=no_delay_policy(),
+        ) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                client.cancel_order("01138-250530-MHY6279")
+        assert [r.url.path for r in calls].count("/api/Order/Cancel") == 1
+
+    def test_async_connect_error_is_retried(self):
+        calls = []
+        transport = httpx.MockTransport(
+            flaky_handler({"/api/Order/Cancel": 1}, calls, fail_with=httpx.ConnectError)
+        )
+
+        async def scenario():
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=transport, retry_policy=no_delay_policy(),
+            ) as client:
+                return await client.cancel_order("01138-250530-MHY6279")
+
+        assert asyncio.run(scenario())
+        assert [r.url.path for r in calls].count("/api/Order/Cancel") == 2
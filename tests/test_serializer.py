@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import datetime
+import os
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from .utils import here
+from mixvel.client import BaseClient
+from mixvel.models import (
+    AnonymousPassenger,
+    IdentityDocument,
+    Individual,
+    Leg,
+    Passenger,
+    SelectedOffer,
+    SelectedOfferItem,
+)
+from mixvel.xml.envelope import MessageEnvelope, MessageInfo
+from mixvel.xml.requests import (
+    AirShoppingRequest,
+    AuthRequest,
+    OrderCancelRequest,
+    OrderChangeRequest,
+    OrderCreateRequest,
+    OrderRetrieveRequest,
+)
+from mixvel.xml.serializer import XmlWriter, escape_attribute, escape_text
+
+DEPARTURE = datetime.date(2025, 6, 13)
+
+
+def passenger(pax_id, surname, **contacts):
+    return Passenger(
+        pax_id=pax_id,
+        ptc="ADT",
+        individual=Individual(
+            given_name="Ivan",
+            surname=surname,
+            gender="M",
+            birthdate=datetime.date(1990, 1, 2),
+        ),
+        doc=IdentityDocument(
+            doc_id="1234 567890",
+            type_code="PS",
+            issuing_country_code="RU",
+            expiry_date=datetime.date(2030, 1, 1),
+        ),
+        **contacts
+    )
+
+
+MESSAGES = {
+    "auth": AuthRequest(login="login", password="p&ss<word>", structure_unit_id="1"),
+    "air_shopping": AirShoppingRequest(
+        itinerary=[
+            Leg("MOW", "AER", DEPARTURE),
+            Leg("AER", "MOW", DEPARTURE + datetime.timedelta(days=8)),
+        ],
+        paxes=[AnonymousPassenger("Pax-1", "ADT"), AnonymousPassenger("Pax-2", "CHD")],
+    ),
+    "order_create": OrderCreateRequest(
+        selected_offer=SelectedOffer(
+            offer_ref_id="Offer-1",
+            selected_offer_items=[
+                SelectedOfferItem(offer_item_ref_id="Item-1", pax_ref_ids=["Pax-1", "Pax-2"])
+            ],
+        ),
+        paxes=[
+            passenger("Pax-1", "O'Neil", email="ivan&co@example.com", phone="+79990000000"),
+            passenger("Pax-2", "Ivanov"),
+        ],
+    ),
+    "order_retrieve": OrderRetrieveRequest(mix_order_id="MO-1"),
+    "order_change": OrderChangeRequest(mix_order_id="MO-1", amount=1000),
+    "order_cancel": OrderCancelRequest(mix_order_id="MO-1"),
+}
+
+TIME_SENT = datetime.datetime(2025, 5, 30, tzinfo=datetime.timezone.utc)
+
+
+def expected(name):
+    """Return the canonical form of the request in the given file."""
+
+    with open(os.path.join(here, "requests", name + ".xml"), encoding="utf-8") as f:
+        return ET.canonicalize(f.read().strip())
+
+
+class TestSerializer:
+    @pytest.mark.parametrize("name", sorted(MESSAGES))
+    def test_message(self, name):
+        content = MESSAGES[name].to_bytes()
+        assert isinstance(content, bytes)
+        assert ET.canonicalize(content.decode("utf-8")) == expected(name)
+
+    def test_envelope(self):
+        envelope = MessageEnvelope(
+            message_info=MessageInfo(message_id="1", time_sent=TIME_SENT),
+            payload=MESSAGES["order_retrieve"],
+        )
+        assert ET.canonicalize(envelope.to_xml()) == expected("envelope")
+
+    def test_prepared_request(self):
+        client = BaseClient("login", "password", "1")
+        root = ET.fromstring(client._prepare_request(MESSAGES["order_retrieve"]))
+        assert root.find("./Body/MessageInfo").get("MessageId")
+        assert root.find("./Body/AppData/*/Request/*/MixOrder/MixOrderID").text == "MO-1"
+
+    def test_to_xml_element(self, xml_backend):
+        element = MESSAGES["auth"].to_xml_element()
+        assert element.tag == "{https://www.mixvel.com/API/XSD/mixvel_auth/1_01}Auth"
+        assert xml_backend.find(element, "./Password").text == "p&ss<word>"
+
+    def test_escaping(self):
+        assert escape_text("a < b & c > d") == "a &lt; b &amp; c &gt; d"
+        assert escape_attribute('"x"\n') == "&quot;x&quot;&#10;"
+        writer = XmlWriter()
+        writer.empty("MessageInfo", {"MessageId": '<"&>'})
+        writer.element("Surname", "Ёлкин")
+        assert writer.getvalue() == (
+            '<MessageInfo MessageId="&lt;&quot;&amp;&gt;"/><Surname>Ёлкин</Surname>'
+        ).encode("utf-8")
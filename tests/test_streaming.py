@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import datetime
+
+import httpx
+import pytest
+
+from .utils import ChunkedStream, many_offers_response, mock_handler, read_response
+from mixvel import AnonymousPassenger, AsyncClient, Client, DataLists, Leg
+
+ITINERARY = [Leg("MOW", "AER", datetime.date(2025, 6, 13))]
+PAXES = [AnonymousPassenger("Pax-1", "ADT")]
+
+
+def streaming_handler(stream):
+    handler = mock_handler()
+
+    def serve(request):
+        if request.url.path == "/api/Order/AirShopping":
+            return httpx.Response(200, stream=stream)
+        return handler(request)
+
+    return serve
+
+
+class TestOfferIterator:
+    def test_stops_early(self):
+        stream = ChunkedStream(many_offers_response(50))
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(streaming_handler(stream)),
+        ) as client:
+            with client.air_shopping_iter(ITINERARY, PAXES) as offers:
+                first = next(offers)
+                assert isinstance(offers.data_lists, DataLists)
+                second = next(offers)
+
+        assert (first.offer_id, second.offer_id) == ("offer-0", "offer-1")
+        assert stream.read < len(stream.chunks) // 2
+        assert stream.closed
+
+    def test_exhausted(self):
+        stream = ChunkedStream(many_offers_response(5))
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(streaming_handler(stream)),
+        ) as client:
+            offers = client.air_shopping_iter(ITINERARY, PAXES)
+            got = [offer.offer_id for offer in offers]
+
+        assert got == ["offer-{n}".format(n=n) for n in range(5)]
+        assert stream.closed
+        assert list(offers) == []
+
+    def test_no_offers(self):
+        stream = ChunkedStream(
+            read_response("responses/order/air-shopping__no-offers.xml")
+        )
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(streaming_handler(stream)),
+        ) as client:
+            offers = client.air_shopping_iter(ITINERARY, PAXES)
+            assert list(offers) == []
+            assert offers.data_lists is None
+
+    def test_async(self):
+        stream = ChunkedStream(many_offers_response(50))
+
+        async def scenario():
+            async with AsyncClient(
+                "login", "password", "structure",
+                transport=httpx.MockTransport(streaming_handler(stream)),
+            ) as client:
+                offers = await client.air_shopping_iter(ITINERARY, PAXES)
+                async with offers:
+                    return [offer.offer_id async for offer in offers][:3]
+
+        assert asyncio.run(scenario()) == ["offer-0", "offer-1", "offer-2"]
+        assert stream.read == len(stream.chunks)
+        assert stream.closed
+
+    def test_error_closes_response(self):
+        stream = ChunkedStream(read_response("responses/accounts/login_error.xml"), 64)
+        with Client(
+            "login", "password", "structure",
+            transport=httpx.MockTransport(streaming_handler(stream)),
+        ) as client:
+            offers = client.air_shopping_iter(ITINERARY, PAXES)
+            with pytest.raises(IOError):
+                next(offers)
+        assert stream.closed
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+import stat
+import threading
+import time
+
+import httpx
+import pytest
+
+from .utils import mock_handler
+from mixvel import Client
+from mixvel.auth import Token, TokenManager
+from mixvel.token_store import FileTokenStore, SqliteTokenStore, token_key
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileTokenStore(str(tmp_path / "tokens.json"))
+    return SqliteTokenStore(str(tmp_path / "tokens.db"))
+
+
+class TestTokenStore:
+    def test_save_load_delete(self, store):
+        token = Token("token", time.time() + 600)
+        assert store.load("key") is None
+        store.save("key", token)
+        assert store.load("key") == token
+        store.delete("key", "other")
+        assert store.load("key") == token
+        store.delete("key", "token")
+        assert store.load("key") is None
+
+    def test_managers_share_one_login(self, store):
+        calls = []
+
+        def login():
+            calls.append(1)
+            time.sleep(0.05)
+            return "token-{n}".format(n=len(calls))
+
+        managers = [TokenManager(store=store, key="key") for _ in range(4)]
+        got = []
+        threads = [
+            threading.Thread(target=lambda m=m: got.append(m.get_token(login)))
+            for m in managers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert got == ["token-1"] * 4
+
+    def test_async_manager_adopts_stored_token(self, store):
+        calls = []
+
+        async def login():
+            calls.append(1)
+            return "token"
+
+        async def scenario():
+            first = TokenManager(store=store, key="key")
+            second = TokenManager(store=store, key="key")
+            return await first.aget_token(login), await second.aget_token(login)
+
+        assert asyncio.run(scenario()) == ("token", "token")
+        assert len(calls) == 1
+
+    def test_invalidate_removes_stored_token(self, store):
+        manager = TokenManager(store=store, key="key")
+        manager.set("token")
+        manager.invalidate("token")
+        assert store.load("key") is None
+
+    def test_logins_for_other_keys_are_not_blocked(self, store):
+        with store.lock("key"):
+            acquired = threading.Event()
+
+            def other():
+                with store.lock("other"):
+                    acquired.set()
+
+            thread = threading.Thread(target=other)
+            thread.start()
+            assert acquired.wait(1)
+            thread.join()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_sqlite_database_is_private(tmp_path):
+    path = tmp_path / "tokens.db"
+    umask = os.umask(0o022)
+    try:
+        SqliteTokenStore(str(path))
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(os.stat(str(path)).st_mode) == 0o600
+
+
+def test_clients_reuse_stored_token(tmp_path):
+    store = FileTokenStore(str(tmp_path / "tokens.json"))
+    calls = []
+    transport = httpx.MockTransport(mock_handler(calls=calls))
+    for _ in range(2):
+        with Client(
+            "login", "password", "structure", transport=transport, token_store=store
+        ) as client:
+            assert client.cancel_order("01138-250530-MHY6279")
+
+    assert [r.url.path for r in calls].count("/api/Accounts/login") == 1
+    key = token_key("login", "structure", client.gateway)
+    assert store.load(key).value == client.token
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from .utils import many_offers_response, model_data, parse_xml_response
+from mixvel import validation
+from mixvel._compat.pydantic import PYDANTIC
+from mixvel._parsers import parse_air_shopping_stream, parse_order_view_response
+from mixvel.models import Amount, Booking, DataLists
+
+
+@pytest.fixture
+def strict():
+    previous = validation.is_strict()
+    validation.set_strict(True)
+    yield
+    validation.set_strict(previous)
+
+
+@pytest.fixture
+def trusted():
+    previous = validation.is_strict()
+    validation.set_strict(False)
+    yield
+    validation.set_strict(previous)
+
+
+def parse_both():
+    content = many_offers_response(2)
+    view = parse_xml_response("responses/order/view.xml")
+    return [parse_air_shopping_stream([content]), parse_order_view_response(view)]
+
+
+class TestBuild:
+    def test_same_models_in_both_modes(self, trusted):
+        got = parse_both()
+        validation.set_strict(True)
+        want = parse_both()
+        assert model_data(got) == model_data(want)
+        if PYDANTIC:
+            assert got == want
+            assert [r.model_dump() for r in got] == [r.model_dump() for r in want]
+            assert repr(got) == repr(want)
+
+    def test_positional_keyword_and_alias_values(self, trusted):
+        booking = validation.build(Booking, "ABC123", type_code="PNR")
+        assert booking.booking_id == "ABC123"
+        assert booking.booking_ref_type_code == "PNR"
+        assert booking.booking_entity is None
+
+    def test_defaults(self, trusted):
+        first, second = validation.build(DataLists), validation.build(DataLists)
+        assert first.pax_segment_list == []
+        assert first.pax_segment_list is not second.pax_segment_list
+
+    @pytest.mark.skipif(not PYDANTIC, reason="the fallback models do not validate")
+    def test_fields_set(self, trusted):
+        assert validation.build(Amount, 100).model_fields_set == {"amount"}
+        assert validation.build(Amount, 100, "RUB").model_fields_set == {"amount", "cur_code"}
+
+    @pytest.mark.skipif(not PYDANTIC, reason="the fallback models do not validate")
+    def test_strict_mode_validates(self, strict):
+        with pytest.raises(ValueError):
+            validation.build(Amount, "not a number", "RUB")
+
+    def test_trusted_mode_does_not_validate(self, trusted):
+        assert validation.build(Amount, "not a number").amount == "not a number"
@@ -1,23 +1,122 @@
 # -*- coding: utf-8 -*-
+import datetime
 import os
-from xml.etree import ElementTree as ET
+import re
+import httpx
+
+from mixvel.xml.backend import get_backend
 
-from mixvel.utils import strip_namespaces
 
 here = os.path.abspath(os.path.dirname(__file__))
 
 
 def parse_xml(path):
-    """Return an ElementTree root loaded from the source path."""
+    """Return the root element of the source path, parsed by the active XML backend."""
 
-    abs_path = os.path.join(here, path)
-    tree = ET.parse(abs_path)
-    return tree.getroot()
+    with open(os.path.join(here, path), "rb") as f:
+        return get_backend().fromstring(f.read())
 
 
 def parse_xml_response(resp_path):
-    """Return a clean XML API response from the given file."""
+    """Return the message element of the API response in the given file."""
+
+    return parse_xml(resp_path).find("./Body/AppData/*")
+
+
+def read_response(resp_path):
+    """Return the raw bytes of the given API response file."""
+
+    with open(os.path.join(here, resp_path), "rb") as f:
+        return f.read()
+
+
+class ChunkedStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Response body served in small chunks, records how much of it was read."""
+
+    def __init__(self, content, size=1024):
+        self.chunks = [content[i:i + size] for i in range(0, len(content), size)]
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+    async def aclose(self):
+        self.closed = True
+
+
+def many_offers_response(count, resp_path="responses/order/air-shopping__RT-2ADT1CNN.xml"):
+    """Return an air shopping response with its offer repeated `count` times."""
+
+    content = read_response(resp_path)
+    start = content.index(b"<Offer>")
+    end = content.index(b"</Offer>") + len(b"</Offer>")
+    offer = content[start:end]
+    offer_id = re.search(rb"<OfferID>([^<]*)</OfferID>", offer).group(1)
+    offers = b"".join(
+        offer.replace(offer_id, b"offer-%d" % n) for n in range(count)
+    )
+    return content[:start] + offers + content[end:]
+
+
+def model_data(value):
+    """Return models as nested plain data so they can be compared with `==`."""
+
+    if hasattr(type(value), "model_fields"):
+        return {
+            name: model_data(getattr(value, name)) for name in type(value).model_fields
+        }
+    if isinstance(value, list):
+        return [model_data(item) for item in value]
+    return value
+
+
+RESPONSES = {
+    "/api/Accounts/login": "responses/accounts/login.xml",
+    "/api/Order/AirShopping": "responses/order/air-shopping__RT-2ADT1CNN.xml",
+    "/api/Order/Retrieve": "responses/order/view.xml",
+    "/api/Order/Cancel": "responses/order/cancel_success.xml",
+}
+
+
+def mock_handler(responses=None, calls=None):
+    """Return an `httpx.MockTransport` handler serving canned responses by path."""
+
+    responses = dict(RESPONSES, **(responses or {}))
+
+    def handler(request):
+        if calls is not None:
+            calls.append(request)
+        return httpx.Response(200, content=read_response(responses[request.url.path]))
+
+    return handler
+
+
+def shopping_handler(calls, expires_in):
+    """Serve the air shopping fixture with offers expiring `expires_in` seconds from now."""
+
+    handler = mock_handler()
+    expiration = datetime.datetime.utcnow() + datetime.timedelta(seconds=expires_in)
+    content = re.sub(
+        rb"<OfferExpirationTimeLimitDateTime>[^<]*<",
+        expiration.strftime("<OfferExpirationTimeLimitDateTime>%Y-%m-%dT%H:%M:%SZ<").encode(),
+        read_response("responses/order/air-shopping__RT-2ADT1CNN.xml"),
+    )
+
+    def serve(request):
+        if request.url.path == "/api/Order/AirShopping":
+            calls.append(request)
+            return httpx.Response(200, content=content)
+        return handler(request)
 
-    resp = parse_xml(resp_path)
-    strip_namespaces(resp)
-    return resp.find('.//Body/AppData/')
+    return serve